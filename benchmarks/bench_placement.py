@@ -0,0 +1,69 @@
+"""Benchmark the mine placement across board sizes and densities.
+
+For every board size and density, the average time of `place_mines` is reported next to the time of the rejection
+sampling it replaced (retry random cells until one is neither a mine nor around the first click).
+
+Usage:
+    python benchmarks/bench_placement.py [--repeat N] [--seed SEED]
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from placement import place_mines, safe_zone  # noqa: E402
+
+SIZES = [(16, 16), (16, 30), (37, 37), (100, 100), (999, 999)]
+DENSITIES = [0.01, 0.05, 0.125, 0.25, 0.5, 0.75]
+# the game window caps the number of mines to 999, rejection sampling isn't measured above it
+MAX_LEGACY_MINES = 999
+
+
+def rejection_sampling(height, width, count, start, rng):
+    """The original placement: pick random cells until one is neither a mine nor around the first click."""
+    excluded = set(safe_zone(height, width, *start))
+    mines = set()
+
+    while len(mines) < count:
+        cell = rng.randint(0, height - 1) * width + rng.randint(0, width - 1)
+        while cell in mines or cell in excluded:
+            cell = rng.randint(0, height - 1) * width + rng.randint(0, width - 1)
+        mines.add(cell)
+
+    return list(mines)
+
+
+def measure(func, height, width, count, repeat, seed):
+    """Return the average time in seconds of a placement call."""
+    rng = random.Random(seed)
+    start = (height // 2, width // 2)
+    return timeit.timeit(lambda: func(height, width, count, start, rng), number=repeat) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20, help="placements per measurement (default 20)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random number generator (default 0)")
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'density':>8} {'mines':>8} {'sampling (ms)':>14} {'rejection (ms)':>15}")
+
+    for height, width in SIZES:
+        for density in DENSITIES:
+            count = min(int(height * width * density), height * width - 9)
+
+            new = measure(place_mines, height, width, count, args.repeat, args.seed)
+            if count <= MAX_LEGACY_MINES:
+                old = f"{measure(rejection_sampling, height, width, count, args.repeat, args.seed) * 1000:15.3f}"
+            else:
+                old = f"{'-':>15}"
+
+            print(f"{f'{height}x{width}':>10} {density:>8.1%} {count:>8} {new * 1000:14.3f} {old}")
+
+
+if __name__ == "__main__":
+    main()
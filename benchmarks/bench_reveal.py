@@ -0,0 +1,44 @@
+"""Benchmark the flood fill of a reveal on a big, almost empty board.
+
+The board is generated with the first click in its center, then the reveal started from that click is timed on its
+own (without the board generation). With very few mines, it opens nearly the whole board.
+
+Usage:
+    python benchmarks/bench_reveal.py [--size N] [--mines N] [--seed SEED]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from state import GameState  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=1000, help="width and height of the board (default 1000)")
+    parser.add_argument("--mines", type=int, default=10, help="number of mines (default 10)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random number generator (default 0)")
+    args = parser.parse_args()
+
+    state = GameState(size=(args.size, args.size), max_bombs=args.mines, rng=random.Random(args.seed))
+    lin = col = args.size // 2
+
+    start = time.perf_counter()
+    state._GameState__start_game(lin, col)
+    generated = time.perf_counter()
+    changes = state.reveal_zone(lin, col).changes
+    revealed = time.perf_counter()
+
+    print(f"board: {args.size}x{args.size}, {args.mines} mines")
+    print(f"generation: {(generated - start) * 1000:.1f} ms")
+    print(f"reveal: {(revealed - generated) * 1000:.1f} ms, {len(changes)} cells opened")
+    print(f"per cell: {(revealed - generated) / max(1, len(changes)) * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""Headless benchmark suite for the engine and rendering hot paths.
+
+Runs with the dummy SDL video driver, so it doesn't need a display. Every benchmark is repeated a few times (with a
+fresh setup, which isn't timed, for each repetition) and its timings are written to a JSON file, which can be given
+back with `--compare` to a later run to get the speedups.
+
+Benchmarks:
+    - start_game: Board generation (`GameState.__start_game`), across sizes and densities.
+    - reveal_single: Reveal of a single numbered cell.
+    - reveal_flood: Reveal of a click which flood fills a big board with very few mines.
+    - flag: Flag of a cell.
+    - board_tile: Rendering of one tile of the board (`Board.__update_surface`).
+    - board_draw: Drawing of the board viewport, with a cold and a warm tile cache.
+    - board_update: Update of the board after flagging a cell.
+    - board_zoomed: Rendering of all the tiles of the board, at the zoom levels drawn as arrays.
+    - window_draw: Drawing of a full frame of the game window.
+
+Usage:
+    python benchmarks/suite.py [--repeat N] [--output FILE] [--compare FILE] [--filter NAME]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+import pygame  # noqa: E402
+
+from optional import HAS_NUMPY  # noqa: E402
+from state import BoardCell, GameState  # noqa: E402
+
+SIZES = [(16, 16), (16, 30), (100, 100), (999, 999)]
+DENSITIES = [0.01, 0.125, 0.5]
+
+
+def measure(func, setup=None, repeat=5):
+    """Time `func(setup())` `repeat` times.
+
+    :return: The timings, in seconds.
+    """
+    timings = []
+
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        func(arg)
+        timings.append(time.perf_counter() - start)
+
+    return timings
+
+
+def new_state(size, density, seed=0, start=None) -> GameState:
+    """Create a game, generated with the first click on `start` (if given)."""
+    height, width = size
+    state = GameState(size=size, max_bombs=min(int(height * width * density), height * width - 9),
+                      rng=random.Random(seed))
+
+    if start is not None:
+        state._GameState__start_game(*start)
+
+    return state
+
+
+def numbered_cell(state: GameState):
+    """Find a cell with a non-zero number, which reveals only itself."""
+    for cell, value in enumerate(state.zones.data):
+        if 0 < value <= 8:
+            return divmod(cell, state.width)
+    return 0, 0
+
+
+def engine_benchmarks(repeat, selected):
+    """Yield `(name, params, timings)` for the engine hot paths whose name is `selected`."""
+    for size in SIZES if selected("start_game") else []:
+        for density in DENSITIES:
+            start = (size[0] // 2, size[1] // 2)
+            yield "start_game", {"size": size, "density": density}, measure(
+                lambda state: state._GameState__start_game(*start),
+                lambda: new_state(size, density),
+                repeat,
+            )
+
+    for size in SIZES if selected("reveal_single") else []:
+        def setup():
+            state = new_state(size, 0.2, start=(0, 0))
+            return state, numbered_cell(state)
+
+        yield "reveal_single", {"size": size}, measure(lambda arg: arg[0].reveal_zone(*arg[1]), setup, repeat)
+
+    for size in [(100, 100), (1000, 1000)] if selected("reveal_flood") else []:
+        start = (size[0] // 2, size[1] // 2)
+        yield "reveal_flood", {"size": size, "mines": 10}, measure(
+            lambda state: state.reveal_zone(*start),
+            lambda: new_state(size, 10 / (size[0] * size[1]), start=start),
+            max(1, repeat // 2),
+        )
+
+    for size in SIZES if selected("flag") else []:
+        def setup():
+            state = new_state(size, 0.2, start=(0, 0))
+            return state, next(
+                divmod(cell, state.width)
+                for cell, value in enumerate(state.board.data)
+                if value == BoardCell.UNSELECTED.value
+            )
+
+        yield "flag", {"size": size}, measure(lambda arg: arg[0].flag_zone(*arg[1]), setup, repeat)
+
+
+def render_benchmarks(repeat, selected):
+    """Yield `(name, params, timings)` for the rendering hot paths whose name is `selected`."""
+    from gui import Board, Window
+    from resources import load_font, preload
+
+    screen = pygame.display.set_mode((800, 800))
+    preload()
+    font = load_font(os.path.join("assets", "mine-sweeper.ttf"), 16)
+    bounds = pygame.Rect(144, 144, 512, 512)
+
+    for size in [(16, 16), (999, 999)]:
+        def setup():
+            state = new_state(size, 0.1, start=(0, 0))
+            state.reveal_zone(0, 0)
+            return Board(bounds, state, font)
+
+        def render_tile(board):
+            board._Board__update_surface(pygame.Surface((Board.TILE_PIXELS,) * 2), 0, 0)
+
+        if selected("board_tile"):
+            yield "board_tile", {"size": size}, measure(render_tile, setup, repeat)
+        if selected("board_draw"):
+            yield "board_draw", {"size": size, "cache": "cold"}, measure(
+                lambda board: board.draw(screen), setup, repeat
+            )
+
+        def warm_setup():
+            board = setup()
+            board.draw(screen)
+            return board
+
+        if selected("board_draw"):
+            yield "board_draw", {"size": size, "cache": "warm"}, measure(
+                lambda board: board.draw(screen), warm_setup, repeat
+            )
+
+        def update_setup():
+            board = warm_setup()
+            state = new_state(size, 0.1, start=(0, 0))
+            state.reveal_zone(0, 0)
+            board.update(state)
+            lin, col = next(
+                divmod(cell, state.width)
+                for cell, value in enumerate(state.board.data)
+                if value == BoardCell.UNSELECTED.value
+            )
+            state.flag_zone(lin, col)
+            return board, state
+
+        if selected("board_update"):
+            yield "board_update", {"size": size}, measure(
+                lambda arg: arg[0].update(arg[1], arg[1].changes), update_setup, repeat
+            )
+
+        def render_board(board):
+            tile_pixels = Board.TILE_PIXELS
+            for tile_lin in range((board.surface_bounds.height - 1) // tile_pixels + 1):
+                for tile_col in range((board.surface_bounds.width - 1) // tile_pixels + 1):
+                    board._Board__get_tile(tile_lin, tile_col)
+
+        for cell_size in [size for size in Board.ZOOM_LEVELS if size <= Board.ARRAY_MAX_CELL_SIZE]:
+            def zoomed_setup():
+                board = setup()
+                board._Board__zoom(Board.ZOOM_LEVELS.index(cell_size))
+                # keep all the tiles, to time the rendering only
+                board.tile_cache_bytes = board.surface_bounds.width * board.surface_bounds.height * 4
+                return board
+
+            if selected("board_zoomed") and HAS_NUMPY:
+                yield "board_zoomed", {"size": size, "cell_size": cell_size}, measure(
+                    render_board, zoomed_setup, repeat
+                )
+
+    for size in [(16, 16), (999, 999)] if selected("window_draw") else []:
+        def window_setup():
+            window = Window(800, 800, font)
+            window.x, window.y, window.bombs = size[0], size[1], min(999, size[0] * size[1] // 8)
+            window.set_window(window.game_window)
+            window.game_window.state.rng = random.Random(0)
+            window.game_window.state.reveal_zone(0, 0)
+            window.game_window.board.update(window.game_window.state)
+            window.draw(screen)
+            return window
+
+        yield "window_draw", {"size": size}, measure(lambda window: window.draw(screen), window_setup, repeat)
+
+
+def summarize(name, params, timings):
+    """Build the JSON record of a benchmark."""
+    return {
+        "name": name,
+        "params": params,
+        "repeat": len(timings),
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+    }
+
+
+def key(record):
+    """Identify a benchmark across runs."""
+    return record["name"], json.dumps(record["params"], sort_keys=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="repetitions per benchmark (default 5)")
+    parser.add_argument("--output", default="bench_results.json", help="JSON file for the results")
+    parser.add_argument("--compare", help="JSON file of a previous run to compare against")
+    parser.add_argument("--filter", help="only run the benchmarks whose name contains this string")
+    args = parser.parse_args()
+
+    # the assets are loaded relative to the root of the repository
+    os.chdir(ROOT)
+    pygame.init()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as file:
+            previous = {key(record): record for record in json.load(file)["results"]}
+
+    def selected(name):
+        return not args.filter or args.filter in name
+
+    results = []
+    for benchmarks in (engine_benchmarks, render_benchmarks):
+        for name, params, timings in benchmarks(args.repeat, selected):
+            record = summarize(name, params, timings)
+            results.append(record)
+
+            line = f"{name:<14} {json.dumps(params):<44} median {record['median_s'] * 1000:10.3f} ms"
+            if key(record) in previous:
+                line += f"  x{previous[key(record)]['median_s'] / record['median_s']:.2f}"
+            print(line, flush=True)
+
+    pygame.quit()
+
+    with open(args.output, "w") as file:
+        json.dump(
+            {
+                "meta": {
+                    "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "numpy": HAS_NUMPY,
+                    "platform": platform.platform(),
+                },
+                "results": results,
+            },
+            file,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
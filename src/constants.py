@@ -2,8 +2,8 @@
 
 Contains:
 - FPS: The fps counter.
-- User events: BOARD_REVEAL, BOARD_FLAG, TIMER_TICK, BOARD_FLAG_PLACED, BOARD_FLAG_REMOVED, GAME_START, GAME_RESTART,
-GAME_HOME, GAME_OVER, BOARD_UP, BOARD_DOWN, BOARD_LEFT, BOARD_RIGHT.
+- User events: BOARD_REVEAL, BOARD_FLAG, BOARD_CHORD, TIMER_TICK, BOARD_FLAG_PLACED, BOARD_FLAG_REMOVED, GAME_START,
+GAME_RESTART, GAME_HOME, GAME_OVER, BOARD_UP, BOARD_DOWN, BOARD_LEFT, BOARD_RIGHT, GAME_TOGGLE_MODE, GAME_CONTINUE.
 - Mouse buttons: MOUSEBUTTONLEFT, MOUSEBUTTONMIDDLE, MOUSEBUTTONRIGHT.
 """
 
@@ -27,6 +27,12 @@ BOARD_DOWN = pygame.USEREVENT + 11
 BOARD_LEFT = pygame.USEREVENT + 12
 BOARD_RIGHT = pygame.USEREVENT + 13
 
+GAME_TOGGLE_MODE = pygame.USEREVENT + 14
+
+BOARD_CHORD = pygame.USEREVENT + 15
+
+GAME_CONTINUE = pygame.USEREVENT + 16
+
 MOUSEBUTTONLEFT = 1
 MOUSEBUTTONMIDDLE = 2
 MOUSEBUTTONRIGHT = 3
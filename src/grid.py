@@ -0,0 +1,146 @@
+"""Compact storage for the boards of the game.
+
+Classes:
+    - Grid: Row-major grid of small integers stored in a flat array.
+    - ChunkedGrid: Unbounded grid of small integers stored in square chunks, allocated on demand.
+"""
+
+from array import array
+from typing import Iterator, Optional
+
+
+class Grid:
+    """Row-major grid of small integers stored in a flat array.
+
+    Every cell takes a single byte, values must be in `[-128, 127]`. Cells are accessed either with `grid[lin, col]`,
+    or directly through `data[lin * width + col]` in hot loops.
+
+    Instance variables:
+        - height: The height of the grid.
+        - width: The width of the grid.
+        - data: The cells of the grid, as an `array('b')` of `height * width` values.
+
+    Methods:
+        - __init__: Construct a grid.
+        - row: Get a copy of a line of the grid.
+        - copy: Get a copy of the grid.
+    """
+
+    __slots__ = ("height", "width", "data")
+
+    def __init__(self, height, width, fill=0, data: Optional[array] = None):
+        """Initialize a grid.
+
+        :param height: The height of the grid.
+        :param width: The width of the grid.
+        :param fill: The initial value of all the cells (default 0). Ignored if `data` is given.
+        :param data: The cells of the grid, which are used as is (default None).
+
+        :raises ValueError: `data` doesn't have `height * width` cells.
+        """
+        self.height, self.width = height, width
+
+        if data is None:
+            data = array("b", [fill]) * (height * width)
+        elif len(data) != height * width:
+            raise ValueError('Invalid `data` argument.')
+
+        self.data = data
+
+    def __getitem__(self, pos: tuple[int, int]):
+        """Get the value of the cell `(lin, col)`."""
+        lin, col = pos
+        return self.data[lin * self.width + col]
+
+    def __setitem__(self, pos: tuple[int, int], value):
+        """Set the value of the cell `(lin, col)`."""
+        lin, col = pos
+        self.data[lin * self.width + col] = value
+
+    def __eq__(self, other):
+        """Check if two grids have the same size and cells."""
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (self.height, self.width) == (other.height, other.width) and self.data == other.data
+
+    def row(self, lin) -> array:
+        """Get a copy of the line `lin` of the grid."""
+        return self.data[lin * self.width:(lin + 1) * self.width]
+
+    def copy(self) -> "Grid":
+        """Get a copy of the grid."""
+        return Grid(self.height, self.width, data=array("b", self.data))
+
+
+class ChunkedGrid:
+    """Unbounded grid of small integers stored in square chunks, allocated on demand.
+
+    The grid covers every `(lin, col)`, negative coordinates included. The cells of a chunk are only stored once one
+    of them is written, the other cells have the `fill` value. Every cell takes a single byte, values must be in
+    `[-128, 127]`.
+
+    Instance variables:
+        - chunk_size: The size of the side of a chunk, in cells.
+        - fill: The value of the cells which were never written.
+        - chunks: The allocated chunks, as row-major `array('b')`s of `chunk_size * chunk_size` cells, indexed by
+        `(chunk_lin, chunk_col)`.
+
+    Methods:
+        - __init__: Construct an empty grid.
+        - chunk_of: Get the chunk of a cell, and the index of the cell in it.
+        - chunk: Get the cells of a chunk, allocating them if needed.
+        - cells: Iterate over the allocated cells.
+        - copy: Get a copy of the grid.
+    """
+
+    __slots__ = ("chunk_size", "fill", "chunks")
+
+    def __init__(self, chunk_size, fill=0):
+        """Initialize an empty grid.
+
+        :param chunk_size: The size of the side of a chunk, in cells.
+        :param fill: The value of the cells which were never written (default 0).
+        """
+        self.chunk_size = chunk_size
+        self.fill = fill
+        self.chunks: dict[tuple[int, int], array] = {}
+
+    def chunk_of(self, lin, col) -> tuple[tuple[int, int], int]:
+        """Get the `(chunk_lin, chunk_col)` key of the chunk of the cell `(lin, col)`, and its index in the chunk."""
+        chunk_lin, cell_lin = divmod(lin, self.chunk_size)
+        chunk_col, cell_col = divmod(col, self.chunk_size)
+        return (chunk_lin, chunk_col), cell_lin * self.chunk_size + cell_col
+
+    def chunk(self, key: tuple[int, int]) -> array:
+        """Get the cells of a chunk, allocating them if needed."""
+        cells = self.chunks.get(key)
+
+        if cells is None:
+            cells = self.chunks[key] = array("b", [self.fill]) * (self.chunk_size * self.chunk_size)
+
+        return cells
+
+    def __getitem__(self, pos: tuple[int, int]):
+        """Get the value of the cell `(lin, col)`."""
+        key, cell = self.chunk_of(*pos)
+        cells = self.chunks.get(key)
+        return self.fill if cells is None else cells[cell]
+
+    def __setitem__(self, pos: tuple[int, int], value):
+        """Set the value of the cell `(lin, col)`, allocating its chunk if needed."""
+        key, cell = self.chunk_of(*pos)
+        self.chunk(key)[cell] = value
+
+    def cells(self) -> Iterator[tuple[int, int, int]]:
+        """Iterate over the cells of the allocated chunks, as `(lin, col, value)` triples."""
+        size = self.chunk_size
+
+        for (chunk_lin, chunk_col), cells in self.chunks.items():
+            for cell, value in enumerate(cells):
+                yield chunk_lin * size + cell // size, chunk_col * size + cell % size, value
+
+    def copy(self) -> "ChunkedGrid":
+        """Get a copy of the grid."""
+        grid = ChunkedGrid(self.chunk_size, self.fill)
+        grid.chunks = {key: array("b", cells) for key, cells in self.chunks.items()}
+        return grid
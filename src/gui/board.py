@@ -1,10 +1,17 @@
-from copy import deepcopy
+from collections import OrderedDict
+from itertools import chain
+from typing import Optional, Sequence
 
 import pygame
 
-from constants import (BOARD_DOWN, BOARD_FLAG, BOARD_LEFT, BOARD_REVEAL,
-                       BOARD_RIGHT, BOARD_UP, MOUSEBUTTONLEFT,
-                       MOUSEBUTTONRIGHT)
+from constants import (BOARD_CHORD, BOARD_DOWN, BOARD_FLAG, BOARD_LEFT,
+                       BOARD_REVEAL, BOARD_RIGHT, BOARD_UP, MOUSEBUTTONLEFT,
+                       MOUSEBUTTONMIDDLE, MOUSEBUTTONRIGHT)
+from gui.minimap import Minimap
+from gui.palette import cell_colors
+from gui.sprites import CellSprites
+from optional import HAS_NUMPY, np
+from probability import Probabilities
 from state import BoardCell, GameState
 from theme import Theme
 from utils import clamp, draw_border
@@ -13,12 +20,54 @@ from utils import clamp, draw_border
 class Board:
     """Class for managing the board display of the game.
 
-    It can display a board of any size, even if it doesn't fit the screen.
+    It can display a board of any size, even if it doesn't fit the screen, or an infinite board (whose state has no
+    `size`), which can be scrolled without limit.
+
+    The board can be zoomed out through `ZOOM_LEVELS`, from `CELL_SIZE` down to a pixel per cell: the cells are then
+    rendered at `CELL_SIZE` and scaled down. Cells of at most `ARRAY_MAX_CELL_SIZE` pixels are too small to show their
+    number, they're drawn with the color of their value instead (when NumPy is installed): the cells of a whole tile
+    are mapped through the colors and written on it at once, with `pygame.surfarray`.
+
+    Bounded boards which don't fit the view can also show a minimap, an overview of the whole board which can be
+    clicked to move the view.
+
+    The board is split in square tiles of `TILE_PIXELS` pixels (so they hold more cells as the board is zoomed out),
+    which are rendered on demand, when they get into view. Rendered tiles are kept in a least-recently-used cache,
+    bounded by `tile_cache_bytes`.
+
+    The mine probabilities of the unknown cells can be shown over the board, as a tint going from the safe color to
+    the mine color.
     """
     # default border width
     BORDER_WIDTH = 2
     # default cell size
     CELL_SIZE = 32
+    # the cell sizes the board can be zoomed to, from the closest to the farthest
+    ZOOM_LEVELS = (32, 16, 8, 4, 2, 1)
+    # size of the side of a tile, in pixels, it must be a multiple of all the zoom levels
+    TILE_PIXELS = 256
+    # distance the view moves by at each step, in pixels
+    SHIFT_PIXELS = 64
+    # cells up to this size are drawn with the colors of their values, as arrays
+    ARRAY_MAX_CELL_SIZE = 4
+    # cells drawn as arrays from this size on get grid lines
+    ARRAY_GRID_MIN_CELL_SIZE = 4
+    # default memory budget of the tile cache, in bytes
+    TILE_CACHE_BYTES = 16 * 1024 * 1024
+    # number of tints of the probability overlay (the probabilities are rounded to the closest one)
+    PROBABILITY_TINTS = 21
+    # opacity of the probability overlay
+    PROBABILITY_ALPHA = 128
+    # the probabilities aren't shown on smaller cells, they would take a blit per cell of the view
+    PROBABILITY_MIN_CELL_SIZE = 8
+    # map keys to zoom steps (positive steps zoom out)
+    ZOOM_KEYS = {
+        pygame.K_PLUS: -1,
+        pygame.K_EQUALS: -1,
+        pygame.K_KP_PLUS: -1,
+        pygame.K_MINUS: 1,
+        pygame.K_KP_MINUS: 1,
+    }
     # map board move events to directions
     BOARD_SHIFT = {
         pygame.K_LEFT: (-1, 0),
@@ -31,158 +80,261 @@ class Board:
         BOARD_DOWN: (0, 1),
     }
 
-    def __init__(self, bounds: pygame.Rect, state: GameState, font: pygame.font.Font):
-        """Init the board based on the current state of the game."""
+    def __init__(
+            self,
+            bounds: pygame.Rect,
+            state: GameState,
+            font: pygame.font.Font,
+            tile_cache_bytes=TILE_CACHE_BYTES,
+            minimap_bounds: Optional[pygame.Rect] = None,
+    ):
+        """Init the board based on the current state of the game.
+
+        :param bounds: The area of the screen the board is drawn in.
+        :param state: The state of the game.
+        :param font: The font of the cells.
+        :param tile_cache_bytes: The memory budget of the tile cache, in bytes (default 16 MiB). The tiles in view are
+        always kept, even if they exceed it.
+        :param minimap_bounds: The area of the screen the minimap may take (default None, for no minimap). It is only
+        shown for bounded boards which don't fit the view at the default zoom, when NumPy is installed.
+        """
         self.bounds = bounds.copy()
         self.font = font
 
-        # build surface to draw the game on
-        self.height, self.width = state.size
-        self.board = deepcopy(state.board)
+        self.infinite = state.size is None
+        self.height, self.width = (None, None) if self.infinite else state.size
+        self.board = state.board.copy()
+
+        self.minimap = None
+        if minimap_bounds is not None and not self.infinite and HAS_NUMPY and (
+                self.width * Board.CELL_SIZE > self.bounds.width or self.height * Board.CELL_SIZE > self.bounds.height
+        ):
+            self.minimap = Minimap(minimap_bounds, self.board)
 
-        self.surface = pygame.Surface((self.width * Board.CELL_SIZE, self.height * Board.CELL_SIZE))
+        # rendered tiles, indexed by `(tile_lin, tile_col)`, from the least to the most recently used
+        self.tiles: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self.tile_cache_bytes = tile_cache_bytes
+        self.tiles_bytes = 0
 
-        # used for drawing only part of the surface
-        self.surface_area = self.surface.get_rect()
-        self.surface_area.size = self.bounds.size
-        self.surface_bounds = self.surface.get_rect()
+        # the mine probabilities shown over the board, if any
+        self.probabilities: Optional[Probabilities] = None
+        self.__tints = None
 
-        self.__update_surface()
+        self.__set_cell_size(Board.CELL_SIZE)
+
+        # used for drawing only part of the surface, infinite boards start centered on the cell (0, 0)
+        self.surface_area = pygame.Rect(0, 0, *self.bounds.size)
+        if self.infinite:
+            self.surface_area.center = (self.cell_size // 2, self.cell_size // 2)
+        else:
+            self.__clamp_view()
+
+    def __set_cell_size(self, cell_size):
+        """Set the size of the cells, emptying the caches of the surfaces drawn at the previous size."""
+        self.cell_size = cell_size
+        self.sprites = CellSprites.get(self.font, cell_size, Board.BORDER_WIDTH, render_size=Board.CELL_SIZE)
+        # size of the side of a tile, in cells
+        self.tile_cells = Board.TILE_PIXELS // cell_size
+        # whether the tiles are drawn as arrays, and the colors of the cell values as pixels of the tiles (mapped to
+        # their format when the first tile is drawn)
+        self.array_rendering = HAS_NUMPY and cell_size <= Board.ARRAY_MAX_CELL_SIZE
+        self.__pixel_colors = None
+
+        # the (virtual) surface the whole board is drawn on, it is never allocated (nor bounded, for infinite boards)
+        self.surface_bounds = (
+            None if self.infinite else pygame.Rect(0, 0, self.width * cell_size, self.height * cell_size)
+        )
+
+        self.tiles.clear()
+        self.tiles_bytes = 0
+        self.__tints = None
 
     def __get_click_pos(self, mouse_x, mouse_y):
         """Return cell coordinates of clicked cell."""
         # normalize mouse coords to surface coords
         mouse_x += self.surface_area.left - self.bounds.left
         mouse_y += self.surface_area.top - self.bounds.top
-        return mouse_y // Board.CELL_SIZE, mouse_x // Board.CELL_SIZE
-
-    def __cell_to_text(self, cell):
-        """Converts a cell value to a text element to be rendered."""
-        if cell == BoardCell.BOMB.value or cell == BoardCell.BOMB_REVEALED.value:
-            text = "*"
-            color = "black"
-        elif cell == BoardCell.FLAGGED.value:
-            text = "`"
-            color = "red"
+        return mouse_y // self.cell_size, mouse_x // self.cell_size
+
+    def __tile_bounds(self, tile_lin, tile_col) -> pygame.Rect:
+        """Get the bounds of a tile on the (virtual) surface of the board."""
+        bounds = pygame.Rect(
+            tile_col * Board.TILE_PIXELS, tile_lin * Board.TILE_PIXELS, Board.TILE_PIXELS, Board.TILE_PIXELS
+        )
+        return bounds if self.infinite else bounds.clip(self.surface_bounds)
+
+    def __get_tile(self, tile_lin, tile_col) -> pygame.Surface:
+        """Get a tile from the cache, rendering it if it's missing.
+
+        Rendering a tile may evict the least recently used ones from the cache.
+        """
+        tile = self.tiles.get((tile_lin, tile_col))
+
+        if tile is not None:
+            self.tiles.move_to_end((tile_lin, tile_col))
+            return tile
+
+        tile = pygame.Surface(self.__tile_bounds(tile_lin, tile_col).size)
+        if self.array_rendering:
+            self.__update_surface_array(tile, tile_lin, tile_col)
         else:
-            text = str(cell)
-            color = Theme.CELL_COLORS[(cell - 1) % len(Theme.CELL_COLORS)]
+            self.__update_surface(tile, tile_lin, tile_col)
+
+        self.tiles[tile_lin, tile_col] = tile
+        self.tiles_bytes += tile.get_width() * tile.get_height() * tile.get_bytesize()
 
-        return self.font.render(text, True, color)
+        # keep the tile which was just rendered, even if it doesn't fit the budget
+        while self.tiles_bytes > self.tile_cache_bytes and len(self.tiles) > 1:
+            _, evicted = self.tiles.popitem(last=False)
+            self.tiles_bytes -= evicted.get_width() * evicted.get_height() * evicted.get_bytesize()
 
-    def __update_surface(self):
-        """Create a surface on which the whole board is drawn.
+        return tile
+
+    def __update_surface(self, tile: pygame.Surface, tile_lin, tile_col):
+        """Draw all the cells of a tile on its surface, in a single batch of blits from the sprite atlas.
 
         Borders are drawn over the cells, so they don't take space.
-        A board of size `n x m` will have `w = Board.CELL_SIZE * n`, `h = Board.CELL_SIZE * m` pixels.
+        A board of size `n x m` will have `w = cell_size * n`, `h = cell_size * m` pixels.
         """
-        self.surface.fill(Theme.REVEALED_BG_COLOR)
+        first_lin, first_col = tile_lin * self.tile_cells, tile_col * self.tile_cells
+        last_lin, last_col = first_lin + self.tile_cells, first_col + self.tile_cells
 
-        # draw cells' backgrounds
-        for i in range(self.height):
-            for j in range(self.width):
-                # skip cells that don't need a different background
-                if self.board[i][j] != BoardCell.BOMB_REVEALED.value and self.board[i][j] != BoardCell.BOMB.value:
-                    continue
+        if not self.infinite:
+            last_lin, last_col = min(last_lin, self.height), min(last_col, self.width)
 
-                cell_bounds = pygame.rect.Rect(
-                    self.surface_bounds.left + j * Board.CELL_SIZE,
-                    self.surface_bounds.top + i * Board.CELL_SIZE,
-                    Board.CELL_SIZE,
-                    Board.CELL_SIZE,
-                )
+        tile.blits(
+            [self.__cell_sprite(i, j) for i in range(first_lin, last_lin) for j in range(first_col, last_col)],
+            doreturn=False,
+        )
 
-                # draw revealed bomb in red background
-                if self.board[i][j] == BoardCell.BOMB_REVEALED.value:
-                    pygame.draw.rect(self.surface, Theme.REVEALED_BOMB_BG_COLOR, cell_bounds)
-                # draw regular bombs in darker background
-                elif self.board[i][j] == BoardCell.BOMB.value:
-                    pygame.draw.rect(self.surface, Theme.UNREVEALED_BG_COLOR, cell_bounds)
-
-                text = self.__cell_to_text(self.board[i][j])
-                rect = text.get_rect()
-                rect.center = cell_bounds.center
-                self.surface.blit(text, rect)
-
-        # draw vertical borders over top and left of cells
-        for j in range(self.width):
-            pygame.draw.line(
-                self.surface,
-                Theme.BG_COLOR,
-                (self.surface_bounds.left + j * Board.CELL_SIZE, self.surface_bounds.top),
-                (self.surface_bounds.left + j * Board.CELL_SIZE, self.surface_bounds.bottom),
-                Board.BORDER_WIDTH,
-            )
-
-        # draw horizontal borders over top and left of cells
-        for i in range(self.height):
-            pygame.draw.line(
-                self.surface,
-                Theme.BG_COLOR,
-                (self.surface_bounds.left, self.surface_bounds.top + i * Board.CELL_SIZE),
-                (self.surface_bounds.right, self.surface_bounds.top + i * Board.CELL_SIZE),
-                Board.BORDER_WIDTH,
-            )
-
-        # draw cells
-        for i in range(self.height):
-            for j in range(self.width):
-                # skip values of 0, their cells should be left as is
-                if self.board[i][j] == 0:
-                    continue
+    def __tile_values(self, tile_lin, tile_col):
+        """Get the cells of a tile as a 2D array of unsigned bytes (the values of the negative cells wrap around)."""
+        first_lin, first_col = tile_lin * self.tile_cells, tile_col * self.tile_cells
 
-                cell_bounds = pygame.rect.Rect(
-                    self.surface_bounds.left + j * Board.CELL_SIZE,
-                    self.surface_bounds.top + i * Board.CELL_SIZE,
-                    Board.CELL_SIZE,
-                    Board.CELL_SIZE,
-                )
+        if not self.infinite:
+            values = np.frombuffer(self.board.data, dtype=np.uint8).reshape(self.height, self.width)
+            return values[first_lin:first_lin + self.tile_cells, first_col:first_col + self.tile_cells]
 
-                # for unselected or flagged values (including bombs after the game is lost), draw them in a darker tone
-                if self.board[i][j] == BoardCell.UNSELECTED.value:
-                    pygame.draw.rect(self.surface, Theme.UNREVEALED_BG_COLOR, cell_bounds)
-                    draw_border(
-                        self.surface,
-                        cell_bounds,
-                        pygame.Color(Theme.UNREVEALED_BG_COLOR),
-                        width=4,
-                        depth="up",
-                        inner=True,
-                    )
-                    # if the value was unselected, we can stop here
+        # copy the part of every allocated chunk which is in the tile, the other cells are never written
+        values = np.full((self.tile_cells, self.tile_cells), self.board.fill, dtype=np.int8).view(np.uint8)
+        size = self.board.chunk_size
+
+        for chunk_lin in range(first_lin // size, (first_lin + self.tile_cells - 1) // size + 1):
+            for chunk_col in range(first_col // size, (first_col + self.tile_cells - 1) // size + 1):
+                cells = self.board.chunks.get((chunk_lin, chunk_col))
+                if cells is None:
                     continue
-                elif self.board[i][j] == BoardCell.FLAGGED.value:
-                    pygame.draw.rect(self.surface, Theme.UNREVEALED_BG_COLOR, cell_bounds)
-                    draw_border(
-                        self.surface,
-                        cell_bounds,
-                        pygame.Color(Theme.UNREVEALED_BG_COLOR),
-                        width=4,
-                        depth="up",
-                        inner=True,
-                    )
-
-                text = self.__cell_to_text(self.board[i][j])
-                rect = text.get_rect()
-                rect.center = cell_bounds.center
-                self.surface.blit(text, rect)
-
-    def __shift_board(self, direction, offset=2):
-        """Move the board view by a given offset in a specified direction.
+
+                chunk = np.frombuffer(cells, dtype=np.uint8).reshape(size, size)
+                # the intersection of the tile and the chunk, in cells of the board
+                top, left = max(first_lin, chunk_lin * size), max(first_col, chunk_col * size)
+                bottom = min(first_lin + self.tile_cells, (chunk_lin + 1) * size)
+                right = min(first_col + self.tile_cells, (chunk_col + 1) * size)
+
+                values[top - first_lin:bottom - first_lin, left - first_col:right - first_col] = chunk[
+                    top - chunk_lin * size:bottom - chunk_lin * size, left - chunk_col * size:right - chunk_col * size
+                ]
+
+        return values
+
+    def __update_surface_array(self, tile: pygame.Surface, tile_lin, tile_col):
+        """Draw all the cells of a tile on its surface with the colors of their values, in a single array blit.
+
+        Every cell is a square of `cell_size` pixels, with grid lines over its top and left edges if it's large enough.
+        """
+        if self.__pixel_colors is None:
+            self.__pixel_colors = np.array([tile.map_rgb(tuple(color)) for color in cell_colors()], dtype=np.uint32)
+
+        pixels = self.__pixel_colors[self.__tile_values(tile_lin, tile_col)]
+
+        if self.cell_size > 1:
+            pixels = pixels.repeat(self.cell_size, axis=0).repeat(self.cell_size, axis=1)
+        if self.cell_size >= Board.ARRAY_GRID_MIN_CELL_SIZE:
+            grid = tile.map_rgb(pygame.Color(Theme.BG_COLOR))
+            pixels[::self.cell_size] = grid
+            pixels[:, ::self.cell_size] = grid
+
+        pygame.surfarray.blit_array(tile, pixels.T)
+
+    def __cell_sprite(self, i, j):
+        """Get the `(source, dest, area)` arguments of the blit which draws the cell `(i, j)` on its tile."""
+        # the cells on the right and bottom edges of the board have no grid line on that side
+        right, bottom = self.infinite or j + 1 < self.width, self.infinite or i + 1 < self.height
+
+        return (
+            self.sprites.atlas,
+            ((j % self.tile_cells) * self.cell_size, (i % self.tile_cells) * self.cell_size),
+            self.sprites.area(self.board[i, j], right, bottom),
+        )
+
+    def __draw_cell(self, tile: pygame.Surface, i, j):
+        """Redraw the cell `(i, j)` on the surface of its tile."""
+        tile.blit(*self.__cell_sprite(i, j))
+
+    def __clamp_view(self):
+        """Keep the view of a bounded board inside its surface, or centered on it if it's smaller than the view."""
+        if self.infinite:
+            return
+
+        for axis, size in enumerate(self.surface_bounds.size):
+            view = self.bounds.size[axis]
+            position = (size - view) // 2 if size <= view else clamp(self.surface_area[axis], 0, size - view)
+            self.surface_area[axis] = position
+
+    def __shift_board(self, direction, offset=SHIFT_PIXELS):
+        """Move the board view by a given offset (in pixels) in a specified direction.
 
         If the movement causes the board to get outside the bounds of its surface area,
-        the move will be clamped.
+        the move will be clamped. Infinite boards are never clamped.
         """
         off_x, off_y = direction
-        off_x *= offset * Board.CELL_SIZE
-        off_y *= offset * Board.CELL_SIZE
+        self.surface_area.move_ip(off_x * offset, off_y * offset)
+        self.__clamp_view()
 
-        self.surface_area.x = clamp(self.surface_area.x + off_x, 0, self.surface_bounds.width - self.bounds.width)
-        self.surface_area.y = clamp(self.surface_area.y + off_y, 0, self.surface_bounds.height - self.bounds.height)
+    def __zoom(self, step, anchor: Optional[tuple[int, int]] = None):
+        """Zoom the board in (negative steps) or out (positive steps) through `ZOOM_LEVELS`.
+
+        :param step: The number of zoom levels to move by.
+        :param anchor: The position of the screen which stays over the same point of the board (default the center of
+        the board).
+        """
+        level = clamp(Board.ZOOM_LEVELS.index(self.cell_size) + step, 0, len(Board.ZOOM_LEVELS) - 1)
+        cell_size = Board.ZOOM_LEVELS[level]
+
+        if cell_size == self.cell_size:
+            return
+
+        anchor_x, anchor_y = anchor or self.bounds.center
+        anchor_x, anchor_y = anchor_x - self.bounds.left, anchor_y - self.bounds.top
+        # the point of the board under the anchor, in cells
+        x = (self.surface_area.left + anchor_x) / self.cell_size
+        y = (self.surface_area.top + anchor_y) / self.cell_size
+
+        self.__set_cell_size(cell_size)
+        self.surface_area.topleft = (round(x * cell_size) - anchor_x, round(y * cell_size) - anchor_y)
+        self.__clamp_view()
+
+    def center_on(self, lin, col):
+        """Move the view so that it's centered on the cell `(lin, col)` (as much as the bounds of the board allow)."""
+        half = self.cell_size // 2
+        self.surface_area.center = (col * self.cell_size + half, lin * self.cell_size + half)
+        self.__clamp_view()
+
+    def view_cells(self) -> pygame.Rect:
+        """Get the cells in view, as a rect of `(col, lin)` coordinates (partially visible cells included)."""
+        left, top = self.surface_area.left // self.cell_size, self.surface_area.top // self.cell_size
+        right = (self.surface_area.right - 1) // self.cell_size + 1
+        bottom = (self.surface_area.bottom - 1) // self.cell_size + 1
+        return pygame.Rect(left, top, right - left, bottom - top)
 
     def handle_event(self, event):
         """Event handler."""
-        if event.type == pygame.MOUSEBUTTONUP:
+        if self.minimap is not None and event.type in (pygame.MOUSEBUTTONDOWN, pygame.MOUSEMOTION):
+            # clicking or dragging over the minimap moves the view there
+            pressed = event.button == MOUSEBUTTONLEFT if event.type == pygame.MOUSEBUTTONDOWN else event.buttons[0]
+            if pressed and self.minimap.area.collidepoint(event.pos):
+                self.center_on(*self.minimap.cell_at(event.pos))
+        elif event.type == pygame.MOUSEBUTTONUP:
             mouse_pos = pygame.mouse.get_pos()
 
             # ignore click if it's not on the board
@@ -191,25 +343,149 @@ class Board:
 
             l, c = self.__get_click_pos(*mouse_pos)
 
+            # zoomed out boards may not fill the view
+            if not self.infinite and not (0 <= l < self.height and 0 <= c < self.width):
+                return
+
             if event.button == MOUSEBUTTONLEFT:
                 pygame.event.post(pygame.event.Event(BOARD_REVEAL, l=l, c=c))
             elif event.button == MOUSEBUTTONRIGHT:
                 pygame.event.post(pygame.event.Event(BOARD_FLAG, l=l, c=c))
+            elif event.button == MOUSEBUTTONMIDDLE:
+                pygame.event.post(pygame.event.Event(BOARD_CHORD, l=l, c=c))
+        elif event.type == pygame.MOUSEWHEEL:
+            # zoom around the mouse, if it's over the board
+            mouse_pos = pygame.mouse.get_pos()
+            if self.bounds.collidepoint(mouse_pos) and event.y:
+                self.__zoom(-1 if event.y > 0 else 1, mouse_pos)
+        elif event.type == pygame.KEYUP and event.key in Board.ZOOM_KEYS:
+            self.__zoom(Board.ZOOM_KEYS[event.key])
         elif event.type == pygame.KEYUP and event.key in Board.BOARD_SHIFT.keys():
-            # move board by 2 cells in the specified direction if user pressed arrow keys
+            # move board in the specified direction if user pressed arrow keys
             self.__shift_board(Board.BOARD_SHIFT[event.key])
         elif event.type in Board.BOARD_SHIFT.keys():
-            # move board by 2 cells if the move event has been fired
+            # move board if the move event has been fired
             self.__shift_board(Board.BOARD_SHIFT[event.type])
 
-    def update(self, state: GameState):
-        """Update the board with the given state."""
-        self.height, self.width = state.size
-        self.board = deepcopy(state.board)
+    def update(self, state: GameState, changes: Optional[Sequence[tuple[int, int]]] = None):
+        """Update the board with the given state.
 
-        self.__update_surface()
+        Only the changed cells of the tiles in the cache are redrawn, the other tiles will pick up the changes when
+        they get rendered. When more cells changed than the cache holds, the cache is emptied instead.
+
+        :param state: The new state of the game.
+        :param changes: The cells changed since the last update, as `(lin, col)` pairs (default None, in which case
+        they are found by comparing the boards). They must be given for infinite boards.
+        """
+        if self.infinite:
+            # only the changed cells are copied, the chunks of the board are allocated as they're touched
+            for i, j in changes:
+                self.board[i, j] = state.board[i, j]
+        elif changes is None:
+            changes = [
+                divmod(cell, self.width)
+                for cell, (old, new) in enumerate(zip(self.board.data, state.board.data))
+                if old != new
+            ]
+
+        if not self.infinite:
+            if self.minimap is not None:
+                self.minimap.update(self.board, state.board, changes)
+            self.board.data[:] = state.board.data
+
+        if len(changes) > len(self.tiles) * self.tile_cells * self.tile_cells:
+            # more cells changed than the cached tiles have, rendering the tiles again when they're drawn is cheaper
+            self.tiles.clear()
+            self.tiles_bytes = 0
+            return
+
+        if self.array_rendering:
+            # drawing a whole tile as an array is about as fast as drawing one of its cells
+            cells = np.fromiter(chain.from_iterable(changes), dtype=np.int64, count=2 * len(changes)).reshape(-1, 2)
+            for tile_lin, tile_col in np.unique(cells // self.tile_cells, axis=0).tolist():
+                tile = self.tiles.get((tile_lin, tile_col))
+                if tile is not None:
+                    self.__update_surface_array(tile, tile_lin, tile_col)
+            return
+
+        for i, j in changes:
+            tile = self.tiles.get((i // self.tile_cells, j // self.tile_cells))
+            if tile is not None:
+                self.__draw_cell(tile, i, j)
+
+    def set_probabilities(self, probabilities: Optional[Probabilities]):
+        """Set the mine probabilities shown over the unknown cells, or hide them with None."""
+        self.probabilities = probabilities
+
+    def __get_tints(self) -> list[pygame.Surface]:
+        """Get the tints of the probability overlay, from the safest to the most dangerous, rendering them once."""
+        if self.__tints is None:
+            safe, mine = pygame.Color(Theme.PROBABILITY_SAFE_COLOR), pygame.Color(Theme.PROBABILITY_MINE_COLOR)
+            self.__tints = []
+
+            for level in range(Board.PROBABILITY_TINTS):
+                tint = pygame.Surface((self.cell_size, self.cell_size), pygame.SRCALPHA)
+                color = safe.lerp(mine, level / (Board.PROBABILITY_TINTS - 1))
+                color.a = Board.PROBABILITY_ALPHA
+                tint.fill(color)
+                self.__tints.append(tint)
+
+        return self.__tints
+
+    def __draw_probabilities(self, surface: pygame.Surface, visible: pygame.Rect):
+        """Draw the mine probabilities over the visible unknown cells."""
+        tints = self.__get_tints()
+        unknown = (BoardCell.UNSELECTED.value, BoardCell.FLAGGED.value)
+        left, top = self.bounds.left - self.surface_area.left, self.bounds.top - self.surface_area.top
+        blits = []
+
+        for i in range(visible.top // self.cell_size, (visible.bottom - 1) // self.cell_size + 1):
+            for j in range(visible.left // self.cell_size, (visible.right - 1) // self.cell_size + 1):
+                if self.board[i, j] in unknown:
+                    level = round(self.probabilities.get(i * self.width + j) * (Board.PROBABILITY_TINTS - 1))
+                    blits.append((tints[level], (left + j * self.cell_size, top + i * self.cell_size)))
+
+        surface.blits(blits, doreturn=False)
 
     def draw(self, surface: pygame.Surface):
-        """Draw the board onto the screen in the area given by `self.bounds`."""
-        surface.blit(self.surface, self.bounds.topleft, self.surface_area)
+        """Draw the board onto the screen in the area given by `self.bounds`, with its border."""
+        self.draw_dynamic(surface)
+        self.draw_static(surface)
+
+    def draw_static(self, surface: pygame.Surface):
+        """Draw the border around the area of the board, and around the minimap if it's shown."""
         draw_border(surface, self.bounds, pygame.Color(Theme.BG_COLOR), width=8, depth="down", inner=False)
+
+        if self.minimap is not None:
+            draw_border(surface, self.minimap.area, pygame.Color(Theme.BG_COLOR), width=4, depth="down", inner=False)
+
+    def draw_dynamic(self, surface: pygame.Surface):
+        """Draw the board onto the screen in the area given by `self.bounds`.
+
+        Only the tiles which intersect the visible area of the board are drawn (and rendered if needed). The mine
+        probabilities are drawn over them, if they're set and the cells are large enough. The minimap is drawn last.
+        """
+        tile_pixels = Board.TILE_PIXELS
+        visible = self.surface_area if self.infinite else self.surface_area.clip(self.surface_bounds)
+
+        clip = surface.get_clip()
+        surface.set_clip(self.bounds.clip(clip))
+
+        for tile_lin in range(visible.top // tile_pixels, (visible.bottom - 1) // tile_pixels + 1):
+            for tile_col in range(visible.left // tile_pixels, (visible.right - 1) // tile_pixels + 1):
+                tile_bounds = self.__tile_bounds(tile_lin, tile_col)
+                surface.blit(
+                    self.__get_tile(tile_lin, tile_col),
+                    (
+                        self.bounds.left + tile_bounds.left - self.surface_area.left,
+                        self.bounds.top + tile_bounds.top - self.surface_area.top,
+                    ),
+                )
+
+        if self.probabilities is not None and self.cell_size >= Board.PROBABILITY_MIN_CELL_SIZE:
+            self.__draw_probabilities(surface, visible)
+
+        surface.set_clip(clip)
+
+        if self.minimap is not None:
+            self.minimap.draw(surface, self.view_cells())
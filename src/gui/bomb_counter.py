@@ -23,7 +23,7 @@ class BombCounter(Counter):
         :param bounds: The bounds the timer will occupy on the screen.
         :param state: The game state.
         """
-        super().__init__(bounds, state.max_bombs)
+        super().__init__(bounds, state.flags)
 
     def handle_event(self, event):
         """Event handler.
@@ -10,16 +10,23 @@ class Button:
     Instance variables:
         - bounds: The bounds of the button.
         - bg_color: The background color of the button.
-        - text: The text of the button.
-        - text_rect: The bounds of the text.
+        - appearance: The rendered button, including its border.
         - click_event: The event to emit upon clicking.
 
+    The appearance of a button is rendered once and shared by all the buttons which look the same.
+
     Methods:
         - __init__: Initialize the input.
         - handle_event: Handle input events.
         - draw: Draw the input.
     """
 
+    # the border is drawn around the bounds of the button
+    BORDER_WIDTH = 8
+
+    # rendered buttons, indexed by `(size, bg_color, text, text_color, font)`
+    __appearances: dict[tuple, pygame.Surface] = {}
+
     def __init__(self, bounds: pygame.Rect, bg_color, text, text_color, font: pygame.font.Font, click_event):
         """Initialize a button.
 
@@ -35,15 +42,33 @@ class Button:
         self.bounds = bounds.copy()
         self.bg_color = bg_color
 
-        self.text = font.render(text, True, text_color)
-        self.text_rect = self.text.get_rect()
-        self.text_rect.center = self.bounds.center
+        key = (self.bounds.size, str(bg_color), text, str(text_color), font)
+        if key not in Button.__appearances:
+            Button.__appearances[key] = self.__render(text, text_color, font)
+
+        self.appearance = Button.__appearances[key]
 
         self.click_event = click_event
         self.click_bounds = pygame.Rect(
             self.bounds.x - 8, self.bounds.y - 8, self.bounds.width + 16, self.bounds.height + 16
         )
 
+    def __render(self, text, text_color, font: pygame.font.Font) -> pygame.Surface:
+        """Render the button with its border, which covers the whole surface."""
+        surface = pygame.Surface(self.bounds.inflate(2 * Button.BORDER_WIDTH, 2 * Button.BORDER_WIDTH).size)
+        bounds = pygame.Rect((Button.BORDER_WIDTH, Button.BORDER_WIDTH), self.bounds.size)
+
+        pygame.draw.rect(surface, self.bg_color, bounds)
+
+        text_surface = font.render(text, True, text_color)
+        text_rect = text_surface.get_rect()
+        text_rect.center = bounds.center
+        surface.blit(text_surface, text_rect)
+
+        draw_border(surface, bounds, pygame.Color(self.bg_color), width=Button.BORDER_WIDTH, depth="up", inner=False)
+
+        return surface
+
     def handle_event(self, event):
         """Event handler."""
         # check if the user clicked the button and fire the given event
@@ -56,7 +81,4 @@ class Button:
 
     def draw(self, screen: pygame.Surface):
         """Draw handler."""
-        pygame.draw.rect(screen, self.bg_color, self.bounds)
-        screen.blit(self.text, self.text_rect)
-
-        draw_border(screen, self.bounds, pygame.Color(self.bg_color), width=8, depth="up", inner=False)
+        screen.blit(self.appearance, (self.bounds.x - Button.BORDER_WIDTH, self.bounds.y - Button.BORDER_WIDTH))
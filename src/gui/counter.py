@@ -1,5 +1,6 @@
 import pygame
 
+from resources import load_font
 from theme import Theme
 from utils import draw_border
 
@@ -7,6 +8,9 @@ from utils import draw_border
 class Counter:
     """Generic counter component.
 
+    The texts are composed from glyphs rendered once and shared by all the counters, so updating the value of a
+    counter doesn't rasterize any text.
+
     Instance variables:
         - font: The font of the counter. Uses seven-segment.
         - bounds: The bounds of the counter.
@@ -16,7 +20,15 @@ class Counter:
     Methods:
         - __init__: Construct a Counter instance.
         - _update_text: Update the display value of the counter.
+        - draw: Draw the counter.
+        - draw_static: Draw the parts of the counter which never change.
+        - draw_dynamic: Draw the value of the counter.
     """
+    # rendered glyphs, indexed by `(font, color, character)`
+    __glyphs: dict[tuple, pygame.Surface] = {}
+    # rendered background texts, indexed by `font`
+    __bg_texts: dict[pygame.font.Font, pygame.Surface] = {}
+
     def __init__(self, bounds: pygame.Rect, count: int):
         """Initialize the counter.
 
@@ -25,7 +37,7 @@ class Counter:
         :param bounds: The bounds of the counter.
         :param count: The value of the counter.
         """
-        self.font = pygame.font.Font("assets/seven-segment.ttf", 48)
+        self.font = load_font("assets/seven-segment.ttf", 48)
 
         self.bounds = bounds.copy()
         self.count = count
@@ -40,15 +52,37 @@ class Counter:
         counter.
         If the counter is disabled, the foreground text is omitted.
         """
-        self.bg_text = self.font.render("888", True, Theme.TIMER_TEXT_COLOR_DISABLED)
+        if self.font not in Counter.__bg_texts:
+            Counter.__bg_texts[self.font] = self.__render("888", Theme.TIMER_TEXT_COLOR_DISABLED)
+
+        self.bg_text = Counter.__bg_texts[self.font]
         if not self.disabled:
-            self.text = self.font.render(f"{self.count:03}", True, Theme.TIMER_TEXT_COLOR)
+            self.text = self.__render(f"{self.count:03}", Theme.TIMER_TEXT_COLOR)
 
         self.text_rect = self.bg_text.get_rect()
         self.text_rect.height //= 2
         # this font is weird so random constants were added so that I can make sure they're properly aligned
         self.text_rect.center = (self.bounds.centerx + 3, self.bounds.centery - self.text_rect.height - 1)
 
+    def __render(self, text, color) -> pygame.Surface:
+        """Compose a text from the cached glyphs of its characters.
+
+        The result looks exactly like `self.font.render(text, True, color)`.
+        """
+        surface = pygame.Surface(self.font.size(text), pygame.SRCALPHA)
+        x = 0
+
+        for char in text:
+            key = (self.font, str(color), char)
+            if key not in Counter.__glyphs:
+                Counter.__glyphs[key] = self.font.render(char, True, color)
+
+            surface.blit(Counter.__glyphs[key], (x, 0))
+            # advance by the horizontal advance of the character
+            x += self.font.metrics(char)[0][4]
+
+        return surface
+
     def handle_event(self, event):
         """Event handler.
 
@@ -60,8 +94,18 @@ class Counter:
         """Draw the counter on the screen.
 
         If the counter is disabled, the foreground text is omitted."""
+        self.draw_static(surface)
+        self.draw_dynamic(surface)
+
+    def draw_static(self, surface: pygame.Surface):
+        """Draw the background and the border of the counter."""
         pygame.draw.rect(surface, Theme.TIMER_BG_COLOR, self.bounds)
         draw_border(surface, self.bounds, pygame.Color(Theme.BG_COLOR), width=8, depth="down")
+
+    def draw_dynamic(self, surface: pygame.Surface):
+        """Draw the texts of the counter, over its background.
+
+        If the counter is disabled, the foreground text is omitted."""
         surface.blit(self.bg_text, self.text_rect)
         if not self.disabled:
             surface.blit(self.text, self.text_rect)
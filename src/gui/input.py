@@ -24,6 +24,8 @@ class Input:
         - __init__: Initialize the input.
         - handle_event: Handle input events.
         - draw: Draw the input.
+        - draw_static: Draw the parts of the input which never change.
+        - draw_dynamic: Draw the content of the input.
         - set_active: Set the input as active. This means it can be edited.
     """
 
@@ -40,6 +42,12 @@ class Input:
         self.cursor_pos = 0
 
         self.active = False  # Input box starts active by default
+
+        # the rendered text (or placeholder) and the cursor offset, for the text and cursor position they were built for
+        self.__text_surface = None
+        self.__rendered_text = None
+        self.__cursor_offset = 0
+        self.__rendered_cursor = None
         self.click_bounds = pygame.Rect(
             self.bounds.x - 8, self.bounds.y - 8, self.bounds.width + 16, self.bounds.height + 16
         )
@@ -78,31 +86,49 @@ class Input:
 
     def draw(self, surface):
         """Render the text input box and its content."""
+        self.draw_dynamic(surface)
+        self.draw_static(surface)
+
+    def draw_static(self, surface):
+        """Render the border of the text input box."""
+        draw_border(surface, self.bounds, pygame.Color(Theme.BG_COLOR), width=8, depth="down", inner=False)
+
+    def __update_render(self):
+        """Re-render the text and re-measure the cursor offset, only if they changed since the last frame."""
+        if self.__rendered_text != self.text:
+            if len(self.text) == 0:
+                self.__text_surface = self.font.render(self.placeholder, True, adjust_color(self.text_color, 0.3))
+            else:
+                self.__text_surface = self.font.render(self.text, True, self.text_color)
+
+            self.__rendered_text = self.text
+            self.__rendered_cursor = None
+
+        if self.__rendered_cursor != self.cursor_pos:
+            self.__cursor_offset = self.font.size(self.text[: self.cursor_pos])[0]
+            self.__rendered_cursor = self.cursor_pos
+
+    def draw_dynamic(self, surface):
+        """Render the content of the text input box, inside its border."""
+        self.__update_render()
+        text_surface = self.__text_surface
+
         # Draw the background rectangle
         pygame.draw.rect(surface, self.bg_color, self.bounds)
 
-        # Render the text
-        if len(self.text) == 0:
-            text_surface = self.font.render(self.placeholder, True, adjust_color(self.text_color, 0.3))
-            surface.blit(
-                text_surface, (self.bounds.x + 5, self.bounds.y + (self.bounds.height - text_surface.get_height()) // 2)
-            )
-        else:
-            text_surface = self.font.render(self.text, True, self.text_color)
-            surface.blit(
-                text_surface, (self.bounds.x + 5, self.bounds.y + (self.bounds.height - text_surface.get_height()) // 2)
-            )
+        # Draw the text
+        surface.blit(
+            text_surface, (self.bounds.x + 5, self.bounds.y + (self.bounds.height - text_surface.get_height()) // 2)
+        )
 
         # Draw the cursor
         if self.active:
-            cursor_x = self.font.size(self.text[: self.cursor_pos])[0] + self.bounds.x + 5
+            cursor_x = self.__cursor_offset + self.bounds.x + 5
             cursor_y = self.bounds.y + (self.bounds.height - text_surface.get_height()) // 2
             pygame.draw.line(
                 surface, self.text_color, (cursor_x, cursor_y), (cursor_x, cursor_y + text_surface.get_height()), 2
             )
 
-        draw_border(surface, self.bounds, pygame.Color(Theme.BG_COLOR), width=8, depth="down", inner=False)
-
     def set_active(self, active):
         """Set whether the text box is active."""
         self.active = active
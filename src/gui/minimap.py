@@ -0,0 +1,172 @@
+import math
+from itertools import chain
+from typing import Sequence
+
+import pygame
+
+from grid import Grid
+from gui.palette import cell_colors
+from gui.sprites import CellSprites
+from optional import np
+from theme import Theme
+
+
+class Minimap:
+    """Overview of a whole board, downsampled to fit a small area of the screen.
+
+    Every pixel of the overview stands for a block of `scale x scale` cells, and has the average color of its cells.
+    The board is downsampled to the number of cells of each value in every block, which is updated incrementally: the
+    changed cells only move the counts of their blocks from their old value to their new one. The colors of the blocks
+    are then a product of their counts with the colors of the values, and the pixels are written with
+    `pygame.surfarray`, so the minimap needs NumPy.
+
+    Instance variables:
+        - bounds: The area of the screen the minimap may take.
+        - height: The height of the board, in cells.
+        - width: The width of the board, in cells.
+        - scale: The size of the side of the block of cells shown by a pixel of the overview.
+        - pixel_size: The size of a pixel of the overview on the screen (the small boards are scaled up).
+        - area: The area of the screen the overview is drawn in, centered in `bounds`.
+
+    Methods:
+        - __init__: Build the overview of a board.
+        - update: Update the overview with the changed cells of the board.
+        - cell_at: Get the cell shown at a position of the screen.
+        - draw: Draw the overview and the area of the board in view.
+    """
+
+    # the blocks are counted by chunks of about this many cells per side when the whole overview is built
+    CHUNK_CELLS = 1024
+    # the whole overview is built again when more than this fraction of the cells changed at once
+    REBUILD_FRACTION = 0.02
+
+    def __init__(self, bounds: pygame.Rect, board: Grid):
+        """Build the overview of a board.
+
+        :param bounds: The area of the screen the minimap may take.
+        :param board: The board.
+        """
+        self.bounds = bounds.copy()
+        self.height, self.width = board.height, board.width
+        self.scale = max(1, math.ceil(max(self.height, self.width) / min(self.bounds.size)))
+
+        blocks_height, blocks_width = math.ceil(self.height / self.scale), math.ceil(self.width / self.scale)
+        self.pixel_size = max(1, min(self.bounds.width // blocks_width, self.bounds.height // blocks_height))
+        self.area = pygame.Rect(0, 0, blocks_width * self.pixel_size, blocks_height * self.pixel_size)
+        self.area.center = self.bounds.center
+
+        # the values are numbered in the order of `CellSprites.VALUES`, the colors of the blocks are the product of
+        # their counts of each value with the colors of the values
+        values = np.array(CellSprites.VALUES, dtype=np.int8).view(np.uint8)
+        self.__classes = np.zeros(256, dtype=np.int32)
+        self.__classes[values] = np.arange(len(values))
+        self.__palette = cell_colors()[values].astype(np.int64)
+
+        # the number of cells of every value in every block, and the number of cells of every block
+        self.__counts = np.zeros((blocks_height, blocks_width, len(values)), dtype=np.int64)
+        lines = np.minimum(self.scale, self.height - np.arange(blocks_height) * self.scale)
+        columns = np.minimum(self.scale, self.width - np.arange(blocks_width) * self.scale)
+        self.__cells = np.outer(lines, columns)[..., np.newaxis]
+
+        # the average colors of the blocks, and the image they're written on
+        self.__pixels = np.zeros((blocks_height, blocks_width, 3), dtype=np.uint8)
+        self.__image = pygame.Surface((blocks_width, blocks_height))
+        self.__surface = None
+
+        self.__build(board)
+
+    def __values(self, board: Grid):
+        """Get the cells of a board as a 2D array of unsigned bytes, sharing its memory."""
+        return np.frombuffer(board.data, dtype=np.uint8).reshape(self.height, self.width)
+
+    def __build(self, board: Grid):
+        """Count the values of all the blocks, a chunk of the board at a time, and redraw the overview."""
+        values = self.__values(board)
+        classes = len(self.__palette)
+        step = self.scale * max(1, Minimap.CHUNK_CELLS // self.scale)
+
+        for top in range(0, self.height, step):
+            for left in range(0, self.width, step):
+                chunk = values[top:top + step, left:left + step]
+                block_lins = np.arange(chunk.shape[0]) // self.scale
+                block_cols = np.arange(chunk.shape[1]) // self.scale
+                chunk_width = block_cols[-1] + 1
+
+                # count the pairs (block, value) of the chunk, as `block * classes + value`
+                keys = (block_lins[:, np.newaxis] * chunk_width + block_cols) * classes + self.__classes[chunk]
+                counts = np.bincount(keys.ravel(), minlength=(block_lins[-1] + 1) * chunk_width * classes)
+
+                block_lin, block_col = top // self.scale, left // self.scale
+                self.__counts[block_lin:block_lin + block_lins[-1] + 1, block_col:block_col + chunk_width] = (
+                    counts.reshape(block_lins[-1] + 1, chunk_width, classes)
+                )
+
+        self.__draw_image()
+
+    def __draw_image(self, blocks=None):
+        """Compute the average colors of the blocks, write them on the image of the overview and scale it to its area.
+
+        :param blocks: The indices of the blocks whose colors changed, in the flattened array of the blocks (default
+        None, for all the blocks).
+        """
+        if blocks is None:
+            self.__pixels[...] = self.__counts @ self.__palette // self.__cells
+        else:
+            classes = len(self.__palette)
+            counts, cells = self.__counts.reshape(-1, classes)[blocks], self.__cells.reshape(-1, 1)[blocks]
+            self.__pixels.reshape(-1, 3)[blocks] = counts @ self.__palette // cells
+
+        pygame.surfarray.blit_array(self.__image, self.__pixels.transpose(1, 0, 2))
+        self.__surface = pygame.transform.scale(self.__image, self.area.size)
+
+    def update(self, old: Grid, new: Grid, changes: Sequence[tuple[int, int]]):
+        """Update the overview with the changed cells of the board.
+
+        :param old: The board before the changes.
+        :param new: The board after the changes.
+        :param changes: The changed cells, as distinct `(lin, col)` pairs.
+        """
+        if not changes:
+            return
+
+        if len(changes) > Minimap.REBUILD_FRACTION * self.height * self.width:
+            self.__build(new)
+            return
+
+        cells = np.fromiter(chain.from_iterable(changes), dtype=np.intp, count=2 * len(changes)).reshape(-1, 2)
+        lins, cols = cells[:, 0], cells[:, 1]
+        classes = len(self.__palette)
+        blocks = (lins // self.scale) * self.__counts.shape[1] + cols // self.scale
+
+        # move the changed cells from the count of their old value to the count of their new one
+        counts = self.__counts.reshape(-1)
+        np.subtract.at(counts, blocks * classes + self.__classes[self.__values(old)[lins, cols]], 1)
+        np.add.at(counts, blocks * classes + self.__classes[self.__values(new)[lins, cols]], 1)
+
+        self.__draw_image(np.unique(blocks))
+
+    def cell_at(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Get the `(lin, col)` cell at the center of the block shown at a position of the screen (in `area`)."""
+        block_lin = (pos[1] - self.area.top) // self.pixel_size
+        block_col = (pos[0] - self.area.left) // self.pixel_size
+        return (
+            min(block_lin * self.scale + self.scale // 2, self.height - 1),
+            min(block_col * self.scale + self.scale // 2, self.width - 1),
+        )
+
+    def draw(self, surface: pygame.Surface, view: pygame.Rect):
+        """Draw the overview, with the outline of the area of the board in view.
+
+        :param surface: The surface to draw on.
+        :param view: The cells in view, as a rect of `(col, lin)` coordinates.
+        """
+        surface.blit(self.__surface, self.area)
+
+        ratio = self.pixel_size / self.scale
+        outline = pygame.Rect(
+            self.area.left + math.floor(view.left * ratio),
+            self.area.top + math.floor(view.top * ratio),
+            max(2, math.ceil(view.width * ratio)),
+            max(2, math.ceil(view.height * ratio)),
+        )
+        pygame.draw.rect(surface, Theme.TEXT_COLOR, outline.clip(self.area), width=1)
@@ -0,0 +1,35 @@
+"""The colors of the cell values, for drawing boards with a pixel (or a few) per cell.
+
+The boards are mapped through the colors as arrays, so these drawings need NumPy (an optional dependency, see
+`optional.HAS_NUMPY`).
+
+Functions:
+    - cell_colors: Get the color of every cell value.
+"""
+
+import pygame
+
+from optional import np
+from state import BoardCell
+from theme import Theme
+
+
+def cell_colors():
+    """Get the color of every cell value, as a `(256, 3)` array of RGB colors indexed by the value as an unsigned byte.
+
+    The values are the bytes of the boards, so negative values (unselected, flagged) wrap around: `-1` is at 255.
+    Unknown cells are dark, revealed cells light, and the numbers have a lighter tone of their text color.
+    """
+    colors = np.zeros((256, 3), dtype=np.uint8)
+    revealed = pygame.Color(Theme.REVEALED_BG_COLOR)
+
+    colors[BoardCell.UNSELECTED.value % 256] = pygame.Color(Theme.UNREVEALED_BG_COLOR)[:3]
+    colors[BoardCell.FLAGGED.value % 256] = pygame.Color("red")[:3]
+    colors[0] = revealed[:3]
+    for value in range(1, 9):
+        color = pygame.Color(Theme.CELL_COLORS[(value - 1) % len(Theme.CELL_COLORS)])
+        colors[value] = color.lerp(revealed, 0.5)[:3]
+    colors[BoardCell.BOMB.value] = pygame.Color("black")[:3]
+    colors[BoardCell.BOMB_REVEALED.value] = pygame.Color(Theme.REVEALED_BOMB_BG_COLOR)[:3]
+
+    return colors
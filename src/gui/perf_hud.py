@@ -0,0 +1,95 @@
+import pygame
+
+from profiling import Profiler
+
+
+class PerfHud:
+    """Performance overlay, showing the timings collected by a profiler.
+
+    For every section, it shows the 50th, 95th and 99th percentiles of its last durations. The texts are only
+    re-rendered a few times per second, so the overlay itself doesn't weigh on the frame time.
+
+    Instance variables:
+        - pos: The top-left corner of the overlay.
+        - font: The font of the overlay.
+        - profiler: The profiler to read the timings from.
+        - visible: Whether the overlay is shown (the profiler is enabled while it is).
+
+    Methods:
+        - __init__: Initialize the overlay.
+        - toggle: Show/hide the overlay.
+        - draw: Draw the overlay.
+    """
+
+    # the sections shown, with their label
+    SECTIONS = [
+        ("frame", "frame"),
+        ("events", "events"),
+        ("moves", "moves"),
+        ("board_update", "board upd"),
+        ("solver", "solver"),
+        ("probability", "probability"),
+        ("draw", "draw"),
+    ]
+    # how often the texts are re-rendered, in ms
+    REFRESH_INTERVAL = 250
+
+    def __init__(self, pos: tuple[int, int], font: pygame.font.Font, profiler: Profiler):
+        """Initialize the overlay (hidden)."""
+        self.pos = pos
+        self.font = font
+        self.profiler = profiler
+        self.visible = False
+
+        # rendered `(label, value)` pairs, one per line
+        self.__lines: list[tuple[pygame.Surface, pygame.Surface]] = []
+        self.__background = None
+        self.__value_offset = 0
+        self.__last_refresh = -PerfHud.REFRESH_INTERVAL
+
+    def toggle(self):
+        """Show/hide the overlay, enabling/disabling the profiler accordingly (it stays enabled while a trace is
+        written)."""
+        self.visible = not self.visible
+        self.profiler.enabled = self.visible or self.profiler.is_tracing()
+        self.__last_refresh = -PerfHud.REFRESH_INTERVAL
+
+    def __refresh(self):
+        """Re-render the texts of the overlay from the latest timings."""
+        texts = [("ms", "p50/p95/p99")]
+
+        for name, label in PerfHud.SECTIONS:
+            percentiles = self.profiler.percentiles(name)
+            if percentiles is None:
+                texts.append((label, "-"))
+            else:
+                texts.append((label, "/".join(f"{p * 1000:.1f}" for p in percentiles)))
+
+        self.__lines = [
+            (self.font.render(label, True, "white"), self.font.render(value, True, "white")) for label, value in texts
+        ]
+
+        self.__value_offset = max(label.get_width() for label, _ in self.__lines) + 16
+        width = self.__value_offset + max(value.get_width() for _, value in self.__lines) + 16
+        height = sum(label.get_height() for label, _ in self.__lines) + 16
+        self.__background = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.__background.fill((0, 0, 0, 180))
+
+    def draw(self, surface: pygame.Surface):
+        """Draw the overlay (if visible)."""
+        if not self.visible:
+            return
+
+        now = pygame.time.get_ticks()
+        if now - self.__last_refresh >= PerfHud.REFRESH_INTERVAL:
+            self.__refresh()
+            self.__last_refresh = now
+
+        x, y = self.pos
+        surface.blit(self.__background, (x, y))
+
+        y += 8
+        for label, value in self.__lines:
+            surface.blit(label, (x + 8, y))
+            surface.blit(value, (x + self.__value_offset, y))
+            y += label.get_height()
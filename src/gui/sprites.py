@@ -0,0 +1,174 @@
+import pygame
+
+from state import BoardCell
+from theme import Theme
+from utils import draw_border
+
+
+class CellSprites:
+    """Sprite atlas with every appearance a board cell can have.
+
+    There are only 13 distinct cell values (unselected, flagged, 0 to 8, bomb and revealed bomb), each of them is
+    pre-rendered once per font and cell size, so drawing a cell is a single blit. The sprites of small cells can be
+    rendered at a larger size and scaled down, so that their text and grid lines shrink along with them.
+    Each value comes in 4 variants, depending on whether the grid lines on the right and bottom edges of the cell are
+    drawn (they are not for the last column and line of the board).
+
+    The sprites are laid out on a single surface: one column per value, one line per variant.
+
+    Instance variables:
+        - font: The font of the cells.
+        - cell_size: The size of a cell, in pixels.
+        - border_width: The width of the grid lines.
+        - atlas: The surface with all the sprites.
+
+    Methods:
+        - get: Get the (cached) sprites for a font and a cell size.
+        - __init__: Render the sprites, and scale them down if needed.
+        - area: Get the area of a sprite on the atlas.
+        - render_cell: Draw a cell.
+    """
+
+    # all the cell values, in the order of the columns of the atlas
+    VALUES = [BoardCell.UNSELECTED.value, BoardCell.FLAGGED.value, *range(9), BoardCell.BOMB.value,
+              BoardCell.BOMB_REVEALED.value]
+
+    # sprites already rendered, indexed by `(font, cell_size, border_width, render_size)`
+    __cache: dict[tuple, "CellSprites"] = {}
+
+    @classmethod
+    def get(cls, font: pygame.font.Font, cell_size, border_width, render_size=None) -> "CellSprites":
+        """Get the sprites for a font and a cell size, rendering them the first time they are requested."""
+        key = (font, cell_size, border_width, render_size or cell_size)
+
+        if key not in cls.__cache:
+            cls.__cache[key] = cls(font, cell_size, border_width, render_size)
+
+        return cls.__cache[key]
+
+    def __init__(self, font: pygame.font.Font, cell_size, border_width, render_size=None):
+        """Render the sprites of all the cell values.
+
+        :param font: The font of the cells.
+        :param cell_size: The size of a cell, in pixels.
+        :param border_width: The width of the grid lines, at the render size.
+        :param render_size: The size the cells are rendered at, before being scaled down to `cell_size` (default
+        `cell_size`). It should be a multiple of `cell_size`, so that the sprites don't bleed into each other.
+        """
+        self.font = font
+        self.cell_size = cell_size
+        self.border_width = border_width
+        render_size = render_size or cell_size
+
+        self.atlas = pygame.Surface((len(CellSprites.VALUES) * render_size, 4 * render_size))
+        self.__areas = {}
+
+        for column, value in enumerate(CellSprites.VALUES):
+            for right in (False, True):
+                for bottom in (False, True):
+                    area = pygame.Rect(column * render_size, (2 * bottom + right) * render_size, render_size,
+                                       render_size)
+                    self.render_cell(self.atlas, area, value, right, bottom)
+                    self.__areas[value, right, bottom] = pygame.Rect(
+                        column * cell_size, (2 * bottom + right) * cell_size, cell_size, cell_size
+                    )
+
+        if render_size != cell_size:
+            self.atlas = pygame.transform.smoothscale(
+                self.atlas, (len(CellSprites.VALUES) * cell_size, 4 * cell_size)
+            )
+
+    def area(self, value, right=True, bottom=True) -> pygame.Rect:
+        """Get the area of the sprite of a cell on the atlas.
+
+        :param value: The value of the cell.
+        :param right: Whether the grid line on the right of the cell is drawn (default True).
+        :param bottom: Whether the grid line at the bottom of the cell is drawn (default True).
+        """
+        return self.__areas[value, right, bottom]
+
+    def __cell_to_text(self, cell):
+        """Converts a cell value to a text element to be rendered."""
+        if cell == BoardCell.BOMB.value or cell == BoardCell.BOMB_REVEALED.value:
+            text = "*"
+            color = "black"
+        elif cell == BoardCell.FLAGGED.value:
+            text = "`"
+            color = "red"
+        else:
+            text = str(cell)
+            color = Theme.CELL_COLORS[(cell - 1) % len(Theme.CELL_COLORS)]
+
+        return self.font.render(text, True, color)
+
+    def render_cell(self, surface: pygame.Surface, cell_bounds: pygame.Rect, cell, right=True, bottom=True):
+        """Draw a cell on a surface.
+
+        Drawing is clipped to the cell. The grid lines are drawn over the top and left edges of the cell, and
+        optionally over its right and bottom edges (these belong to the neighboring cells, but they overflow in this
+        one).
+
+        :param surface: The surface to draw on.
+        :param cell_bounds: The bounds of the cell on the surface.
+        :param cell: The value of the cell.
+        :param right: Whether to draw the grid line on the right of the cell (default True).
+        :param bottom: Whether to draw the grid line at the bottom of the cell (default True).
+        """
+        surface.set_clip(cell_bounds)
+        surface.fill(Theme.REVEALED_BG_COLOR, cell_bounds)
+
+        # draw cells that need a different background
+        if cell == BoardCell.BOMB_REVEALED.value or cell == BoardCell.BOMB.value:
+            # draw revealed bomb in red background
+            if cell == BoardCell.BOMB_REVEALED.value:
+                pygame.draw.rect(surface, Theme.REVEALED_BOMB_BG_COLOR, cell_bounds)
+            # draw regular bombs in darker background
+            else:
+                pygame.draw.rect(surface, Theme.UNREVEALED_BG_COLOR, cell_bounds)
+
+            text = self.__cell_to_text(cell)
+            rect = text.get_rect()
+            rect.center = cell_bounds.center
+            surface.blit(text, rect)
+
+        # draw the vertical and horizontal borders over the edges of the cell
+        for x in (cell_bounds.left, cell_bounds.right)[:1 + right]:
+            pygame.draw.line(
+                surface,
+                Theme.BG_COLOR,
+                (x, cell_bounds.top - self.border_width),
+                (x, cell_bounds.bottom + self.border_width),
+                self.border_width,
+            )
+
+        for y in (cell_bounds.top, cell_bounds.bottom)[:1 + bottom]:
+            pygame.draw.line(
+                surface,
+                Theme.BG_COLOR,
+                (cell_bounds.left - self.border_width, y),
+                (cell_bounds.right + self.border_width, y),
+                self.border_width,
+            )
+
+        # skip values of 0, their cells should be left as is
+        if cell != 0:
+            # for unselected or flagged values, draw them in a darker tone
+            if cell == BoardCell.UNSELECTED.value or cell == BoardCell.FLAGGED.value:
+                pygame.draw.rect(surface, Theme.UNREVEALED_BG_COLOR, cell_bounds)
+                draw_border(
+                    surface,
+                    cell_bounds,
+                    pygame.Color(Theme.UNREVEALED_BG_COLOR),
+                    width=4,
+                    depth="up",
+                    inner=True,
+                )
+
+            # if the value was unselected, we can stop here
+            if cell != BoardCell.UNSELECTED.value:
+                text = self.__cell_to_text(cell)
+                rect = text.get_rect()
+                rect.center = cell_bounds.center
+                surface.blit(text, rect)
+
+        surface.set_clip(None)
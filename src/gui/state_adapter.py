@@ -0,0 +1,29 @@
+import pygame
+
+from constants import (BOARD_FLAG_PLACED, BOARD_FLAG_REMOVED, GAME_OVER,
+                       TIMER_TICK)
+from state import GameEvent, GameState
+
+
+def post_game_event(event: GameEvent, state: GameState):
+    """Translate the notifications of a game state into pygame timers and events.
+
+    This is the listener used by the GUI, it keeps the game rules free of any pygame dependency:
+    - GAME_STARTED: start the countdown of timed games, which emits TIMER_TICK once every 1s `time_left` times.
+    - GAME_OVER: stop the countdown and post GAME_OVER.
+    - FLAG_PLACED/FLAG_REMOVED: post BOARD_FLAG_PLACED/BOARD_FLAG_REMOVED.
+
+    :param event: The event emitted by the game state.
+    :param state: The game state which emitted the event.
+    """
+    if event == GameEvent.GAME_STARTED:
+        # a zero loop count would repeat the timer forever
+        if state.time_left > 0:
+            pygame.time.set_timer(TIMER_TICK, 1000, state.time_left)
+    elif event == GameEvent.GAME_OVER:
+        pygame.time.set_timer(TIMER_TICK, 0)
+        pygame.event.post(pygame.event.Event(GAME_OVER))
+    elif event == GameEvent.FLAG_PLACED:
+        pygame.event.post(pygame.event.Event(BOARD_FLAG_PLACED))
+    elif event == GameEvent.FLAG_REMOVED:
+        pygame.event.post(pygame.event.Event(BOARD_FLAG_REMOVED))
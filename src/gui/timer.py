@@ -30,10 +30,10 @@ class Timer(Counter):
     def handle_event(self, event):
         """Event handler.
 
-        It handles TIMER_TICK event.
+        It handles TIMER_TICK event, if the timer is enabled.
         Unrecognized events are just ignored.
 
         :param event: The event to handle."""
-        if event.type == TIMER_TICK:
+        if event.type == TIMER_TICK and not self.disabled:
             self.count -= 1
             self._update_text()
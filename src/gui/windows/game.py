@@ -1,17 +1,47 @@
+import math
+import os
+from concurrent.futures import Future
+from typing import Optional
+
 import pygame
 
-from constants import (BOARD_DOWN, BOARD_FLAG, BOARD_LEFT, BOARD_REVEAL,
-                       BOARD_RIGHT, BOARD_UP, GAME_HOME, GAME_OVER, GAME_RESTART,
-                       TIMER_TICK)
+from constants import (BOARD_CHORD, BOARD_DOWN, BOARD_FLAG, BOARD_LEFT,
+                       BOARD_REVEAL, BOARD_RIGHT, BOARD_UP, GAME_HOME, GAME_OVER,
+                       GAME_RESTART, TIMER_TICK)
 from gui import Board, BombCounter, Timer
 from gui.button import Button
+from gui.perf_hud import PerfHud
+from gui.state_adapter import post_game_event
 from gui.windows.window_base import WindowBase
-from state import GameState
+from infinite import InfiniteGameState
+from noguess import place_mines_no_guess
+from placement import place_mines
+from probability import Probabilities, mine_probabilities
+from profiling import profiler
+from replay import MoveLog
+from resources import load_image
+from savefile import DEFAULT_PATH, load_file, save_file
+from solver import Solver
+from state import GameEvent, GameState, Move
 from theme import Theme
 from utils import draw_border
+from workers import get_background_thread
 
 
 class GameWindow(WindowBase):
+    # map board events to the moves they make
+    BOARD_MOVES = {
+        BOARD_REVEAL: Move.REVEAL,
+        BOARD_FLAG: Move.FLAG,
+        BOARD_CHORD: Move.CHORD,
+    }
+    # boards from this many cells on have their moves applied in the background thread
+    BACKGROUND_MIN_CELLS = 128 * 128
+    # radius of the progress indicator shown while moves are applied in the background
+    PROGRESS_RADIUS = 24
+    # size of the area of the minimap, in pixels
+    MINIMAP_SIZE = 112
+
     def __init__(self, width, height, font: pygame.font.Font, context):
         """Initializes the game window."""
         super().__init__()
@@ -31,10 +61,26 @@ class GameWindow(WindowBase):
         self.timer = None
         self.board = None
         self.state = None
+        self.solver = None
+        # the events of the game, to replay it (None for resumed games, whose start wasn't recorded)
+        self.log = None
+        # the moves made during the current frame, applied as a single batch at its end
+        self.moves: list[tuple[Move, int, int]] = []
+        # the work being done in the background thread (moves, solver, probabilities), the state mustn't be used until
+        # it's done
+        self.task: Optional[Future] = None
+        # the timer ticks received while the background thread was busy
+        self.pending_ticks = 0
+        # whether the probabilities were toggled while the background thread was busy, and must be computed again
+        self.outdated_probabilities = False
+        self.show_probabilities = False
         self.width, self.height = width, height
         self.font = font
         self.context = context
 
+        # performance overlay, toggled with F3, kept between games
+        self.hud = PerfHud((0, 0), self.font, profiler)
+
         self.enter()
 
     def enter(self):
@@ -42,17 +88,50 @@ class GameWindow(WindowBase):
 
         Upon entering this window again, the state must be restarted and the UI elements redrawn, in order to reflect
         the new state of the game."""
+        # the widgets are rebuilt, so is the chrome
+        self.invalidate_chrome()
+
+        # the moves of the last game must be done before it's replaced
+        self.__finish_task()
+
         # stop timer from last game
         pygame.time.set_timer(TIMER_TICK, 0)
-        # init the game using context params
-        self.state = GameState(
-            size=(self.context.x, self.context.y),
-            max_bombs=self.context.bombs,
-            time=self.context.time,
-        )
+        # resume the saved game if asked to, otherwise init the game using context params
+        self.state = self.__load_saved_game() if self.context.resume else None
+        self.context.resume = False
+
+        if self.state is None and self.context.infinite:
+            self.state = InfiniteGameState(
+                density=self.context.bombs / (self.context.x * self.context.y),
+                time=self.context.time,
+                listener=post_game_event,
+            )
+            self.log = None
+        elif self.state is None:
+            self.state = GameState(
+                size=(self.context.x, self.context.y),
+                max_bombs=self.context.bombs,
+                time=self.context.time,
+                listener=post_game_event,
+                mine_placer=place_mines_no_guess if self.context.no_guess else place_mines,
+            )
+            self.log = MoveLog.for_state(self.state, no_guess=self.context.no_guess)
+        else:
+            self.log = None
+        self.solver = None
+        self.moves = []
+        self.outdated_probabilities = False
 
         board_bounds = pygame.Rect((self.width - 512) / 2, (self.height - 512) / 2, 512, 512)
-        self.board = Board(board_bounds, self.state, self.font)
+        # the minimap takes the margin on the right of the board
+        minimap_bounds = pygame.Rect(board_bounds.right + 16, board_bounds.top, GameWindow.MINIMAP_SIZE,
+                                     GameWindow.MINIMAP_SIZE)
+        self.board = Board(board_bounds, self.state, self.font, minimap_bounds=minimap_bounds)
+
+        # the solver and the probabilities need a bounded board, building them may be slow for large (resumed) games
+        if self.state.size is not None:
+            self.__run_task(self.__start_solver, background=self.__is_large())
+        self.hud.pos = (board_bounds.left + 8, board_bounds.top + 8)
 
         timer_bounds = pygame.Rect(board_bounds.left, board_bounds.top - 96, 100, 64)
         self.timer = Timer(timer_bounds, self.state)
@@ -65,9 +144,9 @@ class GameWindow(WindowBase):
             restart_button_bounds, Theme.BG_COLOR, "", Theme.TEXT_COLOR, self.font, GAME_RESTART
         )
 
-        self.reset_icon = pygame.transform.scale(pygame.image.load("assets/reset.png").convert_alpha(), (48, 48))
-        self.lose_icon = pygame.transform.scale(pygame.image.load("assets/lose.png").convert_alpha(), (48, 48))
-        self.win_icon = pygame.transform.scale(pygame.image.load("assets/win.png").convert_alpha(), (48, 48))
+        self.reset_icon = load_image("assets/reset.png", (48, 48))
+        self.lose_icon = load_image("assets/lose.png", (48, 48))
+        self.win_icon = load_image("assets/win.png", (48, 48))
         self.restart_icon = self.reset_icon
         self.restart_icon_pos = (restart_button_bounds.x + 8, restart_button_bounds.y + 8)
 
@@ -87,18 +166,184 @@ class GameWindow(WindowBase):
             button = Button(pygame.Rect(x, y, 64, 64), Theme.BG_COLOR, "", Theme.TEXT_COLOR, self.font, ev)
 
             self.controls.append(button)
-            self.controls_icons.append(
-                pygame.transform.scale(pygame.image.load(f"assets/{d}.png").convert_alpha(), (48, 48))
-            )
+            self.controls_icons.append(load_image(f"assets/{d}.png", (48, 48)))
             self.controls_icons_pos.append((button.bounds.x + 8, button.bounds.y + 8))
 
         home_button_bounds = pygame.Rect((self.width - 64) / 2, board_bounds.bottom + 32, 64, 64)
         self.home_button = Button(
             home_button_bounds, Theme.BG_COLOR, "", Theme.TEXT_COLOR, self.font, GAME_HOME
         )
-        self.home_icon = pygame.transform.scale(pygame.image.load("assets/home.png").convert_alpha(), (48, 48))
+        self.home_icon = load_image("assets/home.png", (48, 48))
         self.home_icon_pos = (home_button_bounds.x + 8, home_button_bounds.y + 8)
 
+    @staticmethod
+    def __load_saved_game():
+        """Load the game saved on disk and remove its save, restarting its timer if it's in progress.
+
+        :return: The saved game, or None if it can't be loaded.
+        """
+        try:
+            state = load_file(DEFAULT_PATH, listener=post_game_event)
+            os.remove(DEFAULT_PATH)
+        except ValueError:
+            # a corrupted save can't be continued, it's removed so that the start window stops offering it
+            try:
+                os.remove(DEFAULT_PATH)
+            except OSError:
+                pass
+            return None
+        except OSError:
+            return None
+
+        if state.init and not state.is_over():
+            post_game_event(GameEvent.GAME_STARTED, state)
+
+        return state
+
+    def __save_game(self):
+        """Save the game to disk if it's in progress, so it can be continued from the start window.
+
+        Games on infinite boards aren't saved.
+        """
+        if self.state.size is None or not self.state.init or self.state.is_over():
+            return
+
+        try:
+            save_file(self.state, DEFAULT_PATH)
+        except OSError:
+            # not being able to save (e.g. a read-only home directory) shouldn't prevent leaving the game
+            pass
+
+    def __save_log(self):
+        """Write the move log of the game to the directory of the logs, if there's one and the game has started."""
+        if self.context.record_dir is None or self.log is None or not self.state.init:
+            return
+
+        self.log.finish(self.state)
+        try:
+            self.log.save(self.context.record_dir)
+        except OSError:
+            # the game goes on without its log (e.g. in a read-only directory)
+            pass
+        self.log = None
+
+    def __is_large(self):
+        """Check whether the board is bounded, and large enough for its solver and probabilities to take more than a
+        frame."""
+        return self.state.size is not None and self.state.height * self.state.width >= GameWindow.BACKGROUND_MIN_CELLS
+
+    def __is_slow(self):
+        """Check whether the next moves may take more than a frame: the flood fills of large (or infinite) boards can
+        reveal many cells, and the first move generates the board, which takes a while without guessing on any size."""
+        return (
+            self.state.size is None
+            or self.__is_large()
+            or (not self.state.init and self.state.mine_placer is place_mines_no_guess)
+        )
+
+    def __run_task(self, function, *args, background: bool):
+        """Run a step of the game which returns the changes to show (see `__show_changes`).
+
+        :param function: The step, called with `args`.
+        :param background: Whether to run it in the background thread, the changes are then shown once it's done.
+        Otherwise, it's run right away.
+        """
+        if background:
+            self.task = get_background_thread().submit(function, *args)
+        else:
+            self.__show_changes(*function(*args))
+
+    def __start_solver(self) -> tuple[list[tuple[int, int]], Optional[Probabilities]]:
+        """Build the solver of the game, in the main or in the background thread.
+
+        :return: No changes, and the mine probabilities to show (see `__compute_probabilities`).
+        """
+        with profiler.section("solver"):
+            self.solver = Solver(self.state)
+
+        return [], self.__compute_probabilities()
+
+    def __apply_moves(
+            self, moves: list[tuple[Move, int, int]]
+    ) -> tuple[list[tuple[int, int]], Optional[Probabilities]]:
+        """Apply a batch of moves to the state and update the solver, in the main or in the background thread.
+
+        :return: The cells changed by the moves, and the new mine probabilities to show (see
+        `__compute_probabilities`).
+        """
+        with profiler.section("moves"):
+            self.state = self.state.apply_moves(moves)
+        if self.solver is not None:
+            with profiler.section("solver"):
+                self.solver.update(self.state.changes)
+
+        return self.state.changes, self.__compute_probabilities()
+
+    def __recompute_probabilities(self) -> tuple[list[tuple[int, int]], Optional[Probabilities]]:
+        """Compute the mine probabilities to show again, in the main or in the background thread.
+
+        :return: No changes, and the mine probabilities to show (see `__compute_probabilities`).
+        """
+        return [], self.__compute_probabilities()
+
+    def __show_changes(self, changes: list[tuple[int, int]], probabilities: Optional[Probabilities]):
+        """Update the board with the cells changed by a step of the game, and the probabilities computed after it.
+
+        The changes of the state are dropped once shown: the solver has used them too, and a large flood fill keeps a
+        pair per revealed cell until the next move otherwise.
+        """
+        if changes:
+            with profiler.section("board_update"):
+                self.board.update(self.state, changes)
+            self.state.changes = []
+        self.board.set_probabilities(probabilities)
+
+    def __finish_task(self):
+        """Wait for the work done in the background (if any), then show its changes and apply the timer ticks
+        received meanwhile."""
+        if self.task is None:
+            return
+
+        task, self.task = self.task, None
+        self.__show_changes(*task.result())
+
+        for _ in range(self.pending_ticks):
+            self.state = self.state.timer_ticked()
+        self.pending_ticks = 0
+
+        self.__update_restart_icon()
+
+    def __can_solve(self):
+        """Check whether the solver can be asked for safe cells: the game is in progress on a bounded board, and the
+        solver isn't being built or updated in the background."""
+        return self.solver is not None and self.task is None and not self.state.is_over()
+
+    def __update_restart_icon(self):
+        """Show whether the game was won or lost on the restart button, once it's over."""
+        if self.state.is_over():
+            self.restart_icon = self.win_icon if self.state.is_win() else self.lose_icon
+
+    def __compute_probabilities(self) -> Optional[Probabilities]:
+        """Compute the mine probabilities to show over the board: None unless they're shown and the game is in
+        progress."""
+        if self.solver is None or not self.show_probabilities or not self.state.init or self.state.is_over():
+            return None
+
+        with profiler.section("probability"):
+            return mine_probabilities(self.state)
+
+    def __update_probabilities(self):
+        """Recompute the mine probabilities shown over the board, in the background thread for large boards.
+
+        If the background thread is busy, they're recomputed once it's done instead.
+        """
+        if self.task is not None:
+            self.outdated_probabilities = True
+            return
+
+        self.outdated_probabilities = False
+        self.__run_task(self.__recompute_probabilities, background=self.show_probabilities and self.__is_large())
+
     def handle_event(self, event: pygame.event.Event):
         """Event handler."""
         self.board.handle_event(event)
@@ -110,43 +355,113 @@ class GameWindow(WindowBase):
         for button in self.controls:
             button.handle_event(event)
 
-        if event.type == BOARD_REVEAL:
-            l, c = event.dict.values()
-            self.state = self.state.reveal_zone(l, c)
-            self.board.update(self.state)
-        elif event.type == BOARD_FLAG:
-            l, c = event.dict.values()
-            self.state = self.state.flag_zone(l, c)
-            self.board.update(self.state)
+        if event.type in GameWindow.BOARD_MOVES:
+            self.moves.append((GameWindow.BOARD_MOVES[event.type], event.l, event.c))
         elif event.type == TIMER_TICK:
-            self.state = self.state.timer_ticked()
-        elif event.type == GAME_OVER:
-            if self.state.is_win():
-                self.restart_icon = self.win_icon
+            if self.log is not None:
+                self.log.record_tick()
+            if self.task is not None:
+                self.pending_ticks += 1
             else:
-                self.restart_icon = self.lose_icon
+                self.state = self.state.timer_ticked()
+        elif event.type == GAME_OVER and self.task is None:
+            # otherwise, the icon is updated once the moves applied in the background are done
+            self.__update_restart_icon()
         elif event.type == GAME_RESTART:
             # restart game
+            self.__finish_task()
+            self.__save_log()
             self.context.set_window(self.context.game_window)
         elif event.type == GAME_HOME:
-            # go to the home window
+            # save the game in progress and go to the home window
+            self.__finish_task()
+            self.__save_game()
+            self.__save_log()
             self.context.set_window(self.context.start_window)
+        elif event.type == pygame.QUIT:
+            self.__finish_task()
+            self.__save_game()
+            self.__save_log()
+        elif event.type == pygame.KEYUP and event.key == pygame.K_F3:
+            self.hud.toggle()
+        elif event.type == pygame.KEYUP and event.key == pygame.K_h and self.__can_solve():
+            # reveal a provably safe cell, if there's one
+            hint = self.solver.hint()
+            if hint is not None:
+                self.moves.append((Move.REVEAL, *hint))
+        elif event.type == pygame.KEYUP and event.key == pygame.K_a and self.__can_solve():
+            # auto-play: reveal all the provably safe cells (but the flagged ones)
+            self.moves.extend((Move.REVEAL, *divmod(cell, self.state.width)) for cell in self.solver.revealable())
+        elif event.type == pygame.KEYUP and event.key == pygame.K_p:
+            self.show_probabilities = not self.show_probabilities
+            self.__update_probabilities()
+
+    def update(self):
+        """Apply the moves made during the frame, as a single batch, and update the board with all their changes.
+
+        The moves which may be slow are applied in the background thread, so that the window keeps handling events
+        and drawing frames meanwhile: the board shows all their changes at once when they're done, and the moves made
+        until then are queued for the next batch.
+        """
+        if self.task is not None:
+            if not self.task.done():
+                return
+            self.__finish_task()
+
+        if not self.moves:
+            if self.outdated_probabilities:
+                self.__update_probabilities()
+            return
+
+        moves, self.moves = self.moves, []
+        if self.log is not None:
+            self.log.record_moves(moves)
+
+        # the probabilities are computed after the moves
+        self.outdated_probabilities = False
+        self.__run_task(self.__apply_moves, moves, background=self.__is_slow())
 
     def draw(self, screen: pygame.Surface):
         """Draw game on the screen."""
-        self.board.draw(screen)
-        self.timer.draw(screen)
-        self.bomb_cnt.draw(screen)
+        self.blit_chrome(screen)
+
+        self.board.draw_dynamic(screen)
+        self.timer.draw_dynamic(screen)
+        self.bomb_cnt.draw_dynamic(screen)
 
-        self.restart_button.draw(screen)
         screen.blit(self.restart_icon, self.restart_icon_pos)
 
-        self.home_button.draw(screen)
-        screen.blit(self.home_icon, self.home_icon_pos)
+        if self.task is not None:
+            self.__draw_progress(screen)
+
+        self.hud.draw(screen)
+
+    def __draw_progress(self, screen: pygame.Surface):
+        """Draw a spinning arc over the center of the board, while the background thread is busy."""
+        center = self.board.bounds.center
+        radius = GameWindow.PROGRESS_RADIUS
+        bounds = pygame.Rect(0, 0, 2 * radius, 2 * radius)
+        bounds.center = center
+        # a full turn per second
+        start = pygame.time.get_ticks() / 1000 * 2 * math.pi
+
+        pygame.draw.circle(screen, Theme.BG_COLOR, center, radius + 8)
+        pygame.draw.arc(screen, Theme.TEXT_COLOR, bounds, start, start + 1.5 * math.pi, width=6)
+
+    def draw_chrome(self, surface: pygame.Surface):
+        """Draw the parts of the game window which don't change between frames."""
+        self.board.draw_static(surface)
+        self.timer.draw_static(surface)
+        self.bomb_cnt.draw_static(surface)
+
+        self.restart_button.draw(surface)
+
+        self.home_button.draw(surface)
+        surface.blit(self.home_icon, self.home_icon_pos)
 
         for c, i, p in zip(self.controls, self.controls_icons, self.controls_icons_pos):
-            c.draw(screen)
-            draw_border(screen, c.bounds, pygame.Color(Theme.BG_COLOR), width=8, depth="up", inner=False)
-            screen.blit(i, p)
+            c.draw(surface)
+            draw_border(surface, c.bounds, pygame.Color(Theme.BG_COLOR), width=8, depth="up", inner=False)
+            surface.blit(i, p)
 
-        draw_border(screen, screen.get_rect(), pygame.Color(Theme.BG_COLOR), width=8, depth="up", inner=True)
+        draw_border(surface, surface.get_rect(), pygame.Color(Theme.BG_COLOR), width=8, depth="up", inner=True)
@@ -1,8 +1,11 @@
+import os
+
 import pygame
 
-from constants import GAME_START
+from constants import GAME_CONTINUE, GAME_START, GAME_TOGGLE_MODE
 from gui import Button, Input
 from gui.windows.window_base import WindowBase
+from savefile import DEFAULT_PATH
 from theme import Theme
 from utils import draw_border
 
@@ -21,7 +24,7 @@ class StartWindow(WindowBase):
         padding = 16
 
         x = (width - comp_width) / 2
-        y = (height - 3 * input_height - border_width * 6 - button_height - border_width * 2 - 3 * padding) / 2
+        y = (height - 5 * input_height - border_width * 10 - button_height - border_width * 2 - 5 * padding) / 2
 
         self.lines_input = Input(pygame.Rect(x, y, 80, input_height), self.font, max_length=3, placeholder="X")
         self.cols_input = Input(
@@ -39,6 +42,11 @@ class StartWindow(WindowBase):
 
         self.inputs = [self.lines_input, self.cols_input, self.time_input, self.bombs_input]
 
+        self.mode_bounds = pygame.Rect(x, y, comp_width, input_height)
+        self.mode_button = None
+        self.__update_mode_button()
+        y += input_height + 2 * border_width + padding
+
         self.button = Button(
             pygame.Rect(x, y, comp_width, button_height),
             Theme.BG_COLOR,
@@ -47,15 +55,51 @@ class StartWindow(WindowBase):
             self.font,
             GAME_START,
         )
+        y += button_height + 2 * border_width + padding
+
+        # only shown when there's a saved game
+        self.continue_button = Button(
+            pygame.Rect(x, y, comp_width, input_height),
+            Theme.BG_COLOR,
+            "Continue",
+            Theme.TEXT_COLOR,
+            self.font,
+            GAME_CONTINUE,
+        )
+        self.has_save = False
+
+    def __update_mode_button(self):
+        """Rebuild the button switching between the classic, no-guess and infinite modes, to show the current one."""
+        if self.context.no_guess:
+            mode = "No guess"
+        elif self.context.infinite:
+            mode = "Infinite"
+        else:
+            mode = "Classic"
+
+        self.mode_button = Button(
+            self.mode_bounds,
+            Theme.BG_COLOR,
+            mode,
+            Theme.TEXT_COLOR,
+            self.font,
+            GAME_TOGGLE_MODE,
+        )
+        self.invalidate_chrome()
 
     def enter(self):
-        pass
+        """Show the button continuing the saved game, if there's one."""
+        self.has_save = os.path.exists(DEFAULT_PATH)
+        self.invalidate_chrome()
 
     def handle_event(self, event: pygame.event.Event):
         """Event handler."""
         for text_input in self.inputs:
             text_input.handle_event(event)
         self.button.handle_event(event)
+        self.mode_button.handle_event(event)
+        if self.has_save:
+            self.continue_button.handle_event(event)
 
         if event.type == GAME_START:
             # update params using data from the inputs
@@ -67,6 +111,17 @@ class StartWindow(WindowBase):
             )
             # start game
             self.context.set_window(self.context.game_window)
+        elif event.type == GAME_CONTINUE:
+            # resume the saved game
+            self.context.resume = True
+            self.context.set_window(self.context.game_window)
+        elif event.type == GAME_TOGGLE_MODE:
+            # classic, then no guess, then infinite
+            self.context.no_guess, self.context.infinite = (
+                not self.context.no_guess and not self.context.infinite,
+                self.context.no_guess,
+            )
+            self.__update_mode_button()
         elif event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
             for i, text_input in enumerate(self.inputs):
                 if text_input.active:
@@ -76,9 +131,19 @@ class StartWindow(WindowBase):
 
     def draw(self, screen: pygame.Surface):
         """Draw window on the screen."""
+        self.blit_chrome(screen)
+
+        for text_input in self.inputs:
+            text_input.draw_dynamic(screen)
+
+    def draw_chrome(self, surface: pygame.Surface):
+        """Draw the parts of the window which don't change between frames."""
         for text_input in self.inputs:
-            text_input.draw(screen)
+            text_input.draw_static(surface)
 
-        self.button.draw(screen)
+        self.mode_button.draw(surface)
+        self.button.draw(surface)
+        if self.has_save:
+            self.continue_button.draw(surface)
 
-        draw_border(screen, screen.get_rect(), pygame.Color(Theme.BG_COLOR), width=8, depth="up", inner=True)
+        draw_border(surface, surface.get_rect(), pygame.Color(Theme.BG_COLOR), width=8, depth="up", inner=True)
@@ -17,6 +17,14 @@ class Window:
 
         # default params for game
         self.x, self.y, self.time, self.bombs = 16, 16, 0, 32
+        # whether the boards are generated so that they can be solved without guessing
+        self.no_guess = False
+        # whether the games are played on an infinite board, whose bombs have the density given by the parameters
+        self.infinite = False
+        # whether the next game is the one saved on disk instead of a new one
+        self.resume = False
+        # the directory the move logs of the games are written to, None to not write them
+        self.record_dir = None
 
         # pre-initialize the window states
         self.start_window = StartWindow(width, height, font, self)
@@ -55,6 +63,10 @@ class Window:
         """Event handler."""
         self.current_window.handle_event(event)
 
+    def update(self):
+        """Update the window, once per frame."""
+        self.current_window.update()
+
     def draw(self, screen: pygame.Surface):
         """Draw the window."""
         self.current_window.draw(screen)
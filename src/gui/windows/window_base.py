@@ -1,11 +1,18 @@
 import pygame
 
+from theme import Theme
+
 
 class WindowBase:
-    """Window base class."""
+    """Window base class.
+
+    The parts of a window which never change between frames (background, borders, buttons) form its chrome. The
+    chrome is rendered once per layout on a cached surface, so drawing a frame is blitting the chrome and drawing the
+    dynamic parts over it.
+    """
 
     def __init__(self):
-        pass
+        self._chrome = None
 
     def enter(self):
         """Method called by the Window Manager upon choosing a window as the current window."""
@@ -15,6 +22,29 @@ class WindowBase:
         """Abstract event handler."""
         raise NotImplementedError()
 
+    def update(self):
+        """Update the window once per frame, after the events of the frame were handled (nothing by default)."""
+
     def draw(self, screen: pygame.Surface):
         """Abstract draw handler."""
         raise NotImplementedError()
+
+    def draw_chrome(self, surface: pygame.Surface):
+        """Abstract draw handler for the static parts of the window.
+
+        It is called only when the chrome is (re)built, on a surface already filled with the background color.
+        """
+        raise NotImplementedError()
+
+    def invalidate_chrome(self):
+        """Mark the chrome as outdated, it will be rebuilt on the next frame (e.g. after the layout changed)."""
+        self._chrome = None
+
+    def blit_chrome(self, screen: pygame.Surface):
+        """Draw the cached chrome on the screen, rebuilding it if needed."""
+        if self._chrome is None or self._chrome.get_size() != screen.get_size():
+            self._chrome = pygame.Surface(screen.get_size()).convert()
+            self._chrome.fill(Theme.BG_COLOR)
+            self.draw_chrome(self._chrome)
+
+        screen.blit(self._chrome, (0, 0))
@@ -0,0 +1,123 @@
+"""Undo/redo history of a game.
+
+Every player move is recorded as a compact diff (the changed cells with their old and new values, and the counters of
+the state before and after the move), so a move can be undone or redone without keeping copies of the board.
+
+Classes:
+    - Diff: The changes made to a game state by a move.
+    - History: Bounded undo/redo stack of diffs.
+"""
+
+import sys
+from array import array
+from collections import deque
+from typing import Iterable, Optional
+
+
+class Diff:
+    """The changes made to a game state by a move.
+
+    Instance variables:
+        - cells: The row-major indices of the changed cells.
+        - old: The values of the cells before the move.
+        - new: The values of the cells after the move.
+        - before: The counters of the state before the move, as `(flags, unrevealed_zones, game_over, move_count)`.
+        - after: The counters of the state after the move, as `(flags, unrevealed_zones, game_over, move_count)`.
+
+    Methods:
+        - __init__: Construct a diff.
+        - nbytes: The memory used by the diff.
+    """
+
+    def __init__(self, cells: Iterable[int], old: Iterable[int], new: Iterable[int], before: tuple, after: tuple):
+        """Initialize a diff.
+
+        :param cells: The row-major indices of the changed cells.
+        :param old: The values of the cells before the move.
+        :param new: The values of the cells after the move.
+        :param before: The counters of the state before the move.
+        :param after: The counters of the state after the move.
+        """
+        self.cells = array("l", cells)
+        self.old = array("b", old)
+        self.new = array("b", new)
+        self.before = before
+        self.after = after
+
+    def nbytes(self):
+        """Get the (approximate) memory used by the diff, in bytes."""
+        return sum(sys.getsizeof(a) for a in (self, self.cells, self.old, self.new, self.before, self.after))
+
+
+class History:
+    """Bounded undo/redo stack of diffs.
+
+    When the diffs take more memory than allowed, the oldest ones are forgotten.
+
+    Instance variables:
+        - max_bytes: The maximum memory the diffs may use, in bytes.
+        - nbytes: The memory currently used by the diffs, in bytes.
+
+    Methods:
+        - __init__: Construct an empty history.
+        - push: Record a new move.
+        - undo: Get the diff of the move to undo.
+        - redo: Get the diff of the move to redo.
+        - can_undo: Whether there is a move to undo.
+        - can_redo: Whether there is a move to redo.
+    """
+
+    # default memory cap for the history of a game
+    MAX_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        """Initialize an empty history.
+
+        :param max_bytes: The maximum memory the diffs may use, in bytes (default 16 MiB). If it is 0, nothing is
+        recorded.
+        """
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self.__undo = deque()
+        self.__redo = []
+
+    def push(self, diff: Diff):
+        """Record a new move.
+
+        This forgets the moves which could be redone, as well as the oldest moves if the memory cap is exceeded.
+        """
+        for redo_diff in self.__redo:
+            self.nbytes -= redo_diff.nbytes()
+        self.__redo.clear()
+
+        self.__undo.append(diff)
+        self.nbytes += diff.nbytes()
+
+        while self.nbytes > self.max_bytes and self.__undo:
+            self.nbytes -= self.__undo.popleft().nbytes()
+
+    def undo(self) -> Optional[Diff]:
+        """Move the last move to the redo stack and return it (None if there's nothing to undo)."""
+        if not self.__undo:
+            return None
+
+        diff = self.__undo.pop()
+        self.__redo.append(diff)
+        return diff
+
+    def redo(self) -> Optional[Diff]:
+        """Move the last undone move back to the undo stack and return it (None if there's nothing to redo)."""
+        if not self.__redo:
+            return None
+
+        diff = self.__redo.pop()
+        self.__undo.append(diff)
+        return diff
+
+    def can_undo(self):
+        """Check if there is a move to undo."""
+        return len(self.__undo) > 0
+
+    def can_redo(self):
+        """Check if there is a move to redo."""
+        return len(self.__redo) > 0
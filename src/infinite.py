@@ -0,0 +1,414 @@
+"""Describes the state of a game on an infinite board.
+
+The board is split in square chunks of `CHUNK_SIZE x CHUNK_SIZE` cells. The bombs of a chunk are generated when the
+chunk (or one of its neighbors) is first looked at, from a deterministic hash of the seed of the game and of the
+coordinates of the chunk: the same seed always gives the same board, whatever the order the chunks are explored in.
+Only the chunks which were explored are stored, so the cost of a game depends on the area the player visited, not on
+the size of the board.
+
+Classes:
+    - InfiniteGameState: Describes the state of a game on an infinite board.
+
+Functions:
+    - chunk_mines: Generate the bombs of a chunk.
+"""
+
+import hashlib
+import random
+import struct
+from array import array
+from typing import Callable, Iterable, Optional
+
+from grid import ChunkedGrid
+from state import BoardCell, GameEvent, Move
+
+# the size of the side of a chunk, in cells
+CHUNK_SIZE = 32
+# the number of flags of the player, the most the bomb counter can show
+MAX_FLAGS = 999
+# the maximum number of cells revealed by a single move (on sparse boards, the region of a zero can be endless)
+MAX_FLOOD_CELLS = 1 << 14
+
+# offsets for neighbors
+NEIGHBORS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def chunk_mines(seed, chunk_lin, chunk_col, count) -> list[int]:
+    """Generate the bombs of a chunk, from a hash of the seed and of the coordinates of the chunk.
+
+    :param seed: The seed of the game.
+    :param chunk_lin: The line of the chunk.
+    :param chunk_col: The column of the chunk.
+    :param count: The number of bombs of the chunk.
+    :return: The row-major indices of the bombs in the chunk.
+    """
+    key = hashlib.blake2b(struct.pack("<Qqq", seed, chunk_lin, chunk_col), digest_size=8).digest()
+    return random.Random(int.from_bytes(key, "little")).sample(range(CHUNK_SIZE * CHUNK_SIZE), count)
+
+
+class InfiniteGameState:
+    """Describes the state of a game on an infinite board.
+
+    It has the interface of `GameState` which the game window uses, without the undo history: the cells are
+    addressed by any `(lin, col)`, negative ones included, and the game is only over once a bomb is revealed or the
+    time runs out.
+
+    Instance variables:
+        - size, height, width: None, the board has no bounds.
+        - mines_per_chunk: The number of bombs of a chunk (a few less around the first click, which has none).
+        - flags: How many flags the player has left to use.
+        - time_left: How much time the player has left.
+        - zones: Chunked grid with all bombs and values, of the chunks which were looked at.
+        - board: Chunked grid the player sees, with the same values as `GameState.board`.
+        - game_over: Whether the game is over.
+        - init: Whether the player has started the game.
+        - start: The `(lin, col)` coordinates of the first click, once the game has started.
+        - revealed_zones: The number of zones revealed by the player.
+        - changes: The cells of `board` changed by the last move, as `(lin, col)` pairs.
+        - listener: Optional callback `listener(event, state)` notified of every `GameEvent`.
+        - seed: The seed the bombs are generated from.
+        - move_count: The number of player moves which changed the board.
+
+    Methods:
+        - __init__: Constructor for an uninitialized game state.
+        - reveal_zone: Reveal the value of a cell. This is a player move.
+        - flag_zone: Flag a cell. This is a player move.
+        - chord_zone: Reveal the neighbors of a number whose bombs are all flagged. This is a player move.
+        - apply_moves: Apply a batch of player moves.
+        - timer_ticked: Update state upon timer tick.
+        - is_over: Whether the game is over.
+        - is_win: Whether the game is won, which never happens.
+    """
+
+    size = height = width = None
+
+    __slots__ = (
+        "mines_per_chunk",
+        "flags",
+        "time_left",
+        "zones",
+        "board",
+        "game_over",
+        "init",
+        "start",
+        "revealed_zones",
+        "changes",
+        "listener",
+        "seed",
+        "move_count",
+        "__mines",
+        "__frontier",
+    )
+
+    def __init__(
+            self,
+            *,
+            density=0.125,
+            time=0,
+            listener: Optional[Callable[[GameEvent, "InfiniteGameState"], None]] = None,
+            seed: Optional[int] = None,
+    ):
+        """Initialize game state.
+
+        :param density: The proportion of cells which are bombs (default 0.125). Must be in `[0, 1)`.
+        :param time: The time the player has (if it is 0, then the timer is disabled).
+        :param listener: Callback notified of the events happening in the game (default None).
+        :param seed: The seed the bombs are generated from (default is a random 64-bit one).
+
+        :raises ValueError: `density` is not in `[0, 1)`.
+        """
+        if not 0 <= density < 1:
+            raise ValueError('Invalid `density` argument.')
+
+        self.mines_per_chunk = round(density * CHUNK_SIZE * CHUNK_SIZE)
+        self.flags = MAX_FLAGS
+        self.time_left = time
+
+        self.zones = ChunkedGrid(CHUNK_SIZE)
+        self.board = ChunkedGrid(CHUNK_SIZE, BoardCell.UNSELECTED.value)
+
+        self.game_over = False
+        self.init = False
+        self.start = None
+        self.revealed_zones = 0
+        self.changes = []
+
+        self.listener = listener
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.move_count = 0
+
+        # the bombs of the chunks generated so far, indexed by `(chunk_lin, chunk_col)`
+        self.__mines: dict[tuple[int, int], list[int]] = {}
+        # the zeros whose neighbors were left unexplored, when a flood fill reached `MAX_FLOOD_CELLS`
+        self.__frontier: list[tuple[int, int]] = []
+
+    def __notify(self, event: GameEvent):
+        """Notify the listener (if any) of an event."""
+        if self.listener is not None:
+            self.listener(event, self)
+
+    def __chunk_mines(self, key: tuple[int, int]) -> list[int]:
+        """Get the bombs of a chunk, generating them if needed.
+
+        The bombs on or around the first click are left out.
+        """
+        mines = self.__mines.get(key)
+
+        if mines is None:
+            mines = chunk_mines(self.seed, *key, self.mines_per_chunk)
+            start_lin, start_col = self.start
+            chunk_lin, chunk_col = key
+
+            mines = [
+                mine
+                for mine in mines
+                if abs(chunk_lin * CHUNK_SIZE + mine // CHUNK_SIZE - start_lin) > 1
+                or abs(chunk_col * CHUNK_SIZE + mine % CHUNK_SIZE - start_col) > 1
+            ]
+            self.__mines[key] = mines
+
+        return mines
+
+    def __zone_chunk(self, key: tuple[int, int]) -> array:
+        """Get the zones of a chunk, computing them from the bombs of the chunk and of its neighbors if needed."""
+        zones = self.zones.chunks.get(key)
+
+        if zones is not None:
+            return zones
+
+        zones = array("b", bytes(CHUNK_SIZE * CHUNK_SIZE))
+        chunk_lin, chunk_col = key
+
+        for near_lin in (-1, 0, 1):
+            for near_col in (-1, 0, 1):
+                for mine in self.__chunk_mines((chunk_lin + near_lin, chunk_col + near_col)):
+                    # the coordinates of the bomb relative to the chunk
+                    lin = near_lin * CHUNK_SIZE + mine // CHUNK_SIZE
+                    col = near_col * CHUNK_SIZE + mine % CHUNK_SIZE
+
+                    for dl, dc in NEIGHBORS:
+                        if 0 <= lin + dl < CHUNK_SIZE and 0 <= col + dc < CHUNK_SIZE:
+                            zones[(lin + dl) * CHUNK_SIZE + col + dc] += 1
+
+        for mine in self.__chunk_mines(key):
+            zones[mine] = BoardCell.BOMB.value
+
+        self.zones.chunks[key] = zones
+        return zones
+
+    def __zone(self, lin, col):
+        """Get the value of the zone `(lin, col)`."""
+        key, cell = self.zones.chunk_of(lin, col)
+        return self.__zone_chunk(key)[cell]
+
+    def __start_game(self, lin, col):
+        """Start the game on the first click, which has no bomb on it or around it."""
+        self.start = (lin, col)
+        self.init = True
+
+        self.__notify(GameEvent.GAME_STARTED)
+
+    def __end_game(self):
+        """Stop the current game, and notify the listener."""
+        self.game_over = True
+        self.__notify(GameEvent.GAME_OVER)
+
+    def __reveal_zone(self, lin, col) -> list[tuple[int, int]]:
+        """Reveal the current zone and, if it is a zero, flood fill its region until non-zero values are met.
+
+        At most `MAX_FLOOD_CELLS` are revealed: the zeros whose neighbors are left unexplored are kept, and revealing
+        any zero again goes on with the flood fill from them.
+
+        :return: The cells whose value changed, as `(lin, col)` pairs.
+        """
+        board = self.board
+        unselected = BoardCell.UNSELECTED.value
+        value = board[lin, col]
+
+        if value == unselected:
+            value = self.__zone(lin, col)
+
+            # if the cell is a bomb, game over
+            if value == BoardCell.BOMB.value:
+                self.__end_game()
+                changes = self.__reveal_bombs()
+                # assign a special type to this bomb so that the player knows which bomb caused the loss
+                board[lin, col] = BoardCell.BOMB_REVEALED.value
+                return changes
+
+            board[lin, col] = value
+            changes = [(lin, col)]
+
+            # a number doesn't flood, the frontier of the last flood fill is kept for the next zero
+            if value != 0:
+                self.revealed_zones += 1
+                return changes
+        elif value == 0:
+            # a zero revealed before, go on with the flood fill which was stopped (if any)
+            changes = []
+        else:
+            return []
+
+        # zeros left to explore, their neighbors are never bombs
+        stack = [(lin, col), *self.__frontier]
+
+        while stack and len(changes) < MAX_FLOOD_CELLS:
+            lin, col = stack.pop()
+
+            for dl, dc in NEIGHBORS:
+                neighbor = (lin + dl, col + dc)
+
+                # skip cells already revealed or flagged
+                if board[neighbor] != unselected:
+                    continue
+
+                value = self.__zone(*neighbor)
+                board[neighbor] = value
+                changes.append(neighbor)
+
+                # if the cell is zero, continue exploring
+                if value == 0:
+                    stack.append(neighbor)
+
+        self.__frontier = stack
+        self.revealed_zones += len(changes)
+        return changes
+
+    def __reveal_bombs(self) -> list[tuple[int, int]]:
+        """Reveal the bombs of the chunks looked at so far to the player.
+
+        :return: The cells of the bombs, as `(lin, col)` pairs.
+        """
+        changes = []
+
+        for chunk_lin, chunk_col in self.zones.chunks:
+            for mine in self.__mines[chunk_lin, chunk_col]:
+                cell = (chunk_lin * CHUNK_SIZE + mine // CHUNK_SIZE, chunk_col * CHUNK_SIZE + mine % CHUNK_SIZE)
+                self.board[cell] = BoardCell.BOMB.value
+                changes.append(cell)
+
+        return changes
+
+    def __flag_zone(self, lin, col) -> list[tuple[int, int]]:
+        """Flag/un-flag the zone, if it's unrevealed (and if there are flags left, to flag it).
+
+        :return: The cells whose value changed, as `(lin, col)` pairs.
+        """
+        value = self.board[lin, col]
+
+        if value == BoardCell.UNSELECTED.value and self.flags > 0:
+            self.board[lin, col] = BoardCell.FLAGGED.value
+            self.flags -= 1
+            self.__notify(GameEvent.FLAG_PLACED)
+            return [(lin, col)]
+
+        if value == BoardCell.FLAGGED.value:
+            self.board[lin, col] = BoardCell.UNSELECTED.value
+            self.flags += 1
+            self.__notify(GameEvent.FLAG_REMOVED)
+            return [(lin, col)]
+
+        return []
+
+    def __chord(self, lin, col) -> list[tuple[int, int]]:
+        """Reveal the unflagged neighbors of a revealed number, if it has as many flags around it as its value.
+
+        :return: The cells whose value changed, as `(lin, col)` pairs.
+        """
+        value = self.board[lin, col]
+
+        if not 1 <= value <= 8:
+            return []
+
+        neighbors = [(lin + dl, col + dc) for dl, dc in NEIGHBORS]
+
+        if sum(self.board[cell] == BoardCell.FLAGGED.value for cell in neighbors) != value:
+            return []
+
+        changes = []
+
+        for cell in neighbors:
+            changes += self.__reveal_zone(*cell)
+
+            if self.game_over:
+                break
+
+        return changes
+
+    def apply_moves(self, moves: Iterable[tuple[Move, int, int]]) -> "InfiniteGameState":
+        """Apply a batch of player moves.
+
+        The moves are made in order, the ones made after the game is over are ignored. Revealing a zone starts the
+        game if needed, the other moves are ignored until then.
+
+        :param moves: The moves, as `(move, lin, col)` triples.
+        :return: The state of the game upon executing the moves (this state, updated in place).
+        """
+        changes = []
+
+        for move, lin, col in moves:
+            if self.game_over:
+                break
+
+            if move == Move.REVEAL and not self.init:
+                self.__start_game(lin, col)
+
+            if not self.init:
+                continue
+
+            if move == Move.REVEAL:
+                move_changes = self.__reveal_zone(lin, col)
+            elif move == Move.FLAG:
+                move_changes = self.__flag_zone(lin, col)
+            else:
+                move_changes = self.__chord(lin, col)
+
+            if move_changes:
+                self.move_count += 1
+                changes += move_changes
+
+        # a cell changed by several moves is only listed once
+        self.changes = list(dict.fromkeys(changes))
+
+        return self
+
+    def reveal_zone(self, lin, col) -> "InfiniteGameState":
+        """Reveal the value of the selected zone, see `GameState.reveal_zone`."""
+        return self.apply_moves([(Move.REVEAL, lin, col)])
+
+    def flag_zone(self, lin, col) -> "InfiniteGameState":
+        """Flag/un-flag the zone, see `GameState.flag_zone`."""
+        return self.apply_moves([(Move.FLAG, lin, col)])
+
+    def chord_zone(self, lin, col) -> "InfiniteGameState":
+        """Reveal the unflagged neighbors of a revealed number, see `GameState.chord_zone`."""
+        return self.apply_moves([(Move.CHORD, lin, col)])
+
+    def timer_ticked(self) -> "InfiniteGameState":
+        """Update the state on timer tick.
+
+        If the game has not started yet, or isn't timed, the tick is ignored.
+
+        :return: Returns the state of the game upon executing the move (this state, updated in place).
+        """
+        self.changes = []
+
+        # if the game hasn't been initialized, or has no timer, ignore the tick
+        if not self.init or self.time_left <= 0:
+            return self
+
+        self.time_left -= 1
+
+        # if the timer ran out, end the game
+        if self.time_left == 0:
+            self.__end_game()
+
+        return self
+
+    def is_over(self):
+        """Check if the game has ended."""
+        return self.game_over
+
+    def is_win(self):
+        """Check if the game was won: an infinite board can't be cleared, so it never is."""
+        return False
@@ -1,41 +1,74 @@
 """Start the Minesweeper game.
 
 No arguments are needed. The game will open in a new window and will be playable out of the box.
+
+Setting the `MINESWEEPER_TRACE` environment variable to a path writes the timings of the hot paths (frames, event
+handling, moves, board updates, drawing) to that file, as JSONL. Press F3 in game to show them live.
+
+Setting the `MINESWEEPER_RECORD` environment variable to a directory writes the move log of every game to it, when the
+game is left. The logs are replayed with `src/replay.py`.
+
+The game only starts when this file is run, not when it's imported: the process pools used by the engine may import
+it in their worker processes.
 """
 
+import os
+import time
+
 import pygame
 
 from constants import FPS
 from gui import Window
-from theme import Theme
+from profiling import profiler
+from resources import load_font, preload
+
+
+def main():
+    """Run the game until its window is closed."""
+    pygame.init()
+    pygame.display.set_caption("Minesweeper")
+
+    size = width, height = 800, 800
+    screen = pygame.display.set_mode(size)
+
+    # load all the images and fonts once, upfront
+    preload()
+    font = load_font("assets/mine-sweeper.ttf", 16)
 
-pygame.init()
-pygame.display.set_caption("Minesweeper")
+    clock = pygame.time.Clock()
+    running = True
+    dt = 0
 
-size = width, height = 800, 800
-screen = pygame.display.set_mode(size)
+    window = Window(width, height, font)
+    window.record_dir = os.environ.get("MINESWEEPER_RECORD")
 
-font = pygame.font.Font("assets/mine-sweeper.ttf", 16)
+    if os.environ.get("MINESWEEPER_TRACE"):
+        profiler.start_trace(os.environ["MINESWEEPER_TRACE"])
 
-clock = pygame.time.Clock()
-running = True
-dt = 0
+    while running:
+        events_start = time.perf_counter()
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
 
-window = Window(width, height, font)
+            window.handle_event(event)
+        profiler.record("events", time.perf_counter() - events_start, events_start)
 
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+        # apply the moves of the frame
+        window.update()
 
-        window.handle_event(event)
+        # the windows paint the whole screen, starting with their cached background
+        with profiler.section("draw"):
+            window.draw(screen)
 
-    screen.fill(Theme.BG_COLOR)
+        pygame.display.flip()
 
-    window.draw(screen)
+        dt = clock.tick(FPS) / 1000
+        profiler.record("frame", dt)
 
-    pygame.display.flip()
+    profiler.stop_trace()
+    pygame.quit()
 
-    dt = clock.tick(FPS) / 1000
 
-pygame.quit()
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Computes the number of mines around every cell of a board.
+
+NumPy is an optional dependency: when it is installed, the mines are stored in a boolean array and all the counts are
+obtained at once by summing the 8 shifted copies of the (zero-padded) array. Otherwise, a pure Python implementation
+is used, which only visits the neighbors of the mines instead of the neighbors of every cell.
+
+Functions:
+    - count_neighbors: Build the grid of the board with the mines and the number of mines around each cell.
+"""
+
+from array import array
+from typing import Iterable, Optional
+
+from grid import Grid
+from optional import HAS_NUMPY, np
+
+# offsets for neighbors
+NEIGHBORS = [(-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)]
+
+
+def _count_numpy(height, width, mines: list[int], bomb) -> Grid:
+    """Count the mines around every cell using shifted-array sums."""
+    padded = np.zeros((height + 2, width + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1].flat[mines] = 1
+
+    counts = np.zeros((height, width), dtype=np.uint8)
+    for dl, dc in NEIGHBORS:
+        counts += padded[1 + dl:height + 1 + dl, 1 + dc:width + 1 + dc]
+
+    zones = counts.astype(np.int8)
+    zones.flat[mines] = bomb
+
+    return Grid(height, width, data=array("b", zones.tobytes()))
+
+
+def _count_python(height, width, mines: list[int], bomb) -> Grid:
+    """Count the mines around every cell by incrementing the neighbors of each mine."""
+    zones = array("b", bytes(height * width))
+
+    for mine in mines:
+        lin, col = divmod(mine, width)
+        for dl, dc in NEIGHBORS:
+            if 0 <= lin + dl < height and 0 <= col + dc < width:
+                zones[mine + dl * width + dc] += 1
+
+    for mine in mines:
+        zones[mine] = bomb
+
+    return Grid(height, width, data=zones)
+
+
+def count_neighbors(height, width, mines: Iterable[int], bomb, use_numpy: Optional[bool] = None) -> Grid:
+    """Build the grid of the board with the mines and the number of mines around each cell.
+
+    :param height: The height of the board.
+    :param width: The width of the board.
+    :param mines: The row-major indices of the mines.
+    :param bomb: The value to store in the cells holding a mine.
+    :param use_numpy: Whether to use the NumPy backend (default is to use it whenever NumPy is installed).
+    :return: The grid.
+
+    :raises ImportError: `use_numpy` is `True`, but NumPy is not installed.
+    """
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+
+    if use_numpy and not HAS_NUMPY:
+        raise ImportError("NumPy is not installed.")
+
+    mines = list(mines)
+
+    if use_numpy:
+        return _count_numpy(height, width, mines, bomb)
+
+    return _count_python(height, width, mines, bomb)
@@ -0,0 +1,126 @@
+"""Generation of boards which can be solved without guessing.
+
+Candidate layouts are generated for the first click and played by the deterministic solver, from that click only: a
+layout is kept if the solver wins it, i.e. if every cell can be revealed without ever taking a risk.
+
+The candidates are checked in batches in the shared process pool. Each batch gets its own seeds, drawn in order from
+the random number generator of the game, and the batches are looked at in that same order: the layout picked only
+depends on the generator, not on which worker finishes first. As soon as a batch finds a layout, the batches which
+haven't started yet are cancelled.
+
+Functions:
+    - is_solvable: Check whether a layout can be solved without guessing.
+    - place_mines_no_guess: Place the mines so that the board can be solved without guessing.
+"""
+
+import random
+from collections import deque
+from typing import Optional
+
+from placement import place_mines
+from solver import Solver
+from state import GameState
+from workers import get_executor, worker_count
+
+# how many candidates are checked before falling back to a random layout
+MAX_ATTEMPTS = 2000
+# how many candidates are checked by a task of the process pool
+BATCH_SIZE = 4
+
+
+def is_solvable(height, width, mines: list[int], start: tuple[int, int]) -> bool:
+    """Check whether a layout can be solved without guessing, when the first click is on `start`.
+
+    :param height: The height of the board.
+    :param width: The width of the board.
+    :param mines: The row-major indices of the mines.
+    :param start: The `(lin, col)` coordinates of the first click.
+    :return: Whether the deterministic solver wins the game.
+    """
+    state = GameState(
+        size=(height, width), max_bombs=len(mines), history_limit=0, mine_placer=lambda *args: mines
+    )
+    state.reveal_zone(*start)
+
+    solver = Solver(state)
+    while not state.is_over() and solver.safe:
+        solver.step()
+
+    return state.is_win()
+
+
+def _search(height, width, count, start: tuple[int, int], seeds: list[int]) -> Optional[list[int]]:
+    """Generate a candidate layout from every seed, and return the first one which can be solved without guessing."""
+    for seed in seeds:
+        mines = place_mines(height, width, count, start, random.Random(seed))
+
+        if is_solvable(height, width, mines, start):
+            return mines
+
+    return None
+
+
+def place_mines_no_guess(
+        height,
+        width,
+        count,
+        start: tuple[int, int],
+        rng: Optional[random.Random] = None,
+        parallel=True,
+        max_attempts=MAX_ATTEMPTS,
+) -> list[int]:
+    """Place the mines on a board so that it can be solved without guessing, from the first click.
+
+    It has the signature of `placement.place_mines`, so it can be used as the `mine_placer` of a `GameState`.
+    When no such layout is found among `max_attempts` candidates (on very dense boards, there might be none), a
+    random layout is returned instead.
+
+    :param height: The height of the board.
+    :param width: The width of the board.
+    :param count: The number of mines to place.
+    :param start: The `(lin, col)` coordinates of the first click.
+    :param rng: The random number generator the seeds of the candidates are drawn from (default is a new, randomly
+    seeded one).
+    :param parallel: Whether the candidates are checked in the shared process pool (default True).
+    :param max_attempts: The maximum number of candidates to check (default `MAX_ATTEMPTS`).
+    :return: The row-major indices of the mines.
+    :raises ValueError: If `count` mines can't be placed on the board.
+    """
+    if rng is None:
+        rng = random.Random()
+
+    batches = (
+        [rng.getrandbits(64) for _ in range(min(BATCH_SIZE, max_attempts - first))]
+        for first in range(0, max_attempts, BATCH_SIZE)
+    )
+
+    if not parallel:
+        for seeds in batches:
+            mines = _search(height, width, count, start, seeds)
+            if mines is not None:
+                return mines
+    else:
+        executor = get_executor()
+        # the batches being checked, in the order of their seeds, with some more queued than there are workers so
+        # that none of them is idle
+        pending = deque()
+
+        def submit():
+            seeds = next(batches, None)
+            if seeds is not None:
+                pending.append(executor.submit(_search, height, width, count, start, seeds))
+
+        for _ in range(2 * worker_count()):
+            submit()
+
+        while pending:
+            mines = pending.popleft().result()
+
+            if mines is not None:
+                for future in pending:
+                    future.cancel()
+                return mines
+
+            submit()
+
+    return place_mines(height, width, count, start, rng)
@@ -0,0 +1,16 @@
+"""The optional dependencies of the game, imported once for all the modules using them.
+
+NumPy counts the neighbors of the mines faster, and is needed to draw zoomed out boards and the minimap. The game works
+without it: the engine falls back to pure Python, and the boards are drawn a cell at a time.
+
+Variables:
+    - np: The `numpy` module, or None if it isn't installed.
+    - HAS_NUMPY: Whether NumPy is installed.
+"""
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+HAS_NUMPY = np is not None
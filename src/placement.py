@@ -0,0 +1,64 @@
+"""Mine placement.
+
+The mines are sampled without replacement from the cells which are allowed to hold a mine, so the cost of generating
+a board depends only on the number of mines, regardless of the density of the board.
+
+Functions:
+    - safe_zone: The cells which must not hold a mine.
+    - place_mines: Randomly pick the cells which hold the mines.
+"""
+
+import random
+from bisect import bisect_right
+from typing import Optional
+
+
+def safe_zone(height, width, lin, col) -> list[int]:
+    """Get the cells which must not hold a mine: the first clicked cell and its neighbors.
+
+    Cells are given as row-major indices (`lin * width + col`). Neighbors outside the board are left out.
+
+    :param height: The height of the board.
+    :param width: The width of the board.
+    :param lin: The line of the first click.
+    :param col: The column of the first click.
+    :return: The sorted indices of the cells around `(lin, col)`.
+    """
+    return [
+        cell_lin * width + cell_col
+        for cell_lin in range(lin - 1, lin + 2)
+        for cell_col in range(col - 1, col + 2)
+        if 0 <= cell_lin < height and 0 <= cell_col < width
+    ]
+
+
+def place_mines(height, width, count, start: tuple[int, int], rng: Optional[random.Random] = None) -> list[int]:
+    """Randomly pick the cells which hold the mines.
+
+    No mine is placed on `start` or around it. The allowed cells are never materialized: `count` ranks are sampled
+    from `[0, height * width - len(safe_zone))` and each rank is mapped to the cell it designates by skipping over the
+    (at most 9) cells of the safe zone, found by bisection.
+
+    :param height: The height of the board.
+    :param width: The width of the board.
+    :param count: The number of mines to place.
+    :param start: The `(lin, col)` coordinates of the first click.
+    :param rng: The random number generator to use (default is the global one of the `random` module).
+    :return: The row-major indices of the mines.
+
+    :raises ValueError: There are not enough allowed cells for `count` mines.
+    """
+    if rng is None:
+        rng = random
+
+    excluded = safe_zone(height, width, *start)
+    allowed = height * width - len(excluded)
+
+    if not (0 <= count <= allowed):
+        raise ValueError('Invalid `count` argument.')
+
+    # `excluded` is sorted, so `excluded[i] - i` is the number of allowed cells before the i-th safe cell: a rank is
+    # shifted by one for every safe cell with at most `rank` allowed cells before it
+    allowed_before = [cell - i for i, cell in enumerate(excluded)]
+
+    return [rank + bisect_right(allowed_before, rank) for rank in rng.sample(range(allowed), count)]
@@ -0,0 +1,389 @@
+"""Exact mine probabilities of the unknown cells of the board the player sees.
+
+The unknown cells next to a revealed number form the frontier; the other unknown cells (the interior) are all alike,
+as no number constrains them. The frontier is split into independent components (union-find over the numbers sharing
+unknown cells), and the solutions of each component are counted by number of mines, with a dynamic programming pass
+over its cells: partial assignments which leave the open numbers with the same missing mines are merged, so the work
+grows with the width of the frontier, not with the number of its solutions.
+
+The components are then combined under the global mine count: a choice of `k_1, ..., k_m` mines in the components
+is weighted by its number of solutions times `comb(interior, mines - k_1 - ... - k_m)`, the ways to place the other
+mines in the interior. All counts are exact integers, the probabilities are only rounded at the end.
+
+Large components are counted in the shared process pool, when there are several of them.
+
+Classes:
+    - Probabilities: The mine probabilities of the unknown cells.
+
+Functions:
+    - mine_probabilities: Compute the mine probabilities of the unknown cells of a game.
+"""
+
+import heapq
+from math import comb
+
+from state import BoardCell, GameState
+from workers import get_executor
+
+# components with at least this many cells are counted in the process pool (when there are several of them)
+PARALLEL_MIN_CELLS = 48
+
+
+class Probabilities:
+    """The mine probabilities of the unknown cells.
+
+    Instance variables:
+        - frontier: The mine probabilities of the cells which aren't interior cells, by row-major index (including
+        the trusted flags).
+        - interior: The mine probability of every interior cell (the unknown cells not next to a revealed number).
+
+    Methods:
+        - __init__: Construct the probabilities.
+        - get: Get the mine probability of a cell.
+    """
+
+    __slots__ = ("frontier", "interior")
+
+    def __init__(self, frontier: dict[int, float], interior: float):
+        """Initialize the probabilities.
+
+        :param frontier: The mine probabilities of the frontier cells, by row-major index.
+        :param interior: The mine probability of every interior cell.
+        """
+        self.frontier = frontier
+        self.interior = interior
+
+    def get(self, cell: int) -> float:
+        """Get the mine probability of an unknown cell, given by its row-major index."""
+        return self.frontier.get(cell, self.interior)
+
+
+class _UnionFind:
+    """Disjoint sets of integers, with path halving and union by size."""
+
+    def __init__(self):
+        self.parent: dict[int, int] = {}
+        self.size: dict[int, int] = {}
+
+    def find(self, x):
+        parent = self.parent
+        if x not in parent:
+            parent[x] = x
+            self.size[x] = 1
+
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+
+        return x
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return
+
+        if self.size[a] < self.size[b]:
+            a, b = b, a
+        self.parent[b] = a
+        self.size[a] += self.size[b]
+
+
+def _convolve(a: list[int], b: list[int], shift=0) -> list[int]:
+    """Convolve two distributions of solutions by number of mines, shifting the result by `shift` mines."""
+    result = [0] * (len(a) + len(b) - 1 + shift)
+
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j + shift] += x * y
+
+    return result
+
+
+def _add(acc: list[int], counts: list[int], shift=0):
+    """Add a distribution of solutions by number of mines to another, shifting it by `shift` mines."""
+    if len(acc) < len(counts) + shift:
+        acc.extend([0] * (len(counts) + shift - len(acc)))
+
+    for k, count in enumerate(counts):
+        acc[k + shift] += count
+
+
+def _count_component(size, constraints: list[tuple[list[int], int]]) -> tuple[list[int], list[list[int]]]:
+    """Count the solutions of a component by number of mines.
+
+    The cells are assigned in order. Before assigning the cell `i`, the state of a partial assignment is the number of
+    mines still missing around the numbers which have both assigned and unassigned cells (the open numbers): the
+    assignments of the remaining cells only depend on it, so partial assignments with the same state are merged.
+    A forward pass counts the ways to reach every state, a backward pass the ways to complete it; the solutions with
+    a mine on cell `i` are obtained by combining the two around the cell.
+
+    :param size: The number of cells of the component.
+    :param constraints: The numbers of the component, as `(cells, mines)`: the (sorted) local indices of their unknown
+    cells and the mines missing among them.
+    :return: The number of solutions by number of mines, and, for every cell, the number of solutions with a mine on
+    it by number of mines.
+    """
+    # for every cell, the numbers around it and how many of their cells come after it
+    touching = [[] for _ in range(size)]
+    # for every cell, the numbers open before assigning it
+    active = [[] for _ in range(size + 1)]
+
+    for index, (cells, _) in enumerate(constraints):
+        for position, cell in enumerate(cells):
+            touching[cell].append((index, len(cells) - position - 1))
+        for i in range(cells[0] + 1, cells[-1] + 1):
+            active[i].append(index)
+
+    # forward pass: the ways to reach every state, and the transitions between states
+    forward = [{} for _ in range(size + 1)]
+    forward[0][()] = [1]
+    transitions = [{} for _ in range(size)]
+
+    for i in range(size):
+        for key, counts in forward[i].items():
+            moves = transitions[i][key] = []
+
+            for mine in (0, 1):
+                missing = dict(zip(active[i], key))
+
+                for index, rest in touching[i]:
+                    need = missing.get(index, constraints[index][1]) - mine
+                    if need < 0 or need > rest:
+                        break
+                    missing[index] = need
+                else:
+                    next_key = tuple(missing[index] for index in active[i + 1])
+                    moves.append((mine, next_key))
+                    _add(forward[i + 1].setdefault(next_key, []), counts, mine)
+
+    # backward pass: the ways to complete every state
+    backward = [{} for _ in range(size + 1)]
+    backward[size][()] = [1]
+
+    for i in range(size - 1, -1, -1):
+        for key, moves in transitions[i].items():
+            counts = backward[i][key] = []
+
+            for mine, next_key in moves:
+                completions = backward[i + 1].get(next_key)
+                if completions:
+                    _add(counts, completions, mine)
+
+    totals = backward[0].get((), [])
+    mines = []
+
+    for i in range(size):
+        counts = []
+
+        for key, moves in transitions[i].items():
+            for mine, next_key in moves:
+                completions = backward[i + 1].get(next_key)
+                if mine and completions:
+                    _add(counts, _convolve(forward[i][key], completions, 1))
+
+        mines.append(counts)
+
+    return totals, mines
+
+
+def _components(state: GameState, trust_flags) -> tuple[list[tuple[list[int], list]], int, int, set[int]]:
+    """Split the frontier of a board into independent components.
+
+    :param state: The game state.
+    :param trust_flags: Whether the flags are mines, or unknown cells.
+    :return: The components, as `(cells, constraints)` (see `_count_component`), the number of interior cells, the
+    number of mines left to place, and the trusted flags.
+    """
+    height, width = state.size
+    board = state.board.data
+    unselected, flagged = BoardCell.UNSELECTED.value, BoardCell.FLAGGED.value
+
+    flags = {cell for cell, value in enumerate(board) if value == flagged} if trust_flags else set()
+    unknown_count = sum(1 for value in board if value == unselected or value == flagged) - len(flags)
+
+    # the revealed numbers with unknown cells around them, as `(cells, mines)`
+    constraints = []
+    sets = _UnionFind()
+
+    for cell, value in enumerate(board):
+        if not 0 <= value <= 8:
+            continue
+
+        lin, col = divmod(cell, width)
+        cells = []
+        mines = value
+
+        for next_lin in range(max(0, lin - 1), min(height, lin + 2)):
+            for next_col in range(max(0, col - 1), min(width, col + 2)):
+                neighbor = next_lin * width + next_col
+
+                if neighbor in flags:
+                    mines -= 1
+                elif board[neighbor] == unselected or board[neighbor] == flagged:
+                    cells.append(neighbor)
+
+        if cells:
+            constraints.append((cells, mines))
+            for neighbor in cells[1:]:
+                sets.union(cells[0], neighbor)
+        elif mines:
+            raise ValueError("the board has no solution")
+
+    # group the cells and the numbers of each component
+    groups: dict[int, tuple[set[int], list]] = {}
+    for cells, mines in constraints:
+        group = groups.setdefault(sets.find(cells[0]), (set(), []))
+        group[0].update(cells)
+        group[1].append((cells, mines))
+
+    components = []
+    frontier_count = 0
+
+    for cells, group_constraints in groups.values():
+        order = _order_cells(cells, group_constraints)
+        local = {cell: index for index, cell in enumerate(order)}
+
+        components.append(
+            (order, [(sorted(local[cell] for cell in cells), mines) for cells, mines in group_constraints])
+        )
+        frontier_count += len(order)
+
+    mines_left = state.max_bombs - len(flags)
+
+    return components, unknown_count - frontier_count, mines_left, flags
+
+
+def _order_cells(cells: set[int], constraints: list) -> list[int]:
+    """Order the cells of a component so that few numbers are open at any time.
+
+    The next cell is always taken from the open number with the fewest unassigned cells, which closes the numbers as
+    soon as possible and keeps neighboring cells close to each other in the order.
+    """
+    by_cell: dict[int, list[int]] = {}
+    for index, (constraint_cells, _) in enumerate(constraints):
+        for cell in constraint_cells:
+            by_cell.setdefault(cell, []).append(index)
+
+    unassigned = [len(constraint_cells) for constraint_cells, _ in constraints]
+    # the open numbers, as `(unassigned, index)`, with stale entries skipped when popped
+    open_numbers = []
+    order, seen = [], set()
+
+    def assign(cell):
+        order.append(cell)
+        seen.add(cell)
+
+        for index in by_cell[cell]:
+            unassigned[index] -= 1
+            if unassigned[index]:
+                heapq.heappush(open_numbers, (unassigned[index], index))
+
+    assign(min(cells))
+
+    while len(order) < len(cells):
+        count, index = heapq.heappop(open_numbers)
+        if count != unassigned[index]:
+            continue
+
+        assign(next(cell for cell in constraints[index][0] if cell not in seen))
+
+    return order
+
+
+def _interior_ways(interior, mines_left, count) -> list[int]:
+    """Get the numbers of ways to place the mines left in the interior, when the frontier holds `0` to `count - 1` of
+    them.
+
+    Only the first one is computed from scratch, the others follow from
+    `comb(interior, j) = comb(interior, j + 1) * (j + 1) / (interior - j)`.
+    """
+    exact = [0] * count
+    current = None
+
+    for mines in range(count):
+        j = mines_left - mines
+        if not 0 <= j <= interior:
+            continue
+
+        current = comb(interior, j) if current is None else current * (j + 1) // (interior - j)
+        exact[mines] = current
+
+    return exact
+
+
+def _solve(state: GameState, trust_flags, parallel) -> Probabilities:
+    """Compute the mine probabilities, raising ValueError if the board has no solution."""
+    components, interior, mines_left, flags = _components(state, trust_flags)
+
+    large = [index for index, (cells, _) in enumerate(components) if len(cells) >= PARALLEL_MIN_CELLS]
+    results: list = [None] * len(components)
+
+    if parallel and len(large) > 1:
+        futures = {
+            index: get_executor().submit(_count_component, len(components[index][0]), components[index][1])
+            for index in large
+        }
+    else:
+        futures = {}
+
+    for index, (cells, constraints) in enumerate(components):
+        if index not in futures:
+            results[index] = _count_component(len(cells), constraints)
+    for index, future in futures.items():
+        results[index] = future.result()
+
+    # the solutions of all the components but one, by number of mines
+    prefix = [[1]]
+    for totals, _ in results:
+        prefix.append(_convolve(prefix[-1], totals))
+    suffix = [[1]]
+    for totals, _ in reversed(results):
+        suffix.append(_convolve(suffix[-1], totals))
+    suffix.reverse()
+
+    ways = _interior_ways(interior, mines_left, len(prefix[-1]))
+
+    weight = sum(count * ways[mines] for mines, count in enumerate(prefix[-1]))
+    if weight == 0:
+        raise ValueError("the board has no solution")
+
+    frontier = {cell: 1.0 for cell in flags}
+
+    for index, ((cells, _), (totals, mines)) in enumerate(zip(components, results)):
+        others = _convolve(prefix[index], suffix[index + 1])
+        # the weight of a solution of this component with `k` mines
+        component_ways = [
+            sum(count * ways[k + other] for other, count in enumerate(others) if count)
+            for k in range(len(totals))
+        ]
+
+        for cell, counts in zip(cells, mines):
+            frontier[cell] = sum(count * component_ways[k] for k, count in enumerate(counts)) / weight
+
+    if interior:
+        interior_mines = sum(
+            count * ways[mines] * (mines_left - mines) for mines, count in enumerate(prefix[-1]) if ways[mines]
+        )
+        interior_probability = interior_mines / (interior * weight)
+    else:
+        interior_probability = 0.0
+
+    return Probabilities(frontier, interior_probability)
+
+
+def mine_probabilities(state: GameState, parallel=True) -> Probabilities:
+    """Compute the exact mine probabilities of the unknown cells of a game.
+
+    The flags are trusted: the flagged cells are mines and the mines left are `state.max_bombs` minus the flags.
+    If the flags contradict the board, they are ignored instead.
+
+    :param state: The game state.
+    :param parallel: Whether large components may be counted in a process pool (default True).
+    :return: The mine probabilities.
+    :raises ValueError: If the board has no solution (which can't happen in a real game).
+    """
+    try:
+        return _solve(state, True, parallel)
+    except ValueError:
+        return _solve(state, False, parallel)
@@ -0,0 +1,132 @@
+"""Lightweight timing instrumentation for the hot paths of the game.
+
+Sections of code are timed with `profiler.section(name)`. When the profiler is disabled, a section costs a single
+attribute check, so the hooks can stay in the code permanently.
+
+The durations of the last samples of every section are kept in memory (for the performance HUD), and they can also be
+written to a JSONL trace, one `{"name", "start", "duration"}` object per line (times in seconds, `start` relative to
+the start of the trace).
+
+Classes:
+    - Profiler: Collects the durations of named sections of code.
+
+Variables:
+    - profiler: The profiler shared by the whole game.
+"""
+
+import json
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from typing import Optional, TextIO
+
+
+class Profiler:
+    """Collects the durations of named sections of code.
+
+    Instance variables:
+        - enabled: Whether the sections are timed.
+        - max_samples: How many samples are kept for every section.
+        - samples: The last durations of every section, in seconds.
+
+    Methods:
+        - __init__: Construct a profiler.
+        - section: Time a section of code.
+        - record: Record the duration of a section.
+        - percentiles: Get percentiles of the durations of a section.
+        - start_trace: Start writing the samples to a JSONL file.
+        - stop_trace: Stop writing the samples to a file.
+        - is_tracing: Check whether the samples are written to a file.
+    """
+
+    def __init__(self, enabled=False, max_samples=300):
+        """Initialize the profiler.
+
+        :param enabled: Whether the sections are timed (default False).
+        :param max_samples: How many samples are kept for every section (default 300, 5s at 60 FPS).
+        """
+        self.enabled = enabled
+        self.max_samples = max_samples
+        self.samples: dict[str, deque] = {}
+
+        self.__trace: Optional[TextIO] = None
+        self.__trace_start = 0.0
+        self.__disabled_section = nullcontext()
+
+    def section(self, name):
+        """Time a section of code, used as `with profiler.section(name): ...`."""
+        if not self.enabled:
+            return self.__disabled_section
+        return self.__section(name)
+
+    @contextmanager
+    def __section(self, name):
+        """Time a section of code (profiler enabled)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start, start)
+
+    def record(self, name, duration, start=None):
+        """Record the duration of a section.
+
+        Ignored if the profiler is disabled.
+
+        :param name: The name of the section.
+        :param duration: The duration, in seconds.
+        :param start: The `time.perf_counter()` at which the section started (default is `duration` ago).
+        """
+        if not self.enabled:
+            return
+
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.max_samples)
+        self.samples[name].append(duration)
+
+        if self.__trace is not None:
+            if start is None:
+                start = time.perf_counter() - duration
+
+            self.__trace.write(
+                json.dumps({"name": name, "start": start - self.__trace_start, "duration": duration}) + "\n"
+            )
+
+    def percentiles(self, name, percents=(50, 95, 99)) -> Optional[list[float]]:
+        """Get percentiles of the recorded durations of a section.
+
+        :param name: The name of the section.
+        :param percents: The percentiles to compute (default p50, p95 and p99).
+        :return: The durations at the given percentiles, in seconds, or None if the section has no samples.
+        """
+        samples = sorted(self.samples.get(name, ()))
+
+        if not samples:
+            return None
+
+        return [samples[min(len(samples) - 1, len(samples) * percent // 100)] for percent in percents]
+
+    def start_trace(self, path):
+        """Start writing every sample to a JSONL file (this enables the profiler).
+
+        :param path: The path of the trace file, which is overwritten.
+        """
+        self.stop_trace()
+
+        self.__trace = open(path, "w")
+        self.__trace_start = time.perf_counter()
+        self.enabled = True
+
+    def stop_trace(self):
+        """Stop writing the samples to the trace file, and close it."""
+        if self.__trace is not None:
+            self.__trace.close()
+            self.__trace = None
+
+    def is_tracing(self):
+        """Check whether the samples are written to a trace file."""
+        return self.__trace is not None
+
+
+# the profiler shared by the whole game
+profiler = Profiler()
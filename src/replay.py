@@ -0,0 +1,375 @@
+"""Recording of games as move logs, and their fast headless replay.
+
+A move log holds everything needed to play a game again: the seed of its random number generator, its size, number of
+bombs, time limit and board generator, then every move and timer tick of the game with the time it happened at. The
+bombs are placed by a generator seeded with the seed of the game, so applying the same events to a new `GameState`
+rebuilds exactly the same game. A log also stores a digest of the state it ended in, so replaying a corpus of logs
+checks that changes to the engine give identical results.
+
+The moves made during the same frame were applied as a single batch by the game, and are replayed the same way: the
+replay times every batch, which reproduces the slow frames of a game without its display.
+
+A log file is made of (all integers are little-endian):
+- a header: the magic bytes `MSWPLOG\\0`, the version of the format (u16), the options of the game (u8: bit 0 is set
+for boards which can be solved without guessing), the height, width, number of bombs (u32 each), the time limit (i32),
+the seed (u64), the number of events (u32) and the digest of the final state (8 bytes, zeros if unknown).
+- the events, 13 bytes each: the kind of the event (u8: 0 for a timer tick, otherwise the value of the `Move`, with
+bit 7 set on the moves applied in the same batch as the previous one), the time since the start of the game in
+milliseconds (u32), and the line and column of the move (u32 each).
+
+Usage:
+    python3 src/replay.py LOG [LOG ...] [--workers N] [--json]
+
+Classes:
+    - MoveLog: The events of a game, with what is needed to play them again.
+
+Functions:
+    - state_digest: Get a digest of the state of a game.
+    - replay: Play a move log again.
+    - replay_file: Play a move log file again, and check its result.
+    - replay_files: Play many move log files again, in a process pool.
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from noguess import place_mines_no_guess
+from placement import place_mines
+from state import GameState, Move
+from workers import START_METHOD, worker_count
+
+MAGIC = b"MSWPLOG\0"
+VERSION = 1
+
+HEADER = struct.Struct("<8sHBIIIiQI8s")
+EVENT = struct.Struct("<BIII")
+
+# the options of the game
+NO_GUESS = 1
+
+# the kind of the timer ticks, the moves use the values of `Move`
+TICK = 0
+# set on the moves applied in the same batch as the previous one
+SAME_BATCH = 0x80
+
+NO_DIGEST = bytes(8)
+
+
+class MoveLog:
+    """The events of a game, with what is needed to play them again.
+
+    Instance variables:
+        - height: The height of the board.
+        - width: The width of the board.
+        - max_bombs: The number of bombs.
+        - time: The time limit of the game (0 if there's none).
+        - seed: The seed of the random number generator of the game.
+        - no_guess: Whether the board is generated so that it can be solved without guessing.
+        - events: The events of the game, as `(kind, milliseconds, lin, col)` tuples (see the format above).
+        - digest: The digest of the state the game ended in (see `state_digest`), or None if unknown.
+
+    Methods:
+        - __init__: Construct an empty log.
+        - for_state: Construct the log of a game which hasn't started yet.
+        - record_moves: Record a batch of moves.
+        - record_tick: Record a timer tick.
+        - finish: Record the state the game ended in.
+        - write: Write the log to a binary file.
+        - read: Read a log from a binary file.
+        - save: Write the log to a new file of a directory.
+        - batches: Iterate over the batches of moves and the ticks of the log.
+    """
+
+    def __init__(self, height, width, max_bombs, time_limit, seed, no_guess=False):
+        """Initialize an empty log.
+
+        :param height: The height of the board.
+        :param width: The width of the board.
+        :param max_bombs: The number of bombs.
+        :param time_limit: The time limit of the game (0 if there's none).
+        :param seed: The seed of the random number generator of the game.
+        :param no_guess: Whether the board is generated so that it can be solved without guessing (default False).
+        """
+        self.height, self.width, self.max_bombs = height, width, max_bombs
+        self.time = time_limit
+        self.seed = seed
+        self.no_guess = no_guess
+        self.events: list[tuple[int, int, int, int]] = []
+        self.digest: Optional[bytes] = None
+
+        self.__start = time.perf_counter()
+
+    @classmethod
+    def for_state(cls, state: GameState, no_guess=False) -> "MoveLog":
+        """Construct the log of a game which hasn't started yet, its events are timed from now.
+
+        The game must have been constructed with a seed rather than a random number generator, so that it can be
+        replayed.
+
+        :param state: The game.
+        :param no_guess: Whether the board is generated so that it can be solved without guessing (default False).
+        :return: The empty log of the game.
+        """
+        return cls(state.height, state.width, state.max_bombs, state.time_left, state.seed, no_guess)
+
+    def __now(self):
+        """Get the time since the start of the log, in milliseconds."""
+        return int((time.perf_counter() - self.__start) * 1000)
+
+    def record_moves(self, moves: Iterable[tuple[Move, int, int]]):
+        """Record a batch of moves, as given to `GameState.apply_moves`."""
+        now = self.__now()
+        same_batch = 0
+
+        for move, lin, col in moves:
+            self.events.append((move.value | same_batch, now, lin, col))
+            same_batch = SAME_BATCH
+
+    def record_tick(self):
+        """Record a timer tick."""
+        self.events.append((TICK, self.__now(), 0, 0))
+
+    def finish(self, state: GameState):
+        """Record the state the game ended in, to be compared with the state of its replays."""
+        self.digest = state_digest(state)
+
+    def write(self, file: BinaryIO):
+        """Write the log to a binary file, in the format described above.
+
+        :param file: The file to write to, opened in binary mode.
+        """
+        file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                NO_GUESS if self.no_guess else 0,
+                self.height,
+                self.width,
+                self.max_bombs,
+                self.time,
+                self.seed,
+                len(self.events),
+                self.digest or NO_DIGEST,
+            )
+        )
+        file.write(b"".join(EVENT.pack(*event) for event in self.events))
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> "MoveLog":
+        """Read a log from a binary file, written by `write`.
+
+        :param file: The file to read from, opened in binary mode.
+        :return: The log.
+        :raises ValueError: If the file isn't a valid log file, or has an unsupported version.
+        """
+        header = file.read(HEADER.size)
+        if len(header) != HEADER.size:
+            raise ValueError("Truncated move log.")
+
+        magic, version, options, height, width, max_bombs, time_limit, seed, count, digest = HEADER.unpack(header)
+
+        if magic != MAGIC:
+            raise ValueError("Not a move log.")
+        if version != VERSION:
+            raise ValueError(f"Unsupported move log version {version}.")
+
+        events = file.read(count * EVENT.size)
+        if len(events) != count * EVENT.size:
+            raise ValueError("Truncated move log.")
+
+        log = cls(height, width, max_bombs, time_limit, seed, bool(options & NO_GUESS))
+        log.events = list(EVENT.iter_unpack(events))
+        log.digest = digest if digest != NO_DIGEST else None
+
+        return log
+
+    def save(self, directory) -> str:
+        """Write the log to a new file of a directory, creating the directory if needed.
+
+        :param directory: The directory of the logs.
+        :return: The path of the file.
+        """
+        os.makedirs(directory, exist_ok=True)
+
+        path = os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{self.seed:016x}.mswlog")
+        with open(path, "wb") as file:
+            self.write(file)
+
+        return path
+
+    def batches(self) -> Iterator[tuple[int, list[tuple[Move, int, int]]]]:
+        """Iterate over the batches of moves and the timer ticks of the log, in order.
+
+        :return: `(milliseconds, moves)` pairs, the moves of a timer tick being an empty list.
+        """
+        batch = None
+        batch_time = 0
+
+        for kind, milliseconds, lin, col in self.events:
+            if kind & SAME_BATCH and batch is not None:
+                batch.append((Move(kind & ~SAME_BATCH), lin, col))
+                continue
+
+            if batch is not None:
+                yield batch_time, batch
+                batch = None
+
+            if kind == TICK:
+                yield milliseconds, []
+            else:
+                batch, batch_time = [(Move(kind & ~SAME_BATCH), lin, col)], milliseconds
+
+        if batch is not None:
+            yield batch_time, batch
+
+
+def state_digest(state: GameState) -> bytes:
+    """Get a digest of the state of a game: its board, counters and move count.
+
+    :param state: The game.
+    :return: An 8-byte digest, equal for two games in the same state.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    digest.update(
+        struct.pack(
+            "<IIIiIBBQ",
+            state.height,
+            state.width,
+            state.flags,
+            state.time_left,
+            state.unrevealed_zones,
+            state.game_over,
+            state.init,
+            state.move_count,
+        )
+    )
+    digest.update(state.board.data.tobytes())
+
+    return digest.digest()
+
+
+def replay(log: MoveLog, timings: Optional[list[tuple[int, int, float]]] = None) -> GameState:
+    """Play a move log again, without a display.
+
+    :param log: The log.
+    :param timings: If given, the `(milliseconds, moves, duration)` of every batch of moves are appended to it, the
+    duration being in seconds (default None).
+    :return: The state the game ends in.
+    """
+    # the replays don't need the undo history, and are run in the workers of the process pool already
+    state = GameState(
+        size=(log.height, log.width),
+        max_bombs=log.max_bombs,
+        time=log.time,
+        seed=log.seed,
+        history_limit=0,
+        mine_placer=partial(place_mines_no_guess, parallel=False) if log.no_guess else place_mines,
+    )
+
+    for milliseconds, moves in log.batches():
+        if not moves:
+            state.timer_ticked()
+        elif timings is None:
+            state.apply_moves(moves)
+        else:
+            start = time.perf_counter()
+            state.apply_moves(moves)
+            timings.append((milliseconds, len(moves), time.perf_counter() - start))
+
+    return state
+
+
+def replay_file(path) -> dict:
+    """Play a move log file again, and compare the state it ends in with the one recorded.
+
+    :param path: The path of the log.
+    :return: The result of the replay: its `path`, `status` ("ok", "mismatch", "unchecked" if the log has no digest or
+    "error"), number of `events`, total time in `ms`, and the `slowest` batch as `{"at", "moves", "ms"}` (None if
+    there are no moves).
+    """
+    try:
+        with open(path, "rb") as file:
+            log = MoveLog.read(file)
+    except (OSError, ValueError) as error:
+        return {"path": path, "status": "error", "error": str(error)}
+
+    timings = []
+    start = time.perf_counter()
+    state = replay(log, timings)
+    elapsed = time.perf_counter() - start
+
+    if log.digest is None:
+        status = "unchecked"
+    else:
+        status = "ok" if state_digest(state) == log.digest else "mismatch"
+
+    slowest = max(timings, key=lambda timing: timing[2], default=None)
+
+    return {
+        "path": path,
+        "status": status,
+        "events": len(log.events),
+        "ms": elapsed * 1000,
+        "slowest": None if slowest is None else {"at": slowest[0], "moves": slowest[1], "ms": slowest[2] * 1000},
+    }
+
+
+def replay_files(paths: list[str], workers: Optional[int] = None) -> Iterator[dict]:
+    """Play many move log files again, in a process pool.
+
+    :param paths: The paths of the logs.
+    :param workers: The number of worker processes (default is one per core). If it is 0, the logs are replayed in
+    this process.
+    :return: The results of the replays (see `replay_file`), in the order of `paths`, as they complete.
+    """
+    if workers == 0:
+        yield from map(replay_file, paths)
+        return
+
+    workers = workers if workers is not None else worker_count()
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD)) as executor:
+        yield from executor.map(replay_file, paths, chunksize=max(1, len(paths) // (8 * workers)))
+
+
+def format_result(result: dict) -> str:
+    """Format the result of a replay on a single line."""
+    if result["status"] == "error":
+        return f"{result['path']}: error, {result['error']}"
+
+    line = f"{result['path']}: {result['status']}, {result['events']} events in {result['ms']:.1f} ms"
+    if result["slowest"] is not None:
+        slowest = result["slowest"]
+        line += f", slowest batch {slowest['ms']:.2f} ms ({slowest['moves']} moves at {slowest['at'] / 1000:.1f}s)"
+
+    return line
+
+
+def main():
+    """Parse the command line arguments and replay the logs."""
+    parser = argparse.ArgumentParser(description="Replay recorded games headlessly, and check their final states.")
+    parser.add_argument("logs", nargs="+", help="move log files")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, 0 to replay in this process")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON lines")
+    args = parser.parse_args()
+
+    failed = False
+
+    for result in replay_files(args.logs, args.workers):
+        failed = failed or result["status"] in ("mismatch", "error")
+        print(json.dumps(result) if args.json else format_result(result), flush=True)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
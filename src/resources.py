@@ -0,0 +1,86 @@
+"""Process-wide cache for the images and fonts of the game.
+
+Every asset is loaded from disk (and converted to the display format, and scaled) only once, the first time it is
+requested, then it is shared by all its users. Assets can also be loaded eagerly at startup with `preload`.
+
+Images are converted for fast blitting, so they can only be loaded once the display mode has been set.
+
+Functions:
+    - load_image: Get an image, converted and optionally scaled.
+    - load_font: Get a font.
+    - preload: Load the assets of the game ahead of time.
+"""
+from typing import Optional
+
+import pygame
+
+# images used by the game, with their display size
+IMAGES = [
+    ("assets/reset.png", (48, 48)),
+    ("assets/lose.png", (48, 48)),
+    ("assets/win.png", (48, 48)),
+    ("assets/home.png", (48, 48)),
+    ("assets/up.png", (48, 48)),
+    ("assets/down.png", (48, 48)),
+    ("assets/left.png", (48, 48)),
+    ("assets/right.png", (48, 48)),
+]
+
+# fonts used by the game, with their size
+FONTS = [
+    ("assets/mine-sweeper.ttf", 16),
+    ("assets/seven-segment.ttf", 48),
+]
+
+_images: dict[tuple[str, Optional[tuple[int, int]]], pygame.Surface] = {}
+_fonts: dict[tuple[str, int], pygame.font.Font] = {}
+
+
+def load_image(path, size: Optional[tuple[int, int]] = None) -> pygame.Surface:
+    """Get an image, with an alpha channel and converted to the display format.
+
+    The surface is shared by all the callers, it must not be modified.
+
+    :param path: The path of the image.
+    :param size: The size to scale the image to (default None, which keeps its original size).
+    :return: The image.
+    """
+    key = (path, size)
+
+    if key not in _images:
+        image = _images.get((path, None))
+        if image is None:
+            image = _images[path, None] = pygame.image.load(path).convert_alpha()
+
+        if size is not None:
+            _images[key] = pygame.transform.scale(image, size)
+
+    return _images[key]
+
+
+def load_font(path, size) -> pygame.font.Font:
+    """Get a font.
+
+    :param path: The path of the font file.
+    :param size: The size of the font.
+    :return: The font.
+    """
+    key = (path, size)
+
+    if key not in _fonts:
+        _fonts[key] = pygame.font.Font(path, size)
+
+    return _fonts[key]
+
+
+def preload(images=IMAGES, fonts=FONTS):
+    """Load assets ahead of time, so that they are ready when needed.
+
+    :param images: The `(path, size)` of the images to load (default is all the images of the game).
+    :param fonts: The `(path, size)` of the fonts to load (default is all the fonts of the game).
+    """
+    for path, size in images:
+        load_image(path, size)
+
+    for path, size in fonts:
+        load_font(path, size)
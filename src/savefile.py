@@ -0,0 +1,265 @@
+"""Compact binary snapshots of games, to save them and resume them later.
+
+A save file is made of (all integers are little-endian):
+- a header: the magic bytes `MSWPSAVE`, the version of the format (u16), the status of the game (u8: bit 0 is set
+once the game has started, bit 1 once it is over), the height, width, number of bombs, flags left (u32 each), the time
+left (i32), the number of unrevealed zones (u32), the number of moves and the seed (u64 each).
+- the bombs, if the game has started: one bit per cell, in row-major order (the most significant bit of a byte is
+its first cell). The numbers of the cells are computed again when the game is loaded.
+- the board of the player, run-length encoded: every run of equal cells is its value (i8) followed by its length
+(unsigned LEB128). The runs are split in blocks, each prefixed by its size in bytes (u32); a block of size 0 ends the
+board.
+
+Both sections are written and read in blocks of `BLOCK_CELLS` cells, so a save is streamed from and to the file. A
+1000x1000 board takes 125 kB for the bombs, and the board of the player usually much less than that.
+
+Functions:
+    - save: Write a game to a binary file.
+    - load: Read a game from a binary file.
+    - save_file: Save a game to a path.
+    - load_file: Load a game from a path.
+"""
+
+import os
+import re
+import struct
+from array import array
+from typing import BinaryIO, Callable, Optional
+
+from grid import Grid
+from neighbors import count_neighbors
+from state import BoardCell, GameEvent, GameState
+
+MAGIC = b"MSWPSAVE"
+VERSION = 1
+
+# where the game in progress is saved by default
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".minesweeper", "save.bin")
+
+# the number of cells encoded at once (a multiple of 8, so the bombs of a block fill whole bytes)
+BLOCK_CELLS = 1 << 16
+
+HEADER = struct.Struct("<8sHBIIIIiIQQ")
+BLOCK_SIZE = struct.Struct("<I")
+# the largest size of a block of the board: a run per cell, with its value and a length of up to 3 bytes
+MAX_BLOCK_SIZE = BLOCK_CELLS * 4
+
+STARTED, OVER = 1, 2
+
+# runs of equal bytes
+RUNS = re.compile(rb"(.)\1*", re.DOTALL)
+
+# the values a cell of the board of the player may have, as unsigned bytes
+CELL_VALUES = bytes(sorted({*range(9), *(cell.value % 256 for cell in BoardCell)}))
+
+# translation table of the cells of `zones` to bits: the bombs become b"1" and the other cells b"0"
+BOMB_BITS = bytes(ord("1") if value == BoardCell.BOMB.value else ord("0") for value in range(256))
+
+
+def _pack_bits(cells: bytes) -> bytes:
+    """Pack cells which are each `b"0"` or `b"1"` in bits, padding the last byte with zeros."""
+    padding = -len(cells) % 8
+    return int(cells + b"0" * padding, 2).to_bytes((len(cells) + padding) // 8, "big")
+
+
+def _unpack_bits(data: bytes, count) -> bytes:
+    """Unpack the first `count` bits of `data`, as a string of `b"0"` and `b"1"`."""
+    return format(int.from_bytes(data, "big"), f"0{len(data) * 8}b")[:count].encode()
+
+
+def _write_varint(out: bytearray, value):
+    """Append an unsigned integer in LEB128 (7 bits per byte, the high bit set on all bytes but the last one)."""
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, position) -> tuple[int, int]:
+    """Read an unsigned integer in LEB128 at a position of `data`.
+
+    :return: The integer, and the position of the byte after it.
+    :raises ValueError: If `data` ends before the integer.
+    """
+    value, shift = 0, 0
+
+    while True:
+        if position >= len(data):
+            raise ValueError("Corrupted save file.")
+
+        byte = data[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        shift += 7
+
+        if byte < 0x80:
+            return value, position
+
+
+def _read_exactly(file: BinaryIO, size) -> bytes:
+    """Read `size` bytes from the file.
+
+    :raises ValueError: If the file ends before.
+    """
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated save file.")
+    return data
+
+
+def save(state: GameState, file: BinaryIO):
+    """Write a game to a binary file, in the format described above.
+
+    The history of the moves isn't saved.
+
+    :param state: The game to save.
+    :param file: The file to write to, opened in binary mode.
+    """
+    status = (STARTED if state.init else 0) | (OVER if state.game_over else 0)
+    file.write(
+        HEADER.pack(
+            MAGIC,
+            VERSION,
+            status,
+            state.height,
+            state.width,
+            state.max_bombs,
+            state.flags,
+            state.time_left,
+            state.unrevealed_zones,
+            state.move_count,
+            state.seed,
+        )
+    )
+
+    size = state.height * state.width
+
+    if state.init:
+        zones = state.zones.data.tobytes()
+
+        for first in range(0, size, BLOCK_CELLS):
+            file.write(_pack_bits(zones[first:first + BLOCK_CELLS].translate(BOMB_BITS)))
+
+    board = state.board.data.tobytes()
+
+    for first in range(0, size, BLOCK_CELLS):
+        block = board[first:first + BLOCK_CELLS]
+        out = bytearray()
+
+        for run in RUNS.finditer(block):
+            out.append(block[run.start()])
+            _write_varint(out, run.end() - run.start())
+
+        file.write(BLOCK_SIZE.pack(len(out)))
+        file.write(out)
+
+    file.write(BLOCK_SIZE.pack(0))
+
+
+def load(file: BinaryIO, listener: Optional[Callable[[GameEvent, GameState], None]] = None) -> GameState:
+    """Read a game from a binary file, written by `save`.
+
+    The listener isn't notified of anything: if the game is in progress, its timer has to be started again.
+
+    :param file: The file to read from, opened in binary mode.
+    :param listener: The listener of the game (default None).
+    :return: The game, with an empty history.
+    :raises ValueError: If the file isn't a valid save file, or has an unsupported version.
+    """
+    (
+        magic,
+        version,
+        status,
+        height,
+        width,
+        max_bombs,
+        flags,
+        time_left,
+        unrevealed_zones,
+        move_count,
+        seed,
+    ) = HEADER.unpack(_read_exactly(file, HEADER.size))
+
+    if magic != MAGIC:
+        raise ValueError("Not a save file.")
+    if version != VERSION:
+        raise ValueError(f"Unsupported save file version {version}.")
+
+    # untimed games used to count down below zero, they're still untimed
+    time_left = max(time_left, 0)
+
+    size = height * width
+    mines = []
+
+    # the game is only built once the file was read, its size may be corrupted too
+    if status & STARTED:
+        for first in range(0, size, BLOCK_CELLS):
+            count = min(BLOCK_CELLS, size - first)
+            cells = _unpack_bits(_read_exactly(file, (count + 7) // 8), count)
+
+            cell = cells.find(b"1")
+            while cell != -1:
+                mines.append(first + cell)
+                cell = cells.find(b"1", cell + 1)
+
+    board = bytearray()
+
+    while True:
+        (block_size,) = BLOCK_SIZE.unpack(_read_exactly(file, BLOCK_SIZE.size))
+        if block_size == 0:
+            break
+        if block_size > MAX_BLOCK_SIZE:
+            raise ValueError("Corrupted save file.")
+
+        block = _read_exactly(file, block_size)
+        position = 0
+        end = min(size, len(board) + BLOCK_CELLS)
+
+        while position < len(block):
+            value = block[position:position + 1]
+            length, position = _read_varint(block, position + 1)
+
+            # the runs mustn't overflow their block, nor the board
+            if len(board) + length > end:
+                raise ValueError("Corrupted save file.")
+
+            board += value * length
+
+    # all the cells must be there, with valid values (deleting the valid values leaves nothing)
+    if len(board) != size or board.translate(None, CELL_VALUES):
+        raise ValueError("Corrupted save file.")
+
+    state = GameState(size=(height, width), max_bombs=max_bombs, time=time_left, listener=listener, seed=seed)
+    state.flags = flags
+    state.unrevealed_zones = unrevealed_zones
+    state.move_count = move_count
+    state.init = bool(status & STARTED)
+    state.game_over = bool(status & OVER)
+    if state.init:
+        state.zones = count_neighbors(height, width, mines, BoardCell.BOMB.value)
+    state.board = Grid(height, width, data=array("b", board))
+
+    return state
+
+
+def save_file(state: GameState, path=DEFAULT_PATH):
+    """Save a game to a path, creating its directory if needed.
+
+    The file is written next to its destination first, so an interrupted save doesn't corrupt the previous one.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as file:
+        save(state, file)
+    os.replace(temporary, path)
+
+
+def load_file(path=DEFAULT_PATH, listener: Optional[Callable[[GameEvent, GameState], None]] = None) -> GameState:
+    """Load a game from a path.
+
+    :raises OSError: If the file can't be read.
+    :raises ValueError: If the file isn't a valid save file.
+    """
+    with open(path, "rb") as file:
+        return load(file, listener)
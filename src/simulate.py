@@ -0,0 +1,435 @@
+"""Play many games headlessly, to measure the win rate of a strategy (or of a board generator).
+
+The games are spread over a process pool, in chunks of consecutive seeds; every chunk is played by a worker which only
+sends back the aggregated statistics of its games, so a run of millions of games uses the same memory as a run of
+one. Game `i` of a run is fully determined by its seed (`--seed` plus `i`): its layout and the random choices of the
+strategy don't depend on the number of workers.
+
+A strategy picks the cells to reveal. The built-in ones are:
+    - random: Reveal random unknown cells.
+    - solver: Reveal the cells proven safe by the deterministic solver, guess at random when there are none.
+    - probability: Like solver, but guess the cell with the lowest mine probability.
+Any other strategy can be given as `module:Class`, with the same interface as `Strategy`.
+
+Usage:
+    python3 src/simulate.py [--games N] [--size HxW] [--mines M] [--seed S] [--strategy NAME] [--no-guess]
+    [--workers N] [--chunk N] [--interval SECONDS] [--json]
+
+Classes:
+    - Strategy: Base class of the strategies.
+    - RandomStrategy: Reveal random unknown cells.
+    - SolverStrategy: Reveal the cells proven safe, guess at random otherwise.
+    - ProbabilityStrategy: Reveal the cells proven safe, guess the safest cell otherwise.
+    - Stats: Aggregated statistics of a set of games.
+
+Functions:
+    - play: Play a game with a strategy.
+    - play_chunk: Play the games of a range of seeds.
+    - run: Play a range of seeds in a process pool, streaming the aggregated statistics.
+"""
+
+import argparse
+import importlib
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterator, Optional
+
+from noguess import place_mines_no_guess
+from placement import place_mines
+from probability import mine_probabilities
+from solver import Solver
+from state import BoardCell, GameState
+from workers import START_METHOD, worker_count
+
+
+class Strategy:
+    """Base class of the strategies.
+
+    A strategy is built for a game which hasn't started yet, then asked for the cell to reveal until the game is
+    over, and told about the cells changed by every move.
+
+    Instance variables:
+        - state: The game being played.
+        - rng: The random number generator of the strategy.
+
+    Methods:
+        - __init__: Construct a strategy for a game.
+        - next_move: Get the cell to reveal next.
+        - update: Update the strategy after a move.
+        - random_unknown: Get a random unrevealed cell.
+    """
+
+    def __init__(self, state: GameState, rng: random.Random):
+        """Initialize the strategy.
+
+        :param state: The game to play (not started yet).
+        :param rng: The random number generator of the strategy.
+        """
+        self.state = state
+        self.rng = rng
+
+    def next_move(self) -> tuple[int, int]:
+        """Get the `(lin, col)` coordinates of the cell to reveal next."""
+        raise NotImplementedError()
+
+    def update(self, changes: list[tuple[int, int]]):
+        """Update the strategy after a move.
+
+        :param changes: The cells changed by the move, as `(lin, col)` pairs.
+        """
+
+    def random_unknown(self, excluded: frozenset[int] = frozenset()) -> tuple[int, int]:
+        """Get a random unrevealed cell, which isn't in `excluded` (given by row-major indices).
+
+        Random cells are tried first, the board is only scanned when most of it is revealed.
+        """
+        board, width = self.state.board.data, self.state.width
+        unselected = BoardCell.UNSELECTED.value
+
+        for _ in range(16):
+            cell = self.rng.randrange(len(board))
+            if board[cell] == unselected and cell not in excluded:
+                return divmod(cell, width)
+
+        cells = [cell for cell, value in enumerate(board) if value == unselected and cell not in excluded]
+        if not cells:
+            # only excluded cells are left
+            cells = [cell for cell, value in enumerate(board) if value == unselected]
+
+        return divmod(self.rng.choice(cells), width)
+
+
+class RandomStrategy(Strategy):
+    """Reveal random unknown cells."""
+
+    def next_move(self) -> tuple[int, int]:
+        """Get a random unrevealed cell."""
+        return self.random_unknown()
+
+
+class SolverStrategy(Strategy):
+    """Reveal the cells proven safe by the deterministic solver, and guess a random cell (which isn't proven to be a
+    mine) when there are none.
+
+    The first click is in the middle of the board.
+    """
+
+    def __init__(self, state: GameState, rng: random.Random):
+        """Initialize the strategy, with a solver for the game."""
+        super().__init__(state, rng)
+        self.solver = Solver(state)
+
+    def next_move(self) -> tuple[int, int]:
+        """Get a cell proven safe, or a guess."""
+        if not self.state.init:
+            return self.state.height // 2, self.state.width // 2
+
+        hint = self.solver.hint()
+        return hint if hint is not None else self.guess()
+
+    def guess(self) -> tuple[int, int]:
+        """Get the cell to reveal when none is proven safe."""
+        return self.random_unknown(frozenset(self.solver.mines))
+
+    def update(self, changes: list[tuple[int, int]]):
+        """Update the solver after a move."""
+        self.solver.update(changes)
+
+
+class ProbabilityStrategy(SolverStrategy):
+    """Reveal the cells proven safe by the deterministic solver, and guess the cell with the lowest mine probability
+    when there are none."""
+
+    def guess(self) -> tuple[int, int]:
+        """Get the unrevealed cell with the lowest mine probability (the first one, in row-major order, on ties)."""
+        probabilities = mine_probabilities(self.state, parallel=False)
+        board, width = self.state.board.data, self.state.width
+        unselected = BoardCell.UNSELECTED.value
+
+        # the interior cells are all alike, the first one stands for all of them
+        candidates = [cell for cell in probabilities.frontier if board[cell] == unselected]
+        interior = next(
+            (cell for cell, value in enumerate(board) if value == unselected and cell not in probabilities.frontier),
+            None,
+        )
+        if interior is not None:
+            candidates.append(interior)
+
+        return divmod(min(candidates, key=lambda cell: (probabilities.get(cell), cell)), width)
+
+
+STRATEGIES: dict[str, type[Strategy]] = {
+    "random": RandomStrategy,
+    "solver": SolverStrategy,
+    "probability": ProbabilityStrategy,
+}
+
+
+def get_strategy(name: str) -> type[Strategy]:
+    """Get a strategy by its name, or by its `module:Class` path.
+
+    :raises ValueError: If there is no such strategy.
+    """
+    if name in STRATEGIES:
+        return STRATEGIES[name]
+
+    module, _, attribute = name.partition(":")
+    try:
+        return getattr(importlib.import_module(module), attribute)
+    except (ImportError, AttributeError, ValueError):
+        raise ValueError(f"Unknown strategy `{name}`.")
+
+
+class Stats:
+    """Aggregated statistics of a set of games.
+
+    Only sums are kept, so merging the statistics of two sets of games is cheap and exact.
+
+    Instance variables:
+        - games: The number of games.
+        - wins: The number of games won.
+        - clicks: The total number of cells revealed by the strategy (including the first click).
+        - seconds: The total time spent playing, including the generation of the boards.
+        - min_seconds: The time of the fastest game.
+        - max_seconds: The time of the slowest game.
+
+    Methods:
+        - __init__: Construct empty statistics.
+        - add: Add a game.
+        - merge: Add the games of other statistics.
+        - summary: Get the aggregated results.
+    """
+
+    def __init__(self):
+        """Initialize empty statistics."""
+        self.games = 0
+        self.wins = 0
+        self.clicks = 0
+        self.seconds = 0.0
+        self.min_seconds = math.inf
+        self.max_seconds = 0.0
+
+    def add(self, won: bool, clicks: int, seconds: float):
+        """Add a game to the statistics."""
+        self.games += 1
+        self.wins += won
+        self.clicks += clicks
+        self.seconds += seconds
+        self.min_seconds = min(self.min_seconds, seconds)
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def merge(self, other: "Stats"):
+        """Add the games of other statistics to these ones."""
+        self.games += other.games
+        self.wins += other.wins
+        self.clicks += other.clicks
+        self.seconds += other.seconds
+        self.min_seconds = min(self.min_seconds, other.min_seconds)
+        self.max_seconds = max(self.max_seconds, other.max_seconds)
+
+    def summary(self) -> dict:
+        """Get the aggregated results: the win rate (with its 95% confidence margin), the average number of clicks and
+        the average time of a game."""
+        games = max(self.games, 1)
+        win_rate = self.wins / games
+
+        return {
+            "games": self.games,
+            "wins": self.wins,
+            "win_rate": win_rate,
+            "win_rate_margin": 1.96 * math.sqrt(win_rate * (1 - win_rate) / games),
+            "clicks": self.clicks / games,
+            "ms_per_game": 1000 * self.seconds / games,
+            "min_ms": 1000 * self.min_seconds if self.games else 0.0,
+            "max_ms": 1000 * self.max_seconds,
+        }
+
+
+def play(state: GameState, strategy: Strategy) -> int:
+    """Play a game with a strategy, until it's over.
+
+    :return: The number of cells revealed by the strategy.
+    """
+    clicks = 0
+
+    while not state.is_over():
+        state.reveal_zone(*strategy.next_move())
+        strategy.update(state.changes)
+        clicks += 1
+
+    return clicks
+
+
+def play_chunk(size: tuple[int, int], mines, seeds: range, strategy: str, no_guess=False) -> Stats:
+    """Play the games of a range of seeds.
+
+    This is the task run by the workers of the process pool.
+
+    :param size: The size of the boards.
+    :param mines: The number of mines.
+    :param seeds: The seeds of the games.
+    :param strategy: The name of the strategy (see `get_strategy`).
+    :param no_guess: Whether the boards are generated so that they can be solved without guessing (default False).
+    :return: The aggregated statistics of the games.
+    """
+    strategy_class = get_strategy(strategy)
+    mine_placer = partial(place_mines_no_guess, parallel=False) if no_guess else place_mines
+    stats = Stats()
+
+    for seed in seeds:
+        start = time.perf_counter()
+
+        # the games don't need the undo history
+        state = GameState(
+            size=size, max_bombs=mines, rng=random.Random(seed), history_limit=0, mine_placer=mine_placer
+        )
+        clicks = play(state, strategy_class(state, random.Random(f"strategy-{seed}")))
+
+        stats.add(state.is_win(), clicks, time.perf_counter() - start)
+
+    return stats
+
+
+def run(
+        size: tuple[int, int],
+        mines,
+        seeds: range,
+        strategy: str,
+        no_guess=False,
+        workers: Optional[int] = None,
+        chunk=100,
+        on_progress: Optional[Callable[[Stats], None]] = None,
+        interval=1.0,
+) -> Stats:
+    """Play the games of a range of seeds in a process pool.
+
+    Only a few chunks per worker are in flight at any time, and their statistics are merged as they complete.
+
+    :param size: The size of the boards.
+    :param mines: The number of mines.
+    :param seeds: The seeds of the games.
+    :param strategy: The name of the strategy (see `get_strategy`).
+    :param no_guess: Whether the boards are generated so that they can be solved without guessing (default False).
+    :param workers: The number of worker processes (default is one per core). If it is 0, the games are played in
+    this process.
+    :param chunk: The number of games of a task (default 100).
+    :param on_progress: Called with the statistics so far, at most every `interval` seconds (default None).
+    :param interval: The minimum time between two progress reports, in seconds (default 1).
+    :return: The statistics of all the games.
+    """
+    get_strategy(strategy)  # fail early on unknown strategies
+
+    chunks: Iterator[range] = (seeds[first:first + chunk] for first in range(0, len(seeds), chunk))
+    stats = Stats()
+    last_report = time.perf_counter()
+
+    def merge(chunk_stats: Stats):
+        nonlocal last_report
+
+        stats.merge(chunk_stats)
+        if on_progress is not None and time.perf_counter() - last_report >= interval:
+            on_progress(stats)
+            last_report = time.perf_counter()
+
+    if workers == 0:
+        for chunk_seeds in chunks:
+            merge(play_chunk(size, mines, chunk_seeds, strategy, no_guess))
+        return stats
+
+    workers = workers if workers is not None else worker_count()
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(START_METHOD)) as executor:
+        pending = deque()
+
+        def submit():
+            chunk_seeds = next(chunks, None)
+            if chunk_seeds is not None:
+                pending.append(executor.submit(play_chunk, size, mines, chunk_seeds, strategy, no_guess))
+
+        for _ in range(2 * workers):
+            submit()
+
+        while pending:
+            merge(pending.popleft().result())
+            submit()
+
+    return stats
+
+
+def parse_size(text: str) -> tuple[int, int]:
+    """Parse a board size given as `HxW`."""
+    try:
+        height, width = (int(value) for value in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Invalid size `{text}`, expected `HxW`.")
+
+    return height, width
+
+
+def format_summary(summary: dict) -> str:
+    """Format aggregated results on a single line."""
+    return (
+        f"{summary['games']} games, win rate {100 * summary['win_rate']:.2f}% "
+        f"(+/- {100 * summary['win_rate_margin']:.2f}%), {summary['clicks']:.1f} clicks/game, "
+        f"{summary['ms_per_game']:.2f} ms/game (min {summary['min_ms']:.2f}, max {summary['max_ms']:.2f})"
+    )
+
+
+def main():
+    """Parse the command line arguments and run the simulation."""
+    parser = argparse.ArgumentParser(description="Play many games headlessly, to measure the win rate of a strategy.")
+    parser.add_argument("--games", type=int, default=1000, help="number of games (default 1000)")
+    parser.add_argument("--size", type=parse_size, default=(16, 30), help="board size, as HxW (default 16x30)")
+    parser.add_argument("--mines", type=int, default=99, help="number of mines (default 99)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game (default 0)")
+    parser.add_argument(
+        "--strategy", default="solver", help=f"{', '.join(STRATEGIES)} or module:Class (default solver)"
+    )
+    parser.add_argument("--no-guess", action="store_true", help="generate boards which can be solved without guessing")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, 0 to play in this process")
+    parser.add_argument("--chunk", type=int, default=100, help="games per task (default 100)")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between progress reports (default 1)")
+    parser.add_argument("--json", action="store_true", help="print the final results as JSON")
+    args = parser.parse_args()
+
+    try:
+        get_strategy(args.strategy)
+    except ValueError as error:
+        parser.error(str(error))
+
+    start = time.perf_counter()
+
+    def on_progress(stats: Stats):
+        elapsed = time.perf_counter() - start
+        print(f"[{elapsed:.0f}s] {format_summary(stats.summary())}", file=sys.stderr, flush=True)
+
+    stats = run(
+        args.size,
+        args.mines,
+        range(args.seed, args.seed + args.games),
+        args.strategy,
+        no_guess=args.no_guess,
+        workers=args.workers,
+        chunk=args.chunk,
+        on_progress=on_progress,
+        interval=args.interval,
+    )
+
+    summary = stats.summary()
+    summary["seconds"] = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print(f"{format_summary(summary)}, {summary['games'] / summary['seconds']:.0f} games/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+"""Deterministic solver working on the board the player sees.
+
+It finds the cells which are provably safe and the cells which are certainly mines, using two rules on the revealed
+numbers (the constraints):
+- single-point: if a number already sees all its mines, its other unknown neighbors are safe; if it has as many
+unknown neighbors as missing mines, they are all mines.
+- subset: if the unknown neighbors of a number A are a subset of those of a number B, the cells only seen by B hold
+exactly `B - A` of the missing mines, so they are all safe or all mines when that count is 0 or their number.
+
+The solver is incremental: after a move, only the constraints around the changed cells (and, transitively, around the
+newly deduced cells) are re-examined, so the cost of a move depends on the frontier it touches, not on the board size.
+The flags of the player are not trusted, flagged cells are unknown cells for the solver. They may still be proven safe,
+but they're never revealed (revealing a flagged cell does nothing), the player has to remove their flag first.
+
+Classes:
+    - Solver: Incremental deterministic solver.
+"""
+
+from typing import Iterable, Optional
+
+from state import BoardCell, GameState, Move
+
+
+class Solver:
+    """Incremental deterministic solver.
+
+    Instance variables:
+        - state: The game state being solved (read only, except for `step`).
+        - safe: The unrevealed cells which are provably safe, as row-major indices.
+        - mines: The cells which are certainly mines, as row-major indices.
+
+    Methods:
+        - __init__: Construct a solver for a state, deducing everything the board allows.
+        - update: Update the deductions after a move.
+        - revealable: Get the provably safe cells which can be revealed.
+        - hint: Get a provably safe cell.
+        - step: Reveal all the provably safe cells (auto-play).
+    """
+
+    def __init__(self, state: GameState):
+        """Initialize the solver, deducing everything the current board allows.
+
+        :param state: The game state to solve.
+        """
+        self.state = state
+        self.height, self.width = state.size
+        # row-major offsets of the neighbors of a cell which isn't on the edges
+        self.__offsets = [lin * self.width + col for lin in (-1, 0, 1) for col in (-1, 0, 1) if lin or col]
+
+        self.safe: set[int] = set()
+        self.mines: set[int] = set()
+
+        # constraints to re-examine
+        self.__dirty: set[int] = {cell for cell, value in enumerate(state.board.data) if self.__is_number(value)}
+        self.__propagate()
+
+    @staticmethod
+    def __is_number(value):
+        """Check if a cell value is a revealed number (a constraint)."""
+        return 0 <= value <= 8
+
+    def __neighbors(self, cell):
+        """Get the cells around `cell`."""
+        lin, col = divmod(cell, self.width)
+
+        if 0 < lin < self.height - 1 and 0 < col < self.width - 1:
+            return [cell + offset for offset in self.__offsets]
+
+        return [
+            next_lin * self.width + next_col
+            for next_lin in range(max(0, lin - 1), min(self.height, lin + 2))
+            for next_col in range(max(0, col - 1), min(self.width, col + 2))
+            if next_lin != lin or next_col != col
+        ]
+
+    def __constraint(self, cell) -> tuple[frozenset[int], int]:
+        """Get the unknown neighbors of a number and how many mines they hold.
+
+        Unknown cells are the unrevealed cells which are neither proven safe nor proven mines.
+        """
+        board = self.state.board.data
+        unknown = []
+        mines = board[cell]
+
+        for neighbor in self.__neighbors(cell):
+            if neighbor in self.mines:
+                mines -= 1
+            elif not 0 <= board[neighbor] <= 8 and neighbor not in self.safe:
+                unknown.append(neighbor)
+
+        return frozenset(unknown), mines
+
+    def __mark(self, cells: Iterable[int], mine):
+        """Record deduced cells and mark the constraints around them for re-examination."""
+        board = self.state.board.data
+
+        for cell in cells:
+            (self.mines if mine else self.safe).add(cell)
+
+            for neighbor in self.__neighbors(cell):
+                if self.__is_number(board[neighbor]):
+                    self.__dirty.add(neighbor)
+
+    def __propagate(self):
+        """Apply the rules to the dirty constraints until there's nothing left to deduce."""
+        board = self.state.board.data
+
+        while self.__dirty:
+            cell = self.__dirty.pop()
+            unknown, mines = self.__constraint(cell)
+
+            if not unknown:
+                continue
+
+            # single-point rule
+            if mines == 0:
+                self.__mark(unknown, mine=False)
+                continue
+            if mines == len(unknown):
+                self.__mark(unknown, mine=True)
+                continue
+
+            # subset rule, against the numbers sharing unknown cells with this one (they're all around these cells), in
+            # both directions: a change to this number may make it the subset or the superset of another one
+            others = {
+                other
+                for unknown_cell in unknown
+                for other in self.__neighbors(unknown_cell)
+                if other != cell and 0 <= board[other] <= 8
+            }
+
+            for other in others:
+                other_unknown, other_mines = self.__constraint(other)
+
+                if unknown < other_unknown:
+                    rest, rest_mines = other_unknown - unknown, other_mines - mines
+                elif other_unknown and other_unknown < unknown:
+                    rest, rest_mines = unknown - other_unknown, mines - other_mines
+                else:
+                    continue
+
+                if rest_mines == 0:
+                    self.__mark(rest, mine=False)
+                elif rest_mines == len(rest):
+                    self.__mark(rest, mine=True)
+                else:
+                    continue
+
+                # the deductions may have changed this constraint, re-examine it later
+                self.__dirty.add(cell)
+                break
+
+    def update(self, changes: Iterable[tuple[int, int]]):
+        """Update the deductions after a move.
+
+        :param changes: The cells changed by the move, as `(lin, col)` pairs (i.e. `GameState.changes`).
+        """
+        board = self.state.board.data
+        height, width = self.height, self.width
+        offsets, dirty, safe = self.__offsets, self.__dirty, self.safe
+        changed = {lin * width + col for lin, col in changes}
+
+        # large reveals change up to the whole board, so this loop avoids the method calls, and only keeps the
+        # constraints which can still deduce something
+        for cell in changed:
+            if not 0 <= board[cell] <= 8:
+                continue
+
+            # the cell was revealed: it's a new constraint, and its neighbors have one less unknown cell
+            safe.discard(cell)
+
+            lin, col = divmod(cell, width)
+            if 0 < lin < height - 1 and 0 < col < width - 1:
+                neighbors = [cell + offset for offset in offsets]
+            else:
+                neighbors = self.__neighbors(cell)
+
+            for neighbor in neighbors:
+                if not 0 <= board[neighbor] <= 8:
+                    # the new constraint has unknown cells
+                    dirty.add(cell)
+                elif neighbor not in changed:
+                    # the new constraints are examined on their own
+                    dirty.add(neighbor)
+
+        self.__propagate()
+
+    def revealable(self) -> list[int]:
+        """Get the provably safe cells which can be revealed (they aren't flagged), as sorted row-major indices."""
+        board = self.state.board.data
+        return sorted(cell for cell in self.safe if board[cell] == BoardCell.UNSELECTED.value)
+
+    def hint(self) -> Optional[tuple[int, int]]:
+        """Get a provably safe cell which can be revealed, as `(lin, col)`, or None if there's none."""
+        board = self.state.board.data
+        cell = min((cell for cell in self.safe if board[cell] == BoardCell.UNSELECTED.value), default=None)
+        return None if cell is None else divmod(cell, self.width)
+
+    def step(self) -> list[tuple[int, int]]:
+        """Reveal all the provably safe cells which can be revealed (auto-play), as a single batch of moves.
+
+        The cells deduced from the revealed ones are left for the next step.
+
+        :return: The cells changed by the reveals, as `(lin, col)` pairs.
+        """
+        self.state.apply_moves((Move.REVEAL, *divmod(cell, self.width)) for cell in self.revealable())
+        self.update(self.state.changes)
+
+        return self.state.changes
@@ -1,18 +1,25 @@
 """Describes the state of the game.
 
+The game rules are implemented in pure Python, so they can run without a display or an event queue. Anything that
+happens during a move and is of interest to the outside world (the game starting, ending, flags being placed) is
+reported through an optional listener callback.
+
 Classes:
     - BoardCell: Enum for the Minesweeper board cell types.
+    - GameEvent: Enum for the notifications emitted by the game state.
+    - Move: Enum for the player moves.
     - GameState: Describes the game state.
 """
 
 import random
 from copy import deepcopy
 from enum import Enum
+from typing import Callable, Iterable, Optional
 
-import pygame
-
-from constants import (BOARD_FLAG_PLACED, BOARD_FLAG_REMOVED, GAME_OVER,
-                       TIMER_TICK)
+from grid import Grid
+from history import Diff, History
+from neighbors import count_neighbors
+from placement import place_mines
 
 
 class BoardCell(Enum):
@@ -24,6 +31,23 @@ class BoardCell(Enum):
     FLAGGED = -2
 
 
+class GameEvent(Enum):
+    """Enum for the notifications emitted by the game state to its listener."""
+
+    GAME_STARTED = 1
+    GAME_OVER = 2
+    FLAG_PLACED = 3
+    FLAG_REMOVED = 4
+
+
+class Move(Enum):
+    """Enum for the player moves, as given to `GameState.apply_moves`."""
+
+    REVEAL = 1
+    FLAG = 2
+    CHORD = 3
+
+
 class GameState:
     """Describes the game state.
 
@@ -33,8 +57,8 @@ class GameState:
         - max_bombs: The maximum number of bombs to place on the board (default 64).
         - flags: How many flags the player has left to use.
         - time_left: How much time the player has left to solve the puzzle.
-        - zones: Board with all cells unrevealed, contains all bombs and values.
-        - board: Board the player sees. Possible values:
+        - zones: Grid with all cells unrevealed, contains all bombs and values.
+        - board: Grid the player sees. Possible values:
             - `BoardCell.UNSELECTED.value` indicating that the player doesn't know yet the value of this cell
             - `BoardCell.FLAGGED.value` indicating that the player flagged this cell
             - `BoardCell.BOMB.value` indicating that the cell is a bomb
@@ -44,25 +68,83 @@ class GameState:
         - init: Whether the player has started the game. The board is not generated until this flag is set to `True`.
         - unrevealed_zones: The number of unrevealed zones left. If this number equals `width * height - max_bombs`,
         the game is over.
+        - changes: The cells of `board` changed by the last move, as `(lin, col)` pairs. They may be cleared once used,
+        a large flood fill changes up to the whole board.
+        - listener: Optional callback `listener(event, state)` notified of every `GameEvent`.
+        - seed: The seed of `rng` (unless a generator was given to the constructor).
+        - rng: The random number generator used to place the bombs.
+        - move_count: The number of player moves which changed the board.
+        - mine_placer: The function placing the bombs after the first click, with the signature of
+        `placement.place_mines` (e.g. `noguess.place_mines_no_guess` for boards which can be solved without guessing).
+        - history: The undo/redo history of the player moves.
+
+    The moves update the state in place, and record what they changed in `history`. Both boards are stored as compact
+    `Grid`s, a cell is accessed with `board[lin, col]`.
 
     Methods:
         - __init__: Constructor for an uninitialized game state.
         - reveal_zone: Reveal the value of a cell. This is a player move.
         - flag_zone: Flag a cell. This is a player move.
+        - chord_zone: Reveal the neighbors of a number whose bombs are all flagged. This is a player move.
+        - apply_moves: Apply a batch of player moves as a single move.
         - timer_ticked: Update state upon timer tick.
+        - undo: Undo the last player move.
+        - redo: Redo the last undone player move.
         - is_over: Whether the game is over.
         - is_win: Whether the game is won.
     """
     # offsets for neighbors
     __DL = [-1, -1, 0, 1, 1, 1, 0, -1]
     __DC = [0, 1, 1, 1, 0, -1, -1, -1]
-
-    def __init__(self, *, size: tuple[int, int] = (16, 16), max_bombs=64, time=0):
+    __OFFSETS = tuple(zip(__DL, __DC))
+
+    __slots__ = (
+        "height",
+        "width",
+        "size",
+        "max_bombs",
+        "flags",
+        "time_left",
+        "zones",
+        "board",
+        "game_over",
+        "init",
+        "unrevealed_zones",
+        "changes",
+        "listener",
+        "seed",
+        "rng",
+        "move_count",
+        "mine_placer",
+        "history",
+    )
+
+    def __init__(
+            self,
+            *,
+            size: tuple[int, int] = (16, 16),
+            max_bombs=64,
+            time=0,
+            listener: Optional[Callable[[GameEvent, "GameState"], None]] = None,
+            rng: Optional[random.Random] = None,
+            seed: Optional[int] = None,
+            history_limit=History.MAX_BYTES,
+            mine_placer: Callable[[int, int, int, tuple[int, int], random.Random], list[int]] = place_mines,
+    ):
         """Initialize game state.
 
         :param size: The size of the grid. Must be at least 4x4.
         :param max_bombs: The number of bombs to generate. Must be between 0 and `size - 9`.
         :param time: The time the player has to solve the game (if it is 0, then the timer is disabled).
+        :param listener: Callback notified of the events happening in the game (default None). It is shared by all
+        the states derived from this one.
+        :param rng: The random number generator used to place the bombs (default is a new, randomly seeded one).
+        It is shared by all the states derived from this one.
+        :param seed: The seed of the random number generator, when it isn't given (default is a random 64-bit one).
+        :param history_limit: The maximum memory used by the undo/redo history, in bytes (default 16 MiB).
+        :param mine_placer: The function placing the bombs after the first click (default `placement.place_mines`).
+        It is called as `mine_placer(height, width, max_bombs, (lin, col), rng)` and returns the row-major indices of
+        the bombs, none of which may be on or around `(lin, col)`.
 
         :raises ValueError: `size` is less than 4x4.
         :raises ValueError: `max_bombs` is not in `[0, size - 9]`.
@@ -80,7 +162,7 @@ class GameState:
         self.time_left = time
 
         # board with all bombs and all cells marked with their score
-        self.zones = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        self.zones = Grid(self.height, self.width)
 
         # the board of the player, each cell has one of the values:
         # - a positive value from 0 to 8 indicating the number of neighboring bombs
@@ -89,145 +171,326 @@ class GameState:
         # - BoardCell.FLAGGED.value indicating that the player flagged this cell
         #
         # initially, the board is set on all field with UNSELECTED
-        self.board = [[BoardCell.UNSELECTED.value for _ in range(self.width)] for _ in range(self.height)]
+        self.board = Grid(self.height, self.width, BoardCell.UNSELECTED.value)
 
         self.game_over = False
         self.init = False
         self.unrevealed_zones = self.width * self.height  # used for checking the win condition
+        self.changes = []  # the cells changed by the last move
+
+        self.listener = listener
+        self.seed = seed if seed is not None else random.getrandbits(64)
+        self.rng = rng if rng is not None else random.Random(self.seed)
+        self.move_count = 0
+        self.mine_placer = mine_placer
+        self.history = History(history_limit)
+
+    def __deepcopy__(self, memo):
+        """Copy the state, sharing the listener, the random number generator and the mine placer instead of copying
+        them."""
+        new_state = self.__class__.__new__(self.__class__)
+        memo[id(self)] = new_state
+
+        for key in GameState.__slots__:
+            value = getattr(self, key)
+            setattr(new_state, key, value if key in ("listener", "rng", "mine_placer") else deepcopy(value, memo))
+
+        return new_state
+
+    def __notify(self, event: GameEvent):
+        """Notify the listener (if any) of an event."""
+        if self.listener is not None:
+            self.listener(event, self)
 
     def __within_bounds(self, lin, col):
         """Check whether the given coordinates are within the bounds of the board."""
         return 0 <= lin < self.height and 0 <= col < self.width
 
-    def __around_cell(self, cell_lin, cell_col, lin, col):
-        """Check if `(lin, col)` is a point around or precisely `(cell_lin, cell_col)`."""
-        return (cell_lin == lin and cell_col == col) or any(
-            (cell_lin == lin + dl) and (cell_col == col + dc)
-            for dl, dc in zip(GameState.__DL, GameState.__DC)
-            if self.__within_bounds(lin + dl, col + dc)
-        )
-
     def __start_game(self, lin, col):
         """Initialize the game.
 
         This generates the board for the game after the first click has happened. The `(lin, col)` argument specifies
         the coordinates of the click.
-        It also starts the counter if `time_left` is non-zero.
+        It also notifies the listener that the game has started, so that it can start the countdown.
         """
-        bombs = self.max_bombs
-
         # generate the board such that no bomb is placed on (lin, col) or around it
-        while bombs > 0:
-            # randomly pick a place to place a bomb
-            mine_col, mine_lin = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-
-            # find a cell that is not a bomb and is not on around start
-            # while (self.zones[mine_lin][mine_col] == BoardCell.BOMB.value) or self.__around_cell(
-            #     lin, col, mine_lin, mine_col
-            # ):
-            while (self.zones[mine_lin][mine_col] == BoardCell.BOMB.value) or self.__around_cell(
-                    lin, col, mine_lin, mine_col
-            ):
-                mine_col, mine_lin = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-
-            self.zones[mine_lin][mine_col] = BoardCell.BOMB.value
-
-            bombs -= 1
+        mines = self.mine_placer(self.height, self.width, self.max_bombs, (lin, col), self.rng)
 
         # complete the board with numbers
-        for lin in range(self.height):
-            for col in range(self.width):
-                # skip bombs
-                if self.zones[lin][col] == BoardCell.BOMB.value:
-                    continue
-
-                # check neighbors of current cell and sum the bombs around it
-                self.zones[lin][col] = sum(
-                    self.__within_bounds(lin + off_lin, col + off_col)
-                    and self.zones[lin + off_lin][col + off_col] == BoardCell.BOMB.value
-                    for off_lin, off_col in zip(GameState.__DL, GameState.__DC)
-                )
-
-        # set a timer for the game
-        # the timer will emit GAME_TIMER_TICK event once every 1s `time` times
-        pygame.time.set_timer(TIMER_TICK, 1000, self.time_left)
+        self.zones = count_neighbors(self.height, self.width, mines, BoardCell.BOMB.value)
 
         # mark game as started
         self.init = True
 
+        self.__notify(GameEvent.GAME_STARTED)
+
     def __end_game(self):
         """Stop the current game.
 
         This actions does the following:
         - Set `game_over` to `True`.
-        - Stop the timer (if it exists).
-        - Signal the pygame event loop that the game is over.
+        - Notify the listener that the game is over.
         """
         self.game_over = True
-        pygame.time.set_timer(TIMER_TICK, 0)
-        pygame.event.post(pygame.event.Event(GAME_OVER))
+        self.__notify(GameEvent.GAME_OVER)
 
-    def __reveal_zone(self, lin, col):
-        """Recursively reveal the current zone until a non-zero value is met."""
-        # if the cell is already revealed or flagged, stop
-        if self.board[lin][col] != BoardCell.UNSELECTED.value or self.board[lin][col] == BoardCell.FLAGGED.value:
+    def __snapshot(self):
+        """Get the counters of the state which are changed by the player moves."""
+        return self.flags, self.unrevealed_zones, self.game_over, self.move_count
+
+    def __recording(self):
+        """Check whether the moves are recorded in the history, otherwise the old values of the cells aren't needed."""
+        return self.history.max_bytes > 0
+
+    def __record(self, before, old_values):
+        """Record the last move in the history, given the counters and the values of `changes` before it."""
+        if not self.__recording():
             return
 
+        self.history.push(
+            Diff(
+                (lin * self.width + col for lin, col in self.changes),
+                old_values,
+                (self.board[lin, col] for lin, col in self.changes),
+                before,
+                self.__snapshot(),
+            )
+        )
+
+    def __apply(self, diff: Diff, values, counters):
+        """Set the cells of a diff to the given values and the counters of the state to the given ones."""
+        self.changes = []
+
+        for cell, value in zip(diff.cells, values):
+            self.board.data[cell] = value
+            self.changes.append(divmod(cell, self.width))
+
+        self.flags, self.unrevealed_zones, self.game_over, self.move_count = counters
+
+    def __reveal_zone(self, lin, col) -> tuple[list[tuple[int, int]], list[int]]:
+        """Reveal the current zone and, if it is a zero, flood fill its region until non-zero values are met.
+
+        The region is explored with an explicit stack, so its size isn't limited by the recursion limit.
+
+        :return: The cells whose value changed, as `(lin, col)` pairs, and their values before being revealed (empty if
+        the history is disabled).
+        """
+        board, zones = self.board.data, self.zones.data
+        height, width = self.height, self.width
+        unselected = BoardCell.UNSELECTED.value
+        cell = lin * width + col
+
+        # if the cell is already revealed or flagged, stop
+        if board[cell] != unselected:
+            return [], []
+
         # if the cell is a bomb, game over
-        if self.zones[lin][col] == BoardCell.BOMB.value:
+        if zones[cell] == BoardCell.BOMB.value:
             self.__end_game()
-            self.__reveal_bombs()
+            changes, old_values = self.__reveal_bombs()
             # assign a special type to this bomb so that the player knows which bomb caused the loss
-            self.board[lin][col] = BoardCell.BOMB_REVEALED.value
-            return
+            board[cell] = BoardCell.BOMB_REVEALED.value
+            return changes, old_values
 
         # reveal zone
-        self.board[lin][col] = self.zones[lin][col]
-        self.unrevealed_zones -= 1
-
-        # if the cell is zero, continue exploring
-        if self.board[lin][col] == 0:
-            for dl, dc in zip(GameState.__DL, GameState.__DC):
-                if self.__within_bounds(lin + dl, col + dc):
-                    self.__reveal_zone(lin + dl, col + dc)
-
-    def __reveal_bombs(self):
-        """Reveal the bombs locations to the player."""
-        for i in range(self.height):
-            for j in range(self.width):
-                if self.zones[i][j] == BoardCell.BOMB.value:
-                    self.board[i][j] = self.zones[i][j]
+        board[cell] = zones[cell]
+        changes = [cell]
 
-    def reveal_zone(self, lin, col) -> "GameState":
-        """Reveal the value of the selected zone.
+        # zeros left to explore, their neighbors are never bombs
+        stack = [cell] if board[cell] == 0 else []
+        size = height * width
 
-        If the game has not been started yet, this method calls `__start_game` which initializes the board and starts
-        the timer countdown.
+        while stack:
+            cell = stack.pop()
 
-        If the game is over or the given position is invalid, the move is ignored.
+            # the neighbors on the same line, the line above and the line below, which are within the board
+            col = cell % width
+            first, last = (-1 if col > 0 else 0), (2 if col < width - 1 else 1)
 
-        :param lin: The line of the zone to reveal.
-        :param col: The column of the zone to reveal.
-        :return: The new state of the game upon executing the move.
+            for line_start in (cell - width, cell, cell + width):
+                if not (0 <= line_start < size):
+                    continue
+
+                for neighbor in range(line_start + first, line_start + last):
+                    # skip cells already revealed or flagged
+                    if board[neighbor] != unselected:
+                        continue
+
+                    board[neighbor] = zones[neighbor]
+                    changes.append(neighbor)
+
+                    # if the cell is zero, continue exploring
+                    if board[neighbor] == 0:
+                        stack.append(neighbor)
+
+        self.unrevealed_zones -= len(changes)
+        changes = [divmod(cell, width) for cell in changes]
+
+        return changes, [unselected] * len(changes) if self.__recording() else []
+
+    def __reveal_bombs(self) -> tuple[list[tuple[int, int]], list[int]]:
+        """Reveal the bombs locations to the player.
+
+        :return: The cells of the bombs, as `(lin, col)` pairs, and their values before being revealed (empty if the
+        history is disabled).
+        """
+        board, zones = self.board.data, self.zones.data
+        changes, old_values = [], []
+        recording = self.__recording()
+
+        for cell, value in enumerate(zones):
+            if value == BoardCell.BOMB.value:
+                changes.append(divmod(cell, self.width))
+                if recording:
+                    old_values.append(board[cell])
+                board[cell] = value
+
+        return changes, old_values
+
+    def __flag_zone(self, lin, col) -> tuple[list[tuple[int, int]], list[int]]:
+        """Flag/un-flag the zone, if it's unrevealed (and if there are flags left, to flag it).
+
+        :return: The cells whose value changed, as `(lin, col)` pairs, and their values before the move.
+        """
+        old_value = self.board[lin, col]
+
+        if old_value == BoardCell.UNSELECTED.value:
+            # if the cell is unselected, flag it and flags left
+            if self.flags > 0:
+                self.board[lin, col] = BoardCell.FLAGGED.value
+                self.flags -= 1
+                self.__notify(GameEvent.FLAG_PLACED)
+                return [(lin, col)], [old_value]
+        elif old_value == BoardCell.FLAGGED.value:
+            # if the cell is flagged, un-flag it
+            self.board[lin, col] = BoardCell.UNSELECTED.value
+            self.flags += 1
+            self.__notify(GameEvent.FLAG_REMOVED)
+            return [(lin, col)], [old_value]
+
+        # if the cell was neither of the above, just ignore the move
+        return [], []
+
+    def __chord(self, lin, col) -> tuple[list[tuple[int, int]], list[int]]:
+        """Reveal the unflagged neighbors of a revealed number, if it has as many flags around it as its value.
+
+        A wrong flag makes it reveal a bomb, which ends the game.
+
+        :return: The cells whose value changed, as `(lin, col)` pairs, and their values before the move.
+        """
+        value = self.board[lin, col]
+
+        if not 1 <= value <= 8:
+            return [], []
+
+        neighbors = [
+            (lin + dl, col + dc) for dl, dc in GameState.__OFFSETS if self.__within_bounds(lin + dl, col + dc)
+        ]
+
+        if sum(self.board[cell] == BoardCell.FLAGGED.value for cell in neighbors) != value:
+            return [], []
+
+        changes, old_values = [], []
+
+        for cell in neighbors:
+            cell_changes, cell_old_values = self.__reveal_zone(*cell)
+            changes += cell_changes
+            old_values += cell_old_values
+
+            if self.game_over:
+                break
+
+        return changes, old_values
+
+    def __move(self, move: Move, lin, col) -> tuple[list[tuple[int, int]], list[int]]:
+        """Make a single move, without recording it.
+
+        Revealing a zone starts the game if needed, the other moves are ignored until then.
+
+        :return: The cells whose value changed, as `(lin, col)` pairs, and their values before the move (which may be
+        left empty if the history is disabled).
         """
         # if the game hasn't been initialized, start it
-        if not self.init:
+        if move == Move.REVEAL and not self.init:
             self.__start_game(lin, col)
 
-        new_state = deepcopy(self)
-
-        # don't allow moves if game is over or if the move is invalid
-        if self.game_over or not self.__within_bounds(lin, col):
-            return new_state
+        # don't allow moves if game is over or if the move is invalid or if the game hasn't been started
+        if not self.init or self.game_over or not self.__within_bounds(lin, col):
+            return [], []
 
-        # explore new cells
-        new_state.__reveal_zone(lin, col)
+        if move == Move.REVEAL:
+            changes, old_values = self.__reveal_zone(lin, col)
+        elif move == Move.FLAG:
+            changes, old_values = self.__flag_zone(lin, col)
+        else:
+            changes, old_values = self.__chord(lin, col)
 
         # if the number of unrevealed_zones is equal to the number of bombs, then the game is over
-        if new_state.is_win():
-            new_state.__end_game()
+        if not self.game_over and self.is_win():
+            self.__end_game()
 
-        return new_state
+        return changes, old_values
+
+    def apply_moves(self, moves: Iterable[tuple[Move, int, int]]) -> "GameState":
+        """Apply a batch of player moves, as a single move.
+
+        The moves are made in order, the ones made after the game is over are ignored. `changes` holds all the cells
+        changed by the batch (once each), and the batch is recorded in the history as a single move, so it is undone
+        at once.
+
+        :param moves: The moves, as `(move, lin, col)` triples.
+        :return: The state of the game upon executing the moves (this state, updated in place).
+        """
+        before = self.__snapshot()
+        changes, old_values = [], []
+        # the cells in `changes`, only built when a second move changes something
+        seen = None
+        recording = self.__recording()
+
+        for move, lin, col in moves:
+            if self.game_over:
+                break
+
+            move_changes, move_old_values = self.__move(move, lin, col)
+
+            if move_changes:
+                self.move_count += 1
+
+            if not changes:
+                changes, old_values = move_changes, move_old_values
+                continue
+
+            # merge the changes, keeping the value of each cell from before the batch
+            if seen is None:
+                seen = set(changes)
+
+            for index, cell in enumerate(move_changes):
+                if cell not in seen:
+                    seen.add(cell)
+                    changes.append(cell)
+                    if recording:
+                        old_values.append(move_old_values[index])
+
+        self.changes = changes
+
+        if changes:
+            self.__record(before, old_values)
+
+        return self
+
+    def reveal_zone(self, lin, col) -> "GameState":
+        """Reveal the value of the selected zone.
+
+        If the game has not been started yet, this method calls `__start_game` which initializes the board and starts
+        the timer countdown.
+
+        If the game is over or the given position is invalid, the move is ignored.
+
+        :param lin: The line of the zone to reveal.
+        :param col: The column of the zone to reveal.
+        :return: The state of the game upon executing the move (this state, updated in place).
+        """
+        return self.apply_moves([(Move.REVEAL, lin, col)])
 
     def flag_zone(self, lin, col) -> "GameState":
         """Flag/un-flag the zone.
@@ -236,50 +499,74 @@ class GameState:
 
         :param lin: The line of the zone to flag.
         :param col: The column of the zone to flag.
-        :return: The new state of the game upon executing the move.
+        :return: The state of the game upon executing the move (this state, updated in place).
         """
-        new_state = deepcopy(self)
-
-        # don't allow moves if game is over or if the move is invalid or if the game hasn't been started
-        if not self.init or self.game_over or not self.__within_bounds(lin, col):
-            return new_state
+        return self.apply_moves([(Move.FLAG, lin, col)])
 
-        if new_state.board[lin][col] == BoardCell.UNSELECTED.value:
-            # if the cell is unselected, flag it and flags left
-            if new_state.flags > 0:
-                new_state.board[lin][col] = BoardCell.FLAGGED.value
-                new_state.flags -= 1
-                pygame.event.post(pygame.event.Event(BOARD_FLAG_PLACED))
-        elif new_state.board[lin][col] == BoardCell.FLAGGED.value:
-            # if the cell is flagged, un-flag it
-            new_state.board[lin][col] = BoardCell.UNSELECTED.value
-            new_state.flags += 1
-            pygame.event.post(pygame.event.Event(BOARD_FLAG_REMOVED))
+    def chord_zone(self, lin, col) -> "GameState":
+        """Reveal the unflagged neighbors of a revealed number, if it has exactly as many flags around it as its value.
 
-        # if the cell was neither of the above, just ignore the move
+        If the zone isn't such a number, or the game is over or the given position is invalid, the move is ignored.
 
-        return new_state
+        :param lin: The line of the number.
+        :param col: The column of the number.
+        :return: The state of the game upon executing the move (this state, updated in place).
+        """
+        return self.apply_moves([(Move.CHORD, lin, col)])
 
     def timer_ticked(self) -> "GameState":
         """Update the state on timer tick.
 
-        If the game has not started yet, the move is ignored.
+        If the game has not started yet, or isn't timed, the tick is ignored. Timer ticks are not recorded in the
+        history.
 
-        :return: Returns the new state of the game upon executing the move.
+        :return: Returns the state of the game upon executing the move (this state, updated in place).
         """
-        new_state = deepcopy(self)
+        self.changes = []
 
-        # if the game hasn't been initialized, ignore the move
-        if not self.init:
-            return new_state
+        # if the game hasn't been initialized, or has no timer, ignore the tick
+        if not self.init or self.time_left <= 0:
+            return self
 
-        new_state.time_left -= 1
+        self.time_left -= 1
 
         # if the timer ran out, end the game
-        if new_state.time_left == 0:
-            new_state.__end_game()
+        if self.time_left == 0:
+            self.__end_game()
 
-        return new_state
+        return self
+
+    def undo(self) -> "GameState":
+        """Undo the last player move.
+
+        If there's no move to undo, nothing happens. The listener is not notified.
+
+        :return: The state of the game before the move (this state, updated in place).
+        """
+        diff = self.history.undo()
+
+        if diff is None:
+            self.changes = []
+        else:
+            self.__apply(diff, diff.old, diff.before)
+
+        return self
+
+    def redo(self) -> "GameState":
+        """Redo the last undone player move.
+
+        If there's no move to redo, nothing happens. The listener is not notified.
+
+        :return: The state of the game after the move (this state, updated in place).
+        """
+        diff = self.history.redo()
+
+        if diff is None:
+            self.changes = []
+        else:
+            self.__apply(diff, diff.new, diff.after)
+
+        return self
 
     def is_over(self):
         """Check if the game has ended."""
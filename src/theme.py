@@ -20,4 +20,7 @@ class Theme:
     UNREVEALED_BG_COLOR = "grey30"
     REVEALED_BOMB_BG_COLOR = "darkred"
 
+    PROBABILITY_SAFE_COLOR = "green"
+    PROBABILITY_MINE_COLOR = "red"
+
     CELL_COLORS = ["blue", "green", "red", "purple", "darkgoldenrod1", "deepskyblue", "deeppink1", "darkolivegreen1"]
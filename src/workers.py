@@ -0,0 +1,57 @@
+"""The process pool shared by the engine, for the work which is worth spreading over several cores (counting the
+solutions of large frontier components, generating boards which can be solved without guessing), and the background
+thread of the game, for the work which mustn't block its window (generating and revealing large boards).
+
+Both are created the first time they're needed and live until the program exits. The pool may be created from the
+background thread, while the threads of pygame run, so its workers aren't forked from the game (which isn't safe in a
+multi-threaded process) but started with `START_METHOD`. The tasks submitted to the pool must be module-level
+functions, with picklable arguments and results, and the scripts using it must guard their entry point with
+`if __name__ == "__main__"`. The tasks of the background thread share the memory of the game, and run one at a time in
+the order they were submitted.
+
+Functions:
+    - get_executor: Get the shared process pool.
+    - worker_count: Get the number of worker processes of the pool.
+    - get_background_thread: Get the background thread.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+
+# the start method of the worker processes: forkserver forks them from a clean single-threaded server, spawn (where
+# forkserver isn't available) starts new interpreters
+START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# the process pool, created the first time it's needed
+_executor: Optional[Executor] = None
+# the background thread, created the first time it's needed
+_background_thread: Optional[Executor] = None
+
+
+def worker_count() -> int:
+    """Get the number of worker processes of the shared pool (one per core)."""
+    return os.cpu_count() or 1
+
+
+def get_executor() -> Executor:
+    """Get the shared process pool, creating it the first time."""
+    global _executor
+
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=worker_count(), mp_context=multiprocessing.get_context(START_METHOD)
+        )
+
+    return _executor
+
+
+def get_background_thread() -> Executor:
+    """Get the background thread, creating it the first time."""
+    global _background_thread
+
+    if _background_thread is None:
+        _background_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+
+    return _background_thread
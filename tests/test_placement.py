@@ -0,0 +1,56 @@
+"""Tests of the mine placement, against a brute force placement on small boards.
+
+Run with `python -m pytest tests`.
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from placement import place_mines, safe_zone  # noqa: E402
+
+
+def brute_force(height, width, count, start, rng: random.Random) -> list[int]:
+    """Place the mines by sampling the allowed cells, listed one by one."""
+    excluded = set(safe_zone(height, width, *start))
+    allowed = [cell for cell in range(height * width) if cell not in excluded]
+    return [allowed[rank] for rank in rng.sample(range(len(allowed)), count)]
+
+
+def test_safe_zone():
+    assert safe_zone(5, 5, 2, 2) == [6, 7, 8, 11, 12, 13, 16, 17, 18]
+    assert safe_zone(5, 5, 0, 0) == [0, 1, 5, 6]
+    assert safe_zone(5, 5, 4, 4) == [18, 19, 23, 24]
+    assert safe_zone(1, 1, 0, 0) == [0]
+
+
+def test_same_mines_as_brute_force():
+    rng = random.Random(0)
+
+    for seed in range(2000):
+        height, width = rng.randint(1, 12), rng.randint(1, 12)
+        start = (rng.randrange(height), rng.randrange(width))
+        count = rng.randint(0, height * width - len(safe_zone(height, width, *start)))
+
+        mines = place_mines(height, width, count, start, random.Random(seed))
+
+        assert mines == brute_force(height, width, count, start, random.Random(seed))
+        assert len(set(mines)) == count
+        assert not set(mines) & set(safe_zone(height, width, *start))
+
+
+def test_full_board():
+    # every allowed cell holds a mine
+    mines = place_mines(4, 6, 24 - 9, (1, 1), random.Random(0))
+    assert sorted(mines) == sorted(set(range(24)) - set(safe_zone(4, 6, 1, 1)))
+
+
+@pytest.mark.parametrize("count", [-1, 16 * 16 - 8])
+def test_invalid_count(count):
+    with pytest.raises(ValueError):
+        place_mines(16, 16, count, (5, 5), random.Random(0))
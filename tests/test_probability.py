@@ -0,0 +1,109 @@
+"""Tests of the exact mine probabilities, against a brute force enumeration of the mines on small boards.
+
+Run with `python -m pytest tests`.
+"""
+
+import os
+import random
+import sys
+from fractions import Fraction
+from itertools import combinations
+from typing import Optional
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from probability import mine_probabilities  # noqa: E402
+from state import BoardCell, GameState, Move  # noqa: E402
+
+
+def brute_force(state: GameState, trust_flags) -> Optional[dict[int, Fraction]]:
+    """Get the mine probability of every unknown cell by enumerating all the placements of the mines.
+
+    :return: The probabilities by row-major index, or None if the board has no solution.
+    """
+    height, width = state.size
+    board = state.board.data
+    flags = {cell for cell, value in enumerate(board) if value == BoardCell.FLAGGED.value} if trust_flags else set()
+    unknown = [cell for cell, value in enumerate(board) if value < 0 and cell not in flags]
+
+    numbers = []
+    for cell, value in enumerate(board):
+        if 0 <= value <= 8:
+            lin, col = divmod(cell, width)
+            numbers.append((
+                [
+                    next_lin * width + next_col
+                    for next_lin in range(max(0, lin - 1), min(height, lin + 2))
+                    for next_col in range(max(0, col - 1), min(width, col + 2))
+                ],
+                value,
+            ))
+
+    mines_count = {cell: 0 for cell in unknown}
+    solutions = 0
+
+    for mines in combinations(unknown, state.max_bombs - len(flags)):
+        mines = flags.union(mines)
+        if all(sum(cell in mines for cell in cells) == value for cells, value in numbers):
+            solutions += 1
+            for cell in mines:
+                mines_count[cell] = mines_count.get(cell, 0) + 1
+
+    if not solutions:
+        return None
+
+    return {cell: Fraction(count, solutions) for cell, count in mines_count.items()}
+
+
+def random_game(seed, flags=0, wrong_flags=0) -> GameState:
+    """Get a small game in progress, with a few cells revealed, and some flags on mines and on safe cells."""
+    rng = random.Random(seed)
+    state = GameState(size=(5, 6), max_bombs=7, seed=seed)
+    state.apply_moves([(Move.REVEAL, 2, 2)])
+
+    for _ in range(rng.randrange(3)):
+        safe = [cell for cell, value in enumerate(state.board.data) if value < 0 and state.zones.data[cell] >= 0]
+        if state.is_over() or not safe:
+            break
+        state.apply_moves([(Move.REVEAL, *divmod(rng.choice(safe), 6))])
+
+    unknown = [cell for cell, value in enumerate(state.board.data) if value == BoardCell.UNSELECTED.value]
+    mines = [cell for cell in unknown if state.zones.data[cell] == BoardCell.BOMB.value]
+    safe = [cell for cell in unknown if state.zones.data[cell] != BoardCell.BOMB.value]
+    for cell in rng.sample(mines, min(flags, len(mines))) + rng.sample(safe, min(wrong_flags, len(safe))):
+        state.apply_moves([(Move.FLAG, *divmod(cell, 6))])
+
+    return state
+
+
+@pytest.mark.parametrize("flags, wrong_flags", [(0, 0), (2, 0), (1, 1), (0, 2)])
+def test_same_probabilities_as_brute_force(flags, wrong_flags):
+    for seed in range(60):
+        state = random_game(seed, flags, wrong_flags)
+        if state.is_over():
+            continue
+
+        # the flags are trusted, unless they contradict the board
+        expected = brute_force(state, True) or brute_force(state, False)
+        probabilities = mine_probabilities(state, parallel=False)
+
+        for cell, probability in expected.items():
+            assert probabilities.get(cell) == pytest.approx(float(probability), abs=1e-9), (seed, cell)
+
+
+def test_probabilities_add_up_to_the_mines_left():
+    for seed in range(20):
+        state = GameState(size=(30, 30), max_bombs=150, seed=seed)
+        state.apply_moves([(Move.REVEAL, 15, 15)])
+        if state.is_over():
+            continue
+
+        probabilities = mine_probabilities(state, parallel=False)
+        unknown = [cell for cell, value in enumerate(state.board.data) if value < 0]
+
+        assert sum(probabilities.get(cell) for cell in unknown) == pytest.approx(state.max_bombs)
+        assert all(0 <= probabilities.get(cell) <= 1 for cell in unknown)
+
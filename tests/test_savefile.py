@@ -0,0 +1,202 @@
+"""Tests of the binary save files: round trips, and corrupted or truncated files.
+
+Run with `python -m pytest tests`.
+"""
+
+import io
+import os
+import random
+import struct
+import sys
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from savefile import BLOCK_CELLS, BLOCK_SIZE, HEADER, MAGIC, VERSION, load, load_file, save, save_file  # noqa: E402
+from state import GameState, Move  # noqa: E402
+
+
+def dump(state: GameState) -> bytes:
+    """Save a game in memory."""
+    file = io.BytesIO()
+    save(state, file)
+    return file.getvalue()
+
+
+def restore(data: bytes) -> GameState:
+    """Load a game saved in memory."""
+    return load(io.BytesIO(data))
+
+
+def assert_same_game(loaded: GameState, state: GameState):
+    """Check that a loaded game is the game which was saved."""
+    assert loaded.size == state.size
+    assert loaded.max_bombs == state.max_bombs
+    assert loaded.flags == state.flags
+    assert loaded.time_left == state.time_left
+    assert loaded.unrevealed_zones == state.unrevealed_zones
+    assert loaded.move_count == state.move_count
+    assert loaded.seed == state.seed
+    assert loaded.init == state.init
+    assert loaded.game_over == state.game_over
+    assert loaded.board == state.board
+    if state.init:
+        assert loaded.zones == state.zones
+
+
+def played_game(size=(16, 30), max_bombs=99, seed=1) -> GameState:
+    """Get a game in progress, with some cells revealed and some flags."""
+    state = GameState(size=size, max_bombs=max_bombs, time=300, seed=seed)
+    state.apply_moves([(Move.REVEAL, size[0] // 2, size[1] // 2)])
+
+    rng = random.Random(seed)
+    height, width = size
+    for _ in range(10):
+        state.apply_moves([(Move.FLAG, rng.randrange(height), rng.randrange(width))])
+    state.timer_ticked()
+
+    return state
+
+
+def test_round_trip_new_game():
+    state = GameState(size=(9, 9), max_bombs=10, time=60, seed=3)
+    assert_same_game(restore(dump(state)), state)
+
+
+def test_round_trip_game_in_progress():
+    state = played_game()
+    assert not state.is_over()
+    loaded = restore(dump(state))
+    assert_same_game(loaded, state)
+
+    # the loaded game goes on like the saved one
+    for lin, col in [(0, 0), (15, 29), (3, 17)]:
+        state.apply_moves([(Move.REVEAL, lin, col)])
+        loaded.apply_moves([(Move.REVEAL, lin, col)])
+    assert_same_game(loaded, state)
+
+
+def test_round_trip_game_over():
+    state = GameState(size=(8, 8), max_bombs=40, seed=5)
+    state.apply_moves([(Move.REVEAL, 0, 0)])
+    for cell in range(64):
+        if state.is_over():
+            break
+        state.apply_moves([(Move.REVEAL, *divmod(cell, 8))])
+    assert state.is_over()
+
+    assert_same_game(restore(dump(state)), state)
+
+
+def test_round_trip_several_blocks():
+    # the bombs and the board are written in several blocks, the last one incomplete
+    state = played_game(size=(300, 300), max_bombs=9000, seed=7)
+    assert state.height * state.width > BLOCK_CELLS
+
+    assert_same_game(restore(dump(state)), state)
+
+
+def test_round_trip_file(tmp_path):
+    state = played_game()
+    path = str(tmp_path / "saves" / "save.bin")
+
+    save_file(state, path)
+    assert_same_game(load_file(path), state)
+    assert not os.path.exists(path + ".tmp")
+
+
+def test_untimed_game_stays_untimed():
+    state = played_game()
+    state.time_left = -2  # saved by older versions, which counted untimed games down
+
+    assert restore(dump(state)).time_left == 0
+
+
+def test_truncated_files():
+    data = dump(played_game())
+
+    for length in range(len(data)):
+        with pytest.raises(ValueError):
+            restore(data[:length])
+
+
+def test_truncated_large_file():
+    data = dump(played_game(size=(300, 300), max_bombs=9000, seed=7))
+
+    for length in random.Random(0).sample(range(len(data)), 200):
+        with pytest.raises(ValueError):
+            restore(data[:length])
+
+
+def test_truncated_varint():
+    # a run whose length has its continuation bit set, and nothing after it
+    header = HEADER.pack(MAGIC, VERSION, 0, 4, 4, 2, 2, 0, 16, 0, 0)
+    block = bytes([255, 0x90])
+    data = header + BLOCK_SIZE.pack(len(block)) + block + BLOCK_SIZE.pack(0)
+
+    with pytest.raises(ValueError, match="Corrupted save file."):
+        restore(data)
+
+
+@pytest.mark.parametrize(
+    "runs",
+    [
+        [(255, 17)],  # more cells than the board
+        [(255, 15)],  # fewer cells than the board
+        [(255, 8), (0, 100)],  # a run overflowing the board
+    ],
+)
+def test_wrong_number_of_cells(runs):
+    header = HEADER.pack(MAGIC, VERSION, 0, 4, 4, 2, 2, 0, 16, 0, 0)
+    block = b"".join(bytes([value, length]) for value, length in runs)
+    data = header + BLOCK_SIZE.pack(len(block)) + block + BLOCK_SIZE.pack(0)
+
+    with pytest.raises(ValueError, match="Corrupted save file."):
+        restore(data)
+
+
+@pytest.mark.parametrize("value", [9, 15, 18, 0x7F, 0x80, 0xFD])
+def test_invalid_cell_value(value):
+    header = HEADER.pack(MAGIC, VERSION, 0, 4, 4, 2, 2, 0, 16, 0, 0)
+    block = bytes([255, 8, value, 8])
+    data = header + BLOCK_SIZE.pack(len(block)) + block + BLOCK_SIZE.pack(0)
+
+    with pytest.raises(ValueError, match="Corrupted save file."):
+        restore(data)
+
+
+def test_valid_cell_values():
+    # every value of a cell the player may see, revealed bombs included
+    header = HEADER.pack(MAGIC, VERSION, 0, 4, 4, 2, 2, 0, 16, 0, 0)
+    values = [*range(9), 16, 17, 0xFF, 0xFE, 0xFF, 0xFF, 0xFF]
+    block = b"".join(bytes([value, 1]) for value in values)
+    data = header + BLOCK_SIZE.pack(len(block)) + block + BLOCK_SIZE.pack(0)
+
+    assert list(restore(data).board.data) == [value - 256 if value > 127 else value for value in values]
+
+
+def test_wrong_magic_and_version():
+    data = dump(played_game())
+
+    with pytest.raises(ValueError, match="Not a save file."):
+        restore(b"NOTASAVE" + data[len(MAGIC):])
+    with pytest.raises(ValueError, match="Unsupported save file version"):
+        restore(data[:len(MAGIC)] + struct.pack("<H", VERSION + 1) + data[len(MAGIC) + 2:])
+
+
+def test_corrupted_bytes():
+    # a corrupted save either loads (if the damage is consistent) or raises ValueError, never anything else
+    data = dump(played_game())
+    rng = random.Random(0)
+
+    for _ in range(500):
+        corrupted = bytearray(data)
+        for _ in range(rng.randint(1, 4)):
+            corrupted[rng.randrange(HEADER.size, len(corrupted))] = rng.randrange(256)
+
+        try:
+            restore(bytes(corrupted))
+        except ValueError:
+            pass
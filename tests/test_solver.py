@@ -0,0 +1,126 @@
+"""Tests of the deterministic solver, against a brute force enumeration of the mines on small boards.
+
+Run with `python -m pytest tests`.
+"""
+
+import os
+import random
+import sys
+from itertools import combinations
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, os.path.join(ROOT, "src"))
+
+from solver import Solver  # noqa: E402
+from state import BoardCell, GameState, Move  # noqa: E402
+
+
+def certain_cells(state: GameState) -> tuple[set[int], set[int]]:
+    """Get the unknown cells which are safe in every placement of the mines, and those which are mines in all of them.
+
+    The flags are unknown cells, like for the solver.
+    """
+    height, width = state.size
+    board = state.board.data
+    unknown = [cell for cell, value in enumerate(board) if value < 0]
+
+    # the numbers, as the bit mask of their neighbors and their value
+    numbers = []
+    for cell, value in enumerate(board):
+        if 0 <= value <= 8:
+            lin, col = divmod(cell, width)
+            numbers.append((
+                sum(
+                    1 << (next_lin * width + next_col)
+                    for next_lin in range(max(0, lin - 1), min(height, lin + 2))
+                    for next_col in range(max(0, col - 1), min(width, col + 2))
+                ),
+                value,
+            ))
+
+    safe = mines = sum(1 << cell for cell in unknown)
+    for placement in combinations(unknown, state.max_bombs):
+        placement = sum(1 << cell for cell in placement)
+        if all((placement & neighbors).bit_count() == value for neighbors, value in numbers):
+            safe &= ~placement
+            mines &= placement
+
+    return {cell for cell in unknown if safe >> cell & 1}, {cell for cell in unknown if mines >> cell & 1}
+
+
+def random_game(seed, reveals) -> GameState:
+    """Get a small game in progress, after a few random safe reveals and a flag on a safe cell and on a mine."""
+    rng = random.Random(seed)
+    state = GameState(size=(4, 6), max_bombs=5, seed=seed)
+    state.apply_moves([(Move.REVEAL, 1, 2)])
+
+    for _ in range(reveals):
+        safe = [cell for cell, value in enumerate(state.board.data) if value < 0 and state.zones.data[cell] >= 0]
+        if state.is_over() or not safe:
+            break
+        state.apply_moves([(Move.REVEAL, *divmod(rng.choice(safe), 6))])
+
+    unknown = [cell for cell, value in enumerate(state.board.data) if value == BoardCell.UNSELECTED.value]
+    for is_mine in (True, False):
+        cells = [cell for cell in unknown if (state.zones.data[cell] == BoardCell.BOMB.value) == is_mine]
+        if cells and not state.is_over():
+            state.apply_moves([(Move.FLAG, *divmod(rng.choice(cells), 6))])
+
+    return state
+
+
+def test_deductions_are_sound():
+    for seed in range(300):
+        state = random_game(seed, seed % 3)
+        if state.is_over():
+            continue
+
+        solver = Solver(state)
+        safe, mines = certain_cells(state)
+
+        assert solver.safe <= safe, seed
+        assert solver.mines <= mines, seed
+
+
+def test_incremental_updates_match_a_new_solver():
+    rng = random.Random(0)
+
+    for seed in range(50):
+        state = GameState(size=(16, 30), max_bombs=99, seed=seed, history_limit=0)
+        state.apply_moves([(Move.REVEAL, 8, 15)])
+        solver = Solver(state)
+
+        for _ in range(20):
+            if state.is_over():
+                break
+
+            safe = [cell for cell, value in enumerate(state.board.data) if value < 0 and state.zones.data[cell] >= 0]
+            state.apply_moves([(rng.choice([Move.REVEAL, Move.FLAG]), *divmod(rng.choice(safe), 30))])
+            solver.update(state.changes)
+
+            fresh = Solver(state)
+            assert (solver.safe, solver.mines) == (fresh.safe, fresh.mines), seed
+
+
+def test_hints_and_steps_skip_flags():
+    for seed in range(100):
+        state = GameState(size=(16, 30), max_bombs=99, seed=seed, history_limit=0)
+        state.apply_moves([(Move.REVEAL, 8, 15)])
+        solver = Solver(state)
+
+        # flag some of the safe cells, which are then never revealed
+        for cell in sorted(solver.safe)[:3]:
+            state.apply_moves([(Move.FLAG, *divmod(cell, 30))])
+            solver.update(state.changes)
+
+        hint = solver.hint()
+        assert hint is None or state.board[hint] == BoardCell.UNSELECTED.value
+
+        while solver.revealable() and not state.is_over():
+            before = state.board.data[:]
+            solver.step()
+            assert state.board.data != before, seed
+
+        # the safe cells left are the flagged ones
+        assert not state.game_over or state.is_win()
+        assert all(state.board.data[cell] == BoardCell.FLAGGED.value for cell in solver.safe), seed